@@ -1,19 +1,128 @@
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 from tenacity import retry, wait_exponential, stop_after_attempt
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker, selectinload
-from typing import Optional, List, Type, Dict, Any
+from sqlalchemy.orm import sessionmaker
+from typing import Optional, List, Type, Dict, Any, AsyncIterator, Awaitable, Callable, Sequence, Set, Tuple, TypeVar, \
+    Union
+from contextvars import ContextVar
 from sqlmodel import SQLModel, select, and_
-from contextlib import asynccontextmanager
-from LoggerService import LoggerService
-from .config import DATABASE_URL
+from sqlalchemy import BigInteger, delete, exists, func, insert, literal, text, update, tuple_, Row
+from sqlalchemy.exc import IntegrityError
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from LoggerService import LoggerService, QUERY, WRITE
+from .cache import QueryCache, query_cache
+from .metrics import DB_READS, TimedQueuePool, register_pool_metrics, timed
+from .config import DATABASE_URL, DATABASE_REPLICA_URLS, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, REPLICA_CHECK_TIMEOUT, \
+    REPLICA_STICKY_SECONDS, STREAM_BATCH_SIZE, CHANGES_PAGE_SIZE
+from .budget import configured_pool
+from .replicas import Replica, ReplicaSet
+from .statements import StatementCache, statement_cache
+from .models import DeletedRow, SERVER_TIMESTAMPS
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from json import dumps, loads
 from time import time
+from datetime import datetime
+from asyncio import gather
+
+# Murakkab filtrlar: {"id": {"in": [1, 2]}}, {"day": {"gte": 1, "lte": 3}}, {"day": {"between": [1, 3]}},
+# {"unavailable": {"bits_clear": 0b100}} - niqobdagi bitlarning hech biri yoqilmagan
+FILTER_OPERATORS = {
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "ne": lambda column, value: column != value,
+    "between": lambda column, value: column.between(*value),
+    "bits_clear": lambda column, value: column.op("&")(value) == 0,
+}
+# Qiymati ro'yxat bo'lgan amallar: bunday filtrlar kesh kalitiga kiritilmaydi
+LIST_OPERATORS = {"in", "not_in"}
+
+# O'zgarishlar kursori: `updated_at` tranzaksiya boshlangan vaqt (`now()`), shuning uchun hali commit qilinmagan
+# tranzaksiyalar bizdan oldin boshlangan bo'lsa, ularning yozuvlari keyinroq, kursordan kichik vaqt bilan ko'rinadi.
+# Kursor eng eski ochiq tranzaksiya boshlanishidan oshmaydi - ular keyingi so'rovda albatta qaytadi
+SYNC_CURSOR = text(
+    "SELECT LEAST(now(), COALESCE((SELECT min(xact_start) FROM pg_stat_activity "
+    "WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL), now()))"
+)
+
+# unique_violation va exclusion_violation
+CONFLICT_SQLSTATES = {"23505", "23P01"}
+
+
+class ConflictError(Exception):
+    """Unikal yoki EXCLUDE cheklovi buzilganda (ikki marta band qilish) ko'tariladi."""
+
+    def __init__(self, constraint: Optional[str] = None):
+        super().__init__(f"Constraint violated: {constraint}")
+        self.constraint = constraint
+
+    @classmethod
+    def from_integrity_error(cls, error: IntegrityError) -> Optional["ConflictError"]:
+        """IntegrityError to'qnashuv bo'lsa, mos ConflictError qaytaradi."""
+        if getattr(error.orig, "sqlstate", None) not in CONFLICT_SQLSTATES:
+            return None
+        return cls(getattr(error.orig.__cause__, "constraint_name", None))
+
+
+class UnitOfWork:
+    """Bitta so'rov (unit of work) davomida xizmat chaqiruvlari bo'lishadigan sessiya."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.invalidated: Set[str] = set()  # commitdan keyin bekor qilinadigan kesh nomlar fazolari
+        self.after_commit: List[Callable[[], Awaitable[Any]]] = []  # commitdan keyin chaqiriladiganlar
+
+
+_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+# Shu vaqtgacha (unix soniya) joriy so'rov o'qishlari replika emas, primaryda bajariladi
+_primary_until: ContextVar[float] = ContextVar("primary_until", default=0.0)
+
+T = TypeVar("T")
+
+
+def create_engine(url: str, pool_size: int, max_overflow: int, application_name: str = "DarsJadval",
+                  connect_timeout: Optional[float] = None) -> AsyncEngine:
+    """Ilova sozlamalari bilan asinxron dvigatel (primary yoki o'qish replikasi uchun)."""
+    connect_args: Dict[str, Any] = {
+        "server_settings": {
+            "application_name": application_name,
+            "statement_timeout": "60000",  # 60 seconds timeout for queries
+            "idle_in_transaction_session_timeout": "300000",  # 5 minutes timeout for idle transactions
+        }
+    }
+    if connect_timeout is not None:
+        connect_args["timeout"] = connect_timeout  # asyncpg ulanish o'rnatish vaqti chegarasi
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=TimedQueuePool,  # ulanish kutish vaqti metrikasi uchun
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=30,  # Reduced pool timeout
+        pool_recycle=300,  # Connection recycle time (5 minutes)
+        pool_pre_ping=True,  # Enable connection health checks
+        connect_args=connect_args,
+    )
 
 
 class DatabaseService1:
     """PostgreSQL uchun rivojlangan asinxron ma'lumotlar bazasi xizmati."""
     MAX_RETRIES = 5
+    # Har bir worker ulushi: Postgres `max_connections` byudjeti workerlar soniga bo'linadi (budget.py)
+    POOL_SIZE, MAX_OVERFLOW = configured_pool()
     ENGINE: Optional[AsyncEngine] = None
+    # O'qish replikalari (`get`, `get_for_schedule`, `get_table`, `stream_columns`); yozishlar doim primaryda
+    REPLICAS: ReplicaSet = ReplicaSet(DATABASE_REPLICA_URLS, partial(
+        create_engine, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, application_name="DarsJadval-read",
+        connect_timeout=REPLICA_CHECK_TIMEOUT))
+    CACHE: QueryCache = query_cache
+    # `get`, `get_for_schedule`, `get_table` so'rovlari shakli bo'yicha qayta ishlatiladi (statements.py)
+    STATEMENTS: StatementCache = statement_cache
+    CACHED_MODELS = {"Course", "Teacher", "Room", "Subject"}  # Kam o'zgaradigan ma'lumotnoma jadvallari
 
     def __init__(self, logger: Optional[LoggerService] = None):
         self.engine = self.get_engine()
@@ -24,42 +133,186 @@ class DatabaseService1:
     def get_engine(cls) -> AsyncEngine:
         """Havza ulanishi sozlanadi."""
         if cls.ENGINE is None:
-            cls.ENGINE = create_async_engine(
-                DATABASE_URL,
-                echo=False,
-                pool_size=50,  # Increased pool size for higher concurrency
-                max_overflow=25,  # Increased max overflow
-                pool_timeout=30,  # Reduced pool timeout
-                pool_recycle=300,  # Connection recycle time (5 minutes)
-                pool_pre_ping=True,  # Enable connection health checks
-                connect_args={
-                    "server_settings": {
-                        "application_name": "DarsJadval",
-                        "statement_timeout": "60000",  # 60 seconds timeout for queries
-                        "idle_in_transaction_session_timeout": "300000",  # 5 minutes timeout for idle transactions
-                    }
-                }
-            )
+            cls.ENGINE = create_engine(DATABASE_URL, cls.POOL_SIZE, cls.MAX_OVERFLOW)
         return cls.ENGINE
 
+    async def warm_up(self, connections: int, statements: Sequence[Any] = ()) -> int:
+        """
+        Havzada `connections` ta ulanishni oldindan ochadi va har birida `statements` so'rovlarini bir marta
+        bajaradi: asyncpg ularni ulanishning prepared statement keshiga, SQLAlchemy esa kompilyatsiya
+        keshiga oladi. Natijada deploydan keyingi birinchi so'rovlar ulanish o'rnatishni kutmaydi.
+        :param connections: Ochiladigan ulanishlar soni (havza hajmi bilan cheklanadi).
+        :param statements: Tez-tez bajariladigan so'rovlar (natijasi o'qilmaydi).
+        :return: Isitilgan ulanishlar soni.
+        """
+        count = max(0, min(connections, self.engine.pool.size()))
+        if not count:
+            return 0
+        started = time()
+        opened = await gather(*(self.engine.connect().start() for _ in range(count)), return_exceptions=True)
+        live = [connection for connection in opened if not isinstance(connection, BaseException)]
+
+        async def prepare(connection: AsyncConnection) -> None:
+            for statement in statements:
+                await connection.execute(statement)
+
+        try:
+            results = await gather(*(prepare(connection) for connection in live), return_exceptions=True)
+        finally:
+            await gather(*(connection.close() for connection in live), return_exceptions=True)
+        failures = [error for error in [*opened, *results] if isinstance(error, BaseException)]
+        if self.logging:
+            self.logging.info("Warmed up %d connections with %d statements in %.2f seconds",
+                              len(live), len(statements), time() - started)
+            for error in failures:
+                self.logging.warning("Pool warm-up error: %s", error)
+        return len(live)
+
+    @classmethod
+    def pool_status(cls) -> Dict[str, int]:
+        """Havza holati: hajmi, bo'sh, band va overflow ulanishlar soni (dvigatel hali yaratilmagan bo'lsa - bo'sh)."""
+        if cls.ENGINE is None:
+            return {}
+        pool = cls.ENGINE.pool
+        return {"size": pool.size(), "checked_in": pool.checkedin(), "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow())}
+
+    @classmethod
+    async def dispose(cls) -> None:
+        """Havzadagi barcha ulanishlarni yopadi; keyingi murojaatda dvigatel qaytadan yaratiladi."""
+        if cls.ENGINE is not None:
+            await cls.ENGINE.dispose()
+            cls.ENGINE = None
+        await cls.REPLICAS.dispose()
+
     @asynccontextmanager
-    async def session_scope(self):
-        """Sessiyani avtomatik boshqarish uchun kontekst menejeri."""
-        async with self.get_session() as session:
-            try:
-                yield session
-            except Exception as e:
-                if self.logging:
-                    self.logging.error(f"Session error: {e}", exc_info=True)
+    async def unit_of_work(self):
+        """
+        Blok ichidagi barcha xizmat chaqiruvlari bitta sessiya va tranzaksiyani bo'lishadi: havzadan bitta
+        ulanish olinadi, commit blok oxirida bir marta bajariladi, xatolikda hammasi bekor qilinadi.
+        Kesh bekor qilinishi commitdan keyinga qoldiriladi. Ichma-ich chaqirilsa, tashqi blok ishlatiladi.
+        """
+        current = _unit_of_work.get()
+        if current is not None:
+            yield current
+            return
+        uow = UnitOfWork(self.get_session())
+        token = _unit_of_work.set(uow)
+        try:
+            yield uow
+            await uow.session.commit()
+        except IntegrityError as e:
+            await uow.session.rollback()
+            conflict = ConflictError.from_integrity_error(e)
+            if conflict is None:
+                raise
+            raise conflict from e
+        except BaseException:
+            await uow.session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            await uow.session.close()
+        for name in uow.invalidated:
+            await self.CACHE.invalidate(name)
+        for callback in uow.after_commit:
+            await self._run_after_commit(callback)
+
+    @asynccontextmanager
+    async def read_scope(self):
+        """
+        Joriy unit of workdan tashqarida qisqa o'qish bloki: o'z sessiyasi bor, blok oxirida yopiladi va ulanish
+        havzaga qaytadi. Uzoq hisob-kitob (masalan, solver) uchun ma'lumot shu yerda yuklanadi, so'rov tranzaksiyasi
+        esa hisobdan keyin faqat yozish uchun ochiladi - ulanish hisob davomida "idle in transaction" turmaydi.
+        """
+        token = _unit_of_work.set(None)
+        try:
+            async with self.unit_of_work() as uow:
+                yield uow
+        finally:
+            _unit_of_work.reset(token)
+
+    async def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """
+        `callback` ni joriy unit of work muvaffaqiyatli commit qilingandan keyin chaqiradi (masalan, o'zgarish
+        hodisalarini e'lon qilish); unit of work bo'lmasa - darhol. Bekor qilingan tranzaksiyada chaqirilmaydi.
+        """
+        uow = _unit_of_work.get()
+        if uow is not None:
+            uow.after_commit.append(callback)
+        else:
+            await self._run_after_commit(callback)
+
+    async def _run_after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        # Ma'lumotlar allaqachon saqlangan: xatolik so'rovni muvaffaqiyatsiz qilmaydi
+        try:
+            await callback()
+        except Exception as e:
+            if self.logging:
+                self.logging.error("After-commit callback failed: %s", e, exc_info=True)
+
+    @asynccontextmanager
+    async def session_scope(self, shared: bool = True):
+        """
+        Sessiyani avtomatik boshqarish uchun kontekst menejeri.
+        Faol unit of work bo'lsa, uning sessiyasi qaytariladi (commit/rollback/yopishni u bajaradi).
+        :param shared: False bo'lsa, unit of work ichida ham alohida sessiya ochiladi.
+        """
+        uow = _unit_of_work.get() if shared else None
+        session = uow.session if uow else self.get_session()
+        try:
+            yield session
+        except IntegrityError as e:
+            if uow is None:
                 await session.rollback()
+            conflict = ConflictError.from_integrity_error(e)
+            if conflict is None:
+                if self.logging:
+                    self.logging.error("Session error: %s", e, exc_info=True)
                 raise
-            finally:
+            if self.logging:
+                self.logging.info("Conflict on %s", conflict.constraint)
+            raise conflict from e
+        except Exception as e:
+            if self.logging:
+                self.logging.error("Session error: %s", e, exc_info=True)
+            if uow is None:
+                await session.rollback()
+            raise
+        finally:
+            if uow is None:
                 await session.close()
 
+    @staticmethod
+    async def commit(session: AsyncSession) -> None:
+        """Sessiyani commit qiladi; unit of work ichida faqat flush (commitni blok oxirida u bajaradi)."""
+        if _unit_of_work.get() is not None:
+            await session.flush()
+        else:
+            await session.commit()
+
     def get_session(self) -> AsyncSession:
         """Yangi sessiya ob'ektini qaytaradi."""
         return self.session_factory()
 
+    @staticmethod
+    def build_conditions(model: Type[SQLModel], filters: Dict[str, Any]) -> List[Any]:
+        """
+        Filtr lug'atidan SQL shartlari ro'yxatini tuzadi.
+        Oddiy qiymat tenglikni, lug'at esa `FILTER_OPERATORS` dagi amallarni bildiradi.
+        """
+        conditions = []
+        for key, value in filters.items():
+            column = getattr(model, key)
+            if isinstance(value, dict):
+                for operation, operand in value.items():
+                    if operation not in FILTER_OPERATORS:
+                        raise ValueError(f"Unsupported filter operation: {value}")
+                    conditions.append(FILTER_OPERATORS[operation](column, operand))
+            else:
+                conditions.append(column == value)
+        return conditions
+
     @retry(wait=wait_exponential(multiplier=1, min=1, max=10), stop=stop_after_attempt(MAX_RETRIES))
     async def execute_query(self, query: Any, *args, **kwargs):
         """Umumiy so'rovni bajaruvchi funksiya."""
@@ -67,78 +320,284 @@ class DatabaseService1:
         async with self.session_scope() as session:
             try:
                 if self.logging:
-                    self.logging.info(f"Executing query: {query.__name__ if callable(query) else query}")
+                    self.logging.info("Executing query: %s", getattr(query, "__name__", query), extra=QUERY)
                 result = await query(session, *args, **kwargs) if callable(query) else await session.execute(query)
                 elapsed_time = time() - start_time
                 if self.logging:
-                    self.logging.info(f"Query executed in {elapsed_time:.2f} seconds.")
+                    self.logging.info("Query executed in %.2f seconds.", elapsed_time, extra=QUERY)
                 return result
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error executing query: {e}", exc_info=True)
+                    self.logging.error("Error executing query: %s", e, exc_info=True)
                 raise
 
+    @staticmethod
+    def drop_server_timestamps(instance: SQLModel) -> None:
+        """
+        `created_at`/`updated_at` ni faqat baza qo'yadi: so'rov tanasida kelgan (yoki None) qiymatlar olib
+        tashlanadi, INSERT ularni `now()` bilan to'ldiradi, merge esa bazadagi qiymatni saqlaydi.
+        """
+        for name in SERVER_TIMESTAMPS:
+            instance.__dict__.pop(name, None)
+
+    @timed("add")
     async def add(self, instance: SQLModel) -> Optional[int]:
         """Yangi yozuv qo'shadi."""
         async with self.session_scope() as session:
             try:
+                self.drop_server_timestamps(instance)
                 session.add(instance)
-                await session.commit()
+                await self.commit(session)
+                await self.invalidate(type(instance))
                 await session.refresh(instance)
                 if self.logging:
-                    self.logging.info(f"Added instance: {instance}")
+                    self.logging.info("Added %s id=%s", type(instance).__name__, instance.id, extra=WRITE)
                 return instance.id
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error adding instance: {e}", exc_info=True)
+                    self.logging.error("Error adding instance: %s", e, exc_info=True)
                 raise
 
+    @staticmethod
+    async def _insert_rows(session: AsyncSession, instances: List[SQLModel]) -> List[int]:
+        """
+        Yozuvlarni bitta ko'p qatorli `INSERT ... RETURNING id` bilan yozadi (commit qilinmaydi).
+        Identifikatorlar kiritish tartibida qaytariladi va ob'ektlarga o'rnatiladi.
+        """
+        if not instances:
+            return []
+        model = type(instances[0])
+        # created_at/updated_at hech qachon INSERT ga kirmaydi (`drop_server_timestamps`); boshqa server
+        # to'ldiradigan ustunlar qiymat berilmagan bo'lsa kirmaydi
+        columns = [column.name for column in model.__table__.columns if not column.primary_key and
+                   column.name not in SERVER_TIMESTAMPS and not (column.server_default is not None and all(
+                       getattr(instance, column.name) is None for instance in instances))]
+        rows = [{name: getattr(instance, name) for name in columns} for instance in instances]
+        result = await session.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+        ids = list(result.scalars().all())
+        for instance, instance_id in zip(instances, ids):
+            instance.id = instance_id
+        return ids
+
+    @timed("add_all")
+    async def add_all(self, instances: List[SQLModel]) -> List[int]:
+        """
+        Ko'p yozuvni bitta tranzaksiyada qo'shadi: yo hammasi yoziladi, yo hech biri.
+        :param instances: Bir xil modeldagi yangi yozuvlar.
+        :return: Qo'shilgan yozuvlar identifikatorlari (kiritish tartibida).
+        """
+        if not instances:
+            return []
+        async with self.session_scope() as session:
+            try:
+                ids = await self._insert_rows(session, instances)
+                await self.commit(session)
+                await self.invalidate(type(instances[0]))
+                if self.logging:
+                    self.logging.info("Added %d records to %s", len(ids), type(instances[0]).__name__, extra=WRITE)
+                return ids
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error adding instances: %s", e, exc_info=True)
+                raise
+
+    @timed("update")
     async def update(self, instance: SQLModel) -> Optional[int]:
         """Mavjud yozuvni yangilaydi."""
         async with self.session_scope() as session:
             try:
+                # merge faqat bor kalitlarni ko'chiradi: vaqt ustunlari bazadagicha qoladi
+                self.drop_server_timestamps(instance)
                 instance = await session.merge(instance)
-                await session.commit()
+                await self.commit(session)
+                await self.invalidate(type(instance))
                 await session.refresh(instance)
                 if self.logging:
-                    self.logging.info(f"Updated instance: {instance}")
+                    self.logging.info("Updated %s id=%s", type(instance).__name__, instance.id, extra=WRITE)
                 return instance.id
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error updating instance: {e}", exc_info=True)
+                    self.logging.error("Error updating instance: %s", e, exc_info=True)
                 raise
 
-    async def get(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[SQLModel]:
+    @timed("update_fields")
+    async def update_fields(self, model: Type[SQLModel], record_id: int, values: Dict[str, Any],
+                            previous: Sequence[str] = ()) -> Optional[Row]:
         """
-        Jadvaldan yozuvlarni olish.
-        :param model: SQLModel jadvali turi.
-        :param filters: Filtlash shartlari (masalan, {"id": 1}).
-        :param limit: Qaytariladigan yozuvlar soni.
-        :return: Model yozuvlari.
+        Yozuvni bitta `UPDATE ... SET ... WHERE id = ... RETURNING ...` so'rovi bilan qisman yangilaydi.
+        :param model: Model jadvali.
+        :param record_id: Yangilanadigan yozuv identifikatori.
+        :param values: Yangi ustun qiymatlari.
+        :param previous: Yangilashdan oldingi qiymati ham kerak ustunlar: o'sha so'rovdagi `FOR UPDATE` CTE dan
+            `previous_<ustun>` nomi bilan qaytadi (parallel yangilashda ham oxirgi commit qilingan qiymat).
+        :return: Yangilangan qator (ustunlar atribut sifatida) yoki yozuv topilmasa None.
         """
         async with self.session_scope() as session:
             try:
-                query = select(model)
-                if filters:
-                    conditions = [getattr(model, key) == value for key, value in filters.items() if hasattr(model, key)]
-                    if conditions:
-                        query = query.where(and_(*conditions))
-                    elif self.logging:
-                        self.logging.warning(f"No valid filters applied for model {model.__name__}")
-
-                if limit:
-                    query = query.limit(limit)
-
-                result = await session.execute(query)
-                records = result.scalars().all()
+                query = update(model).values(**values)
+                returning = list(model.__table__.columns)
+                if previous:
+                    old = select(model.id, *(getattr(model, name) for name in previous)) \
+                        .where(model.id == record_id).with_for_update().cte("previous")
+                    query = query.where(model.id == old.c.id)
+                    returning += [old.c[name].label(f"previous_{name}") for name in previous]
+                else:
+                    query = query.where(model.id == record_id)
+                query = query.returning(*returning)
+                result = await session.execute(query.execution_options(synchronize_session=False))
+                row = result.one_or_none()
+                await self.commit(session)
+                await self.invalidate(model)
                 if self.logging:
-                    self.logging.info(f"Retrieved {len(records)} records from {model.__name__}")
-                return records
+                    self.logging.info("Updated %s id=%s: %s", model.__name__, record_id, ", ".join(values), extra=WRITE)
+                return row
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error retrieving data from {model.__name__}: {e}", exc_info=True)
+                    self.logging.error("Error updating %s id=%s: %s", model.__name__, record_id, e, exc_info=True)
                 raise
 
+    async def invalidate(self, model: Type[SQLModel]) -> None:
+        """
+        Model versiyasini oshiradi: keshlangan o'qishlar va unga bog'liq ETaglar eskiradi.
+        Unit of work ichida bekor qilish commitdan keyin bajariladi.
+        """
+        self.stick_to_primary()
+        uow = _unit_of_work.get()
+        if uow is not None:
+            uow.invalidated.add(model.__name__)
+            return
+        await self.CACHE.invalidate(model.__name__)
+
+    @staticmethod
+    def stick_to_primary(until: Optional[float] = None) -> float:
+        """
+        Joriy so'rov (kontekst) o'qishlarini `until` gacha primaryga bog'laydi: yozuvdan keyin o'qilgan
+        ma'lumot hali replikaga yetib bormagan bo'lishi mumkin.
+        :param until: Unix vaqti; berilmasa - hozirdan `REPLICA_STICKY_SECONDS` soniya.
+        :return: Amaldagi chegara.
+        """
+        until = time() + REPLICA_STICKY_SECONDS if until is None else until
+        if until > _primary_until.get():
+            _primary_until.set(until)
+        return _primary_until.get()
+
+    @contextmanager
+    def primary_reads(self):
+        """Blok ichidagi barcha o'qishlar primaryda (masalan, bandlik indeksini qurish)."""
+        token = _primary_until.set(float("inf"))
+        try:
+            yield
+        finally:
+            _primary_until.reset(token)
+
+    def reads_primary(self) -> bool:
+        """O'qish primaryda bajarilishi kerakmi: replika yo'q, unit of work yozgan yoki yozuvdan keyingi oyna."""
+        if not self.REPLICAS:
+            return True
+        uow = _unit_of_work.get()
+        return bool(uow is not None and uow.invalidated) or _primary_until.get() > time()
+
+    async def read_replica(self) -> Optional[Replica]:
+        """O'qish uchun replika yoki None (primary)."""
+        return None if self.reads_primary() else await self.REPLICAS.choose()
+
+    async def read(self, run: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        O'qish so'rovini imkon bo'lsa replikada bajaradi. Replika ulanmasa yoki so'rov WAL bilan to'qnashsa,
+        `run` primaryda (unit of work sessiyasida) takrorlanadi.
+        :param run: Sessiyani olib natija qaytaradigan funksiya; faqat o'qishi kerak.
+        """
+        replica = await self.read_replica()
+        if replica is not None:
+            session = replica.session()
+            try:
+                result = await run(session)
+                DB_READS.inc(target="replica")
+                return result
+            except Exception as e:
+                if not self.REPLICAS.should_fallback(replica, e):
+                    raise
+                if self.logging:
+                    self.logging.warning("Read on replica %s failed, retrying on primary: %s", replica.name, e)
+            finally:
+                await session.close()
+        async with self.session_scope() as session:
+            result = await run(session)
+        DB_READS.inc(target="primary")
+        return result
+
+    def cacheable(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Model keshdan o'qiladimi. Joriy unit of work shu modelga yozgan bo'lsa - yo'q,
+        aks holda commit qilinmagan ma'lumot keshga tushishi mumkin. Ro'yxat shartlari (`LIST_OPERATORS`) bor
+        so'rovlar ham keshlanmaydi: har xil id to'plamlari kalitga tushib, LRU dagi foydali yozuvlarni siqib chiqaradi.
+        """
+        uow = _unit_of_work.get()
+        if model.__name__ not in self.CACHED_MODELS or (uow is not None and model.__name__ in uow.invalidated):
+            return False
+        return not filters or not any(isinstance(value, dict) and LIST_OPERATORS & value.keys()
+                                      for value in filters.values())
+
+    @timed("get")
+    async def get(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[SQLModel]:
+        """
+        Jadvaldan yozuvlarni olish. `CACHED_MODELS` dagi jadvallar keshdan o'qiladi: keshda oddiy qatorlar
+        (lug'atlar) saqlanadi va har bir chaqiruvga yangi, sessiyaga bog'lanmagan ob'ektlar qaytariladi.
+        :param model: SQLModel jadvali turi.
+        :param filters: Filtlash shartlari (masalan, {"id": 1} yoki {"id": {"between": [1, 50]}}).
+        :param limit: Qaytariladigan yozuvlar soni.
+        :return: Model yozuvlari.
+        """
+        if self.cacheable(model, filters):
+            # Kesh primarydan to'ldiriladi: orqada qolgan replika ma'lumoti TTL davomida keshda qolib ketmasin
+            key = repr((sorted(filters.items()) if filters else None, limit))
+
+            async def load() -> List[Dict[str, Any]]:
+                return [record.model_dump() for record in await self._get(model, filters, limit, primary=True)]
+
+            return [model(**row) for row in await self.CACHE.get_or_load(model.__name__, key, load)]
+        return await self._get(model, filters, limit)
+
+    async def _get(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None,
+                   limit: Optional[int] = None, primary: bool = False) -> List[SQLModel]:
+        """
+        Yozuvlarni keshsiz, to'g'ridan-to'g'ri bazadan (imkon bo'lsa replikadan) o'qiydi.
+        :param primary: True bo'lsa, replika ishlatilmaydi.
+        """
+        valid = None
+        if filters:
+            # Oddiy tenglik yoki oraliq/ro'yxat shartlari (masalan, {"id": {"gte": 10}})
+            valid = {key: value for key, value in filters.items() if hasattr(model, key)}
+            if not valid and self.logging:
+                self.logging.warning("No valid filters applied for model %s", model.__name__)
+        query, params = self.STATEMENTS.select(model, valid, limit)
+
+        async def run(session: AsyncSession) -> List[SQLModel]:
+            return (await session.execute(query, params)).scalars().all()
+
+        try:
+            if primary:
+                with self.primary_reads():
+                    records = await self.read(run)
+            else:
+                records = await self.read(run)
+            if self.logging:
+                self.logging.info("Retrieved %d records from %s", len(records), model.__name__, extra=QUERY)
+            return records
+        except Exception as e:
+            if self.logging:
+                self.logging.error("Error retrieving data from %s: %s", model.__name__, e, exc_info=True)
+            raise
+
+    @timed("get_for_schedule")
     async def get_for_schedule(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> \
     List[SQLModel]:
         """
@@ -148,38 +607,23 @@ class DatabaseService1:
         :param limit: Qaytariladigan yozuvlar soni.
         :return: Model yozuvlari.
         """
-        async with self.session_scope() as session:
-            try:
-                query = select(model)
-
-                if filters:
-                    conditions = []
-                    for key, value in filters.items():
-                        column = getattr(model, key)
-                        if isinstance(value, dict):
-                            # Murakkab shartlarni ishlov berish
-                            if "not_in" in value:
-                                conditions.append(column.not_in(value["not_in"]))
-                            else:
-                                raise ValueError(f"Unsupported filter operation: {value}")
-                        else:
-                            conditions.append(column == value)
-
-                    query = query.where(and_(*conditions))
-
-                if limit:
-                    query = query.limit(limit)
+        # Murakkab shartlar (not_in, in, oraliqlar) ham qo'llab-quvvatlanadi
+        query, params = self.STATEMENTS.select(model, filters, limit)
 
-                result = await session.execute(query)
-                records = result.scalars().all()
-                if self.logging:
-                    self.logging.info(f"Retrieved {len(records)} records from {model.__name__}")
-                return records
-            except Exception as e:
-                if self.logging:
-                    self.logging.error(f"Error retrieving data from {model.__name__}: {e}", exc_info=True)
-                raise
+        async def run(session: AsyncSession) -> List[SQLModel]:
+            return (await session.execute(query, params)).scalars().all()
+
+        try:
+            records = await self.read(run)
+            if self.logging:
+                self.logging.info("Retrieved %d records from %s", len(records), model.__name__, extra=QUERY)
+            return records
+        except Exception as e:
+            if self.logging:
+                self.logging.error("Error retrieving data from %s: %s", model.__name__, e, exc_info=True)
+            raise
 
+    @timed("get_table")
     async def get_table(
             self,
             model: Type[SQLModel],
@@ -195,58 +639,485 @@ class DatabaseService1:
         :param relationships: Eager loading uchun Relationship maydonlari.
         :return: Model yozuvlari.
         """
+        # Munosabatlar va filtr ustunlari so'rov shakliga kiradi, qiymatlar - parametrlarga
+        valid = {key: value for key, value in filters.items() if hasattr(model, key)} if filters else None
+        query, params = self.STATEMENTS.select(model, valid, limit, relationships or ())
+
+        async def run(session: AsyncSession) -> List[SQLModel]:
+            # selectinload so'rovlari ham shu sessiyada (o'sha replikada) bajariladi
+            return (await session.execute(query, params)).scalars().all()
+
+        try:
+            return await self.read(run)
+        except Exception as e:
+            if self.logging:
+                self.logging.error("Error retrieving data from %s: %s", model.__name__, e, exc_info=True)
+            raise
+
+    @staticmethod
+    def resolve_column(model: Type[SQLModel], path: str) -> Tuple[Any, Optional[str]]:
+        """
+        `"field"` yoki `"relation.field"` yo'lini ustunga aylantiradi.
+        :return: (ustun, munosabat nomi yoki None)
+        """
+        if "." not in path:
+            return getattr(model, path), None
+        relation, field = path.split(".", 1)
+        related = getattr(model, relation).property.mapper.class_
+        return getattr(related, field), relation
+
+    @timed("select_columns")
+    async def select_columns(
+            self,
+            model: Type[SQLModel],
+            columns: Union[Sequence[str], Dict[str, str]],
+            filters: Optional[Dict[str, Any]] = None,
+            order_by: Optional[Sequence[str]] = None,
+            limit: Optional[int] = None,
+            after: Optional[Sequence[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Faqat kerakli ustunlarni o'qiydi va ORM ob'ektlarisiz oddiy lug'atlar qaytaradi.
+        `"relation.field"` ko'rinishidagi ustunlar munosabat bo'yicha LEFT JOIN bilan olinadi.
+        :param model: Asosiy jadval.
+        :param columns: Ustun yo'llari ro'yxati (kalit = yo'l, nuqta `_` ga almashadi)
+                        yoki {"kalit": "yo'l"} lug'ati, masalan {"course_name": "course.name"}.
+        :param filters: Filtlash shartlari; kalitlar ham `"relation.field"` bo'lishi mumkin.
+        :param order_by: Saralash ustunlari, `-` prefiksi kamayish tartibini bildiradi.
+        :param limit: Qaytariladigan qatorlar soni.
+        :param after: Keyset sahifalash: `order_by` ustunlari bo'yicha shu qiymatlardan keyingi qatorlar.
+        :return: Qatorlar lug'atlari.
+        """
+        if not isinstance(columns, dict):
+            columns = {path.replace(".", "_"): path for path in columns}
+        if self.cacheable(model, filters) and not any("." in path for path in columns.values()):
+            key = repr(("columns", sorted(columns.items()), sorted(filters.items()) if filters else None,
+                        list(order_by or ()), limit, list(after) if after else None))
+            rows = await self.CACHE.get_or_load(
+                model.__name__, key, lambda: self._select_columns(model, columns, filters, order_by, limit, after))
+            return [dict(row) for row in rows]  # keshdagi qatorlar so'rovlar orasida bo'lishilmaydi
+        return await self._select_columns(model, columns, filters, order_by, limit, after)
+
+    def columns_query(self, model: Type[SQLModel], columns: Union[Sequence[str], Dict[str, str]],
+                      filters: Optional[Dict[str, Any]] = None, order_by: Optional[Sequence[str]] = None,
+                      limit: Optional[int] = None, after: Optional[Sequence[Any]] = None) -> Any:
+        """`select_columns` va `stream_columns` uchun umumiy SELECT so'rovini tuzadi (bajarmaydi)."""
+        if not isinstance(columns, dict):
+            columns = {path.replace(".", "_"): path for path in columns}
+        relations: List[str] = []
+        selected = []
+        for label, path in columns.items():
+            column, relation = self.resolve_column(model, path)
+            selected.append(column.label(label))
+            if relation and relation not in relations:
+                relations.append(relation)
+
+        conditions = []
+        if filters:
+            # Filtrlar jadval bo'yicha guruhlanadi va har biri o'z modeli ustida quriladi
+            grouped: Dict[Optional[str], Dict[str, Any]] = {}
+            for path, value in filters.items():
+                relation, _, field = path.rpartition(".")
+                grouped.setdefault(relation or None, {})[field] = value
+            for relation, relation_filters in grouped.items():
+                target = model
+                if relation:
+                    target = getattr(model, relation).property.mapper.class_
+                    if relation not in relations:
+                        relations.append(relation)
+                conditions.extend(self.build_conditions(target, relation_filters))
+
+        order_columns = [self.resolve_column(model, path.lstrip("-"))[0] for path in order_by or ()]
+        if after is not None:
+            # Keyset sharti: (a, b) > (:a, :b) - indeks bo'yicha OFFSETsiz davom ettirish
+            descending = {path.startswith("-") for path in order_by or ()}
+            if len(descending) != 1 or len(after) != len(order_columns):
+                raise ValueError("Keyset pagination needs order_by columns of one direction")
+            keyset = tuple_(*order_columns)
+            conditions.append(keyset < tuple_(*after) if descending.pop() else keyset > tuple_(*after))
+
+        query = select(*selected).select_from(model)
+        for relation in relations:
+            query = query.outerjoin(getattr(model, relation))
+        if conditions:
+            query = query.where(and_(*conditions))
+        for path, column in zip(order_by or (), order_columns):
+            query = query.order_by(column.desc() if path.startswith("-") else column)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    async def _select_columns(self, model: Type[SQLModel], columns: Dict[str, str],
+                              filters: Optional[Dict[str, Any]], order_by: Optional[Sequence[str]],
+                              limit: Optional[int], after: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
         async with self.session_scope() as session:
             try:
-                # Asosiy so'rov
-                query = select(model)
+                query = self.columns_query(model, columns, filters, order_by, limit, after)
+                result = await session.execute(query)
+                rows = [dict(row) for row in result.mappings()]
+                if self.logging:
+                    self.logging.info("Selected %d rows from %s", len(rows), model.__name__, extra=QUERY)
+                return rows
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error selecting columns from %s: %s", model.__name__, e, exc_info=True)
+                raise
 
-                # Eager load qilingan munosabatlar
-                if relationships:
-                    for relation in relationships:
-                        query = query.options(selectinload(getattr(model, relation)))
+    @timed("group_ids")
+    async def group_ids(self, model: Type[SQLModel], keys: Sequence[str], columns: Sequence[str],
+                        filters: Optional[Dict[str, Any]] = None) -> Dict[Tuple[Any, ...], Dict[str, List[int]]]:
+        """
+        Bitta `GROUP BY` so'rovi: `keys` bo'yicha har bir guruh uchun `columns` ustunlarining
+        takrorlanmas qiymatlari (`array_agg(DISTINCT ...)`).
+        :param keys: Guruhlash ustunlari, masalan ["day", "time_slot"].
+        :param columns: Yig'iladigan ustunlar, masalan ["teacher_id", "room_id"].
+        :return: {kalit qiymatlari korteji: {ustun: [qiymatlar]}}
+        """
+        key_columns = [getattr(model, key) for key in keys]
+        query = select(*key_columns, *(func.array_agg(getattr(model, column).distinct()).label(column)
+                                       for column in columns)).group_by(*key_columns)
+        if filters:
+            query = query.where(and_(*self.build_conditions(model, filters)))
+        async with self.session_scope() as session:
+            try:
+                result = await session.execute(query)
+                width = len(keys)
+                groups = {tuple(row[:width]): {column: [value for value in row[width + index] if value is not None]
+                                               for index, column in enumerate(columns)}
+                          for row in result}
+                if self.logging:
+                    self.logging.info("Grouped %s into %d groups", model.__name__, len(groups), extra=QUERY)
+                return groups
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error grouping %s: %s", model.__name__, e, exc_info=True)
+                raise
 
-                # Filtrlash shartlari
-                if filters:
-                    conditions = [getattr(model, key) == value for key, value in filters.items() if hasattr(model, key)]
-                    if conditions:
-                        query = query.where(and_(*conditions))
+    @timed("cell_masks")
+    async def cell_masks(self, model: Type[SQLModel], key: str, slots: int,
+                         filters: Optional[Dict[str, Any]] = None) -> Dict[Any, int]:
+        """
+        Bitta `GROUP BY` so'rovi: `key` bo'yicha band kataklar bitmapi,
+        `bit_or(1 << ((day - 1) * slots + time_slot - 1))`. Modelda `day` va `time_slot` ustunlari bo'lishi kerak.
+        :param key: Guruhlash ustuni, masalan "teacher_id".
+        :param slots: Kundagi darslar soni.
+        :return: {kalit qiymati: bitmap}
+        """
+        column = getattr(model, key)
+        bit = literal(1, BigInteger).op("<<")((model.day - 1) * slots + model.time_slot - 1)
+        query = select(column, func.bit_or(bit)).group_by(column)
+        if filters:
+            query = query.where(and_(*self.build_conditions(model, filters)))
+        async with self.session_scope() as session:
+            try:
+                result = await session.execute(query)
+                masks = {value: mask for value, mask in result}
+                if self.logging:
+                    self.logging.info("Collected %d %s masks from %s", len(masks), key, model.__name__, extra=QUERY)
+                return masks
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error collecting masks from %s: %s", model.__name__, e, exc_info=True)
+                raise
 
-                # Limit
-                if limit:
-                    query = query.limit(limit)
+    async def changes(self, models: Sequence[Type[SQLModel]], since: Optional[datetime] = None,
+                      limit: int = CHANGES_PAGE_SIZE, cursor: Optional[datetime] = None,
+                      position: Optional[Sequence[Any]] = None
+                      ) -> Tuple[datetime, Dict[str, Dict[str, List[Any]]], Optional[List[Any]]]:
+        """
+        `since` dan beri yaratilgan/o'zgartirilgan yozuvlar va o'chirilgan identifikatorlarning bitta sahifasi
+        (jami `limit` tadan oshmaydi). Jadvallar `models` tartibida, har birida avval (updated_at, id) bo'yicha
+        yozuvlar, keyin o'chirilganlar. Chegaradagi yozuvlar qayta yuborilishi mumkin - mijoz ularni id bo'yicha
+        ustidan yozadi.
+        :param models: Jadvallar (`updated_at` ustuni bo'lishi kerak).
+        :param since: Oldingi sinxronlash kursori; None - to'liq nusxa (o'chirishlarsiz).
+        :param cursor: Birinchi sahifada olingan kursor (davom etayotgan sahifalar uchun).
+        :param position: Oldingi sahifa qaytargan davom etish joyi.
+        :return: (keyingi sinxronlash kursori, {jadval: {"upserted": [qatorlar], "deleted": [id]}},
+            davom etish joyi yoki oxirgi sahifada None).
+        """
+        index, phase, last = position or (0, "upserted", None)
+        if not isinstance(index, int) or not 0 <= index < max(len(models), 1) or phase not in ("upserted", "deleted") \
+                or last is not None and not (isinstance(last, int) if phase == "deleted" else
+                                             isinstance(last, list) and len(last) == 2 and isinstance(last[1], int)):
+            raise ValueError("Invalid cursor")
+        changes: Dict[str, Dict[str, List[Any]]] = {model.__tablename__: {"upserted": [], "deleted": []}
+                                                    for model in models}
+        remaining = limit
+        async with self.session_scope() as session:
+            try:
+                if cursor is None:
+                    cursor = (await session.execute(SYNC_CURSOR)).scalar_one()
+                for index in range(index, len(models)):
+                    model = models[index]
+                    entry = changes[model.__tablename__]
+                    if phase == "upserted":
+                        query = select(*model.__table__.columns).order_by(model.updated_at, model.id)
+                        if since is not None:
+                            query = query.where(model.updated_at >= since)
+                        if last is not None:
+                            query = query.where(tuple_(model.updated_at, model.id) >
+                                                tuple_(literal(datetime.fromisoformat(last[0])), literal(last[1])))
+                        rows = [dict(row) for row in (await session.execute(query.limit(remaining + 1))).mappings()]
+                        entry["upserted"] = rows[:remaining]
+                        if len(rows) > remaining:
+                            last_row = entry["upserted"][-1]
+                            return cursor, changes, [index, phase, [last_row["updated_at"].isoformat(), last_row["id"]]]
+                        remaining -= len(rows)
+                        phase, last = "deleted", None
+                    if since is not None:
+                        # Qayta yozilgan (rewrite_rows) va hozir mavjud yozuvlar o'chirilgan hisoblanmaydi
+                        query = select(DeletedRow.row_id).distinct().where(
+                            DeletedRow.table_name == model.__tablename__, DeletedRow.deleted_at >= since,
+                            ~exists().where(model.id == DeletedRow.row_id)).order_by(DeletedRow.row_id)
+                        if last is not None:
+                            query = query.where(DeletedRow.row_id > last)
+                        deleted = list((await session.execute(query.limit(remaining + 1))).scalars().all())
+                        entry["deleted"] = deleted[:remaining]
+                        if len(deleted) > remaining:
+                            return cursor, changes, [index, phase, entry["deleted"][-1]]
+                        remaining -= len(deleted)
+                    phase, last = "upserted", None
+                if self.logging:
+                    self.logging.info("Collected changes since %s from %d tables", since, len(models), extra=QUERY)
+                return cursor, changes, None
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error collecting changes since %s: %s", since, e, exc_info=True)
+                raise
 
-                result = await session.execute(query)
-                records = result.scalars().all()
-                return records
+    async def prune_deleted_rows(self, before: datetime) -> int:
+        """O'chirilgan yozuvlar izidan `before` dan eskilarini o'chiradi; o'chirilganlar soni."""
+        async with self.session_scope() as session:
+            try:
+                result = await session.execute(delete(DeletedRow).where(DeletedRow.deleted_at < before))
+                await self.commit(session)
+                if self.logging:
+                    self.logging.info("Pruned %d deleted rows older than %s", result.rowcount, before, extra=WRITE)
+                return result.rowcount
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error retrieving data from {model.__name__}: {e}", exc_info=True)
+                    self.logging.error("Error pruning deleted rows: %s", e, exc_info=True)
                 raise
 
+    async def stream_columns(
+            self,
+            model: Type[SQLModel],
+            columns: Union[Sequence[str], Dict[str, str]],
+            filters: Optional[Dict[str, Any]] = None,
+            order_by: Optional[Sequence[str]] = None,
+            batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        `select_columns` kabi, lekin natija server tomonidagi kursor (`AsyncSession.stream()`) orqali
+        `batch_size` qatordan o'qiladi va qatorlar kelishi bilan birma-bir qaytariladi.
+        Butun natija xotirada yig'ilmaydi, kesh ishlatilmaydi.
+        :param batch_size: Kursordan bir martada olinadigan qatorlar soni.
+        :return: Qatorlar lug'atlari (asinxron iterator).
+        """
+        query = self.columns_query(model, columns, filters, order_by).execution_options(yield_per=batch_size)
+        replica = await self.read_replica()
+        if replica is not None:
+            session = replica.session()
+            try:
+                try:
+                    result = await session.stream(query)
+                except Exception as e:
+                    # Qator yuborilmasidan oldin - primaryda qayta ochish mumkin
+                    if not self.REPLICAS.should_fallback(replica, e):
+                        raise
+                    if self.logging:
+                        self.logging.warning("Stream on replica %s failed, retrying on primary: %s", replica.name, e)
+                else:
+                    DB_READS.inc(target="replica")
+                    async for row in self._stream_rows(model, result):
+                        yield row
+                    return
+            finally:
+                await session.close()
+        # Javob oqimi so'rov tranzaksiyasidan keyin ham davom etadi, shuning uchun alohida sessiya
+        async with self.session_scope(shared=False) as session:
+            DB_READS.inc(target="primary")
+            async for row in self._stream_rows(model, await session.stream(query)):
+                yield row
+
+    async def _stream_rows(self, model: Type[SQLModel], result: Any) -> AsyncIterator[Dict[str, Any]]:
+        count = 0
+        try:
+            async for row in result.mappings():
+                count += 1
+                yield dict(row)
+        finally:
+            await result.close()
+            if self.logging:
+                self.logging.info("Streamed %d rows from %s", count, model.__name__, extra=QUERY)
+
+    @staticmethod
+    def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+        """Keyset kursorini shaffof bo'lmagan satrga o'giradi."""
+        return urlsafe_b64encode(dumps([sort, list(values)]).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str) -> List[Any]:
+        """Kursorni ochadi; boshqa saralash uchun yaratilgan bo'lsa ValueError."""
+        try:
+            cursor_sort, values = loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if cursor_sort != sort:
+            raise ValueError("Cursor does not match sort order")
+        return values
+
+    @staticmethod
+    def _page_shape(columns: Union[Sequence[str], Dict[str, str]],
+                    sort: str) -> Tuple[Dict[str, str], List[str], Dict[str, str]]:
+        """Sahifa so'rovi uchun ustunlar (kursor ustunlari bilan), saralash va kursor kalitlari."""
+        if not isinstance(columns, dict):
+            columns = {path.replace(".", "_"): path for path in columns}
+        direction = "-" if sort.startswith("-") else ""
+        field = sort.lstrip("-")
+        order_by = [sort] if field == "id" else [sort, f"{direction}id"]
+        keys = {"_cursor_" + path.lstrip("-"): path.lstrip("-") for path in order_by}
+        return {**columns, **keys}, order_by, keys
+
+    def page_query(self, model: Type[SQLModel], columns: Union[Sequence[str], Dict[str, str]],
+                   filters: Optional[Dict[str, Any]] = None, sort: str = "id") -> Any:
+        """`select_page` birinchi sahifa uchun bajaradigan so'rov (masalan, oldindan tayyorlab qo'yish uchun)."""
+        columns, order_by, _ = self._page_shape(columns, sort)
+        return self.columns_query(model, columns, filters, order_by, PAGE_SIZE_DEFAULT + 1)
+
+    @timed("select_page")
+    async def select_page(
+            self,
+            model: Type[SQLModel],
+            columns: Union[Sequence[str], Dict[str, str]],
+            filters: Optional[Dict[str, Any]] = None,
+            sort: str = "id",
+            cursor: Optional[str] = None,
+            limit: int = PAGE_SIZE_DEFAULT,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Keyset sahifalash: `sort` ustuni (so'ng `id`) bo'yicha barqaror tartibda bitta sahifa.
+        :param sort: Saralash ustuni, `-` prefiksi kamayish tartibi (masalan, "-name").
+        :param cursor: Oldingi sahifa qaytargan kursor.
+        :param limit: Sahifa hajmi, `PAGE_SIZE_MAX` bilan cheklanadi.
+        :return: (qatorlar, keyingi sahifa kursori yoki None)
+        """
+        limit = max(1, min(limit, PAGE_SIZE_MAX))
+        columns, order_by, keys = self._page_shape(columns, sort)
+        after = self.decode_cursor(cursor, sort) if cursor else None
+        rows = await self.select_columns(model, columns, filters, order_by, limit + 1, after)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(sort, [rows[-1][key] for key in keys])
+        # Keshdagi qatorlar o'zgartirilmasligi uchun yangi lug'atlar tuziladi
+        return [{key: value for key, value in row.items() if key not in keys} for row in rows], next_cursor
+
     async def delete(self, model: Type[SQLModel], filters: Dict[str, Any]) -> int:
         """
         Yozuvlarni o'chirish.
         :param model: Model jadvali.
-        :param filters: Filtlash shartlari.
+        :param filters: Filtlash shartlari (murakkab shartlar ham, masalan {"id": {"in": [1, 2]}}).
         :return: O'chirilgan yozuvlar soni.
         """
+        return len(await self.delete_many(model, filters))
+
+    async def delete_many(self, model: Type[SQLModel], filters: Dict[str, Any]) -> List[int]:
+        """
+        Yozuvlarni bitta `DELETE ... WHERE ... RETURNING` so'rovi bilan o'chiradi (ORM ob'ektlari yuklanmaydi).
+        :param model: Model jadvali.
+        :param filters: Filtlash shartlari, masalan {"course_id": 3} yoki {"day": {"between": [1, 3]}}.
+        :return: O'chirilgan yozuvlar identifikatorlari.
+        """
+        return [row.id for row in await self.delete_rows(model, filters)]
+
+    @timed("delete")
+    async def delete_rows(self, model: Type[SQLModel], filters: Dict[str, Any]) -> List[Row]:
+        """
+        `delete_many` kabi, lekin o'chirilgan qatorlarning barcha ustunlarini qaytaradi.
+        :return: O'chirilgan qatorlar (ustunlar atribut sifatida).
+        """
         async with self.session_scope() as session:
             try:
-                query = select(model)
-                conditions = [getattr(model, key) == value for key, value in filters.items() if hasattr(model, key)]
-                query = query.where(and_(*conditions))
-                result = await session.execute(query)
-                records = result.scalars().all()
+                conditions = self.build_conditions(model, filters)
+                if not conditions:
+                    raise ValueError(f"No valid filters applied for model {model.__name__}")
+                query = delete(model).where(and_(*conditions)).returning(*model.__table__.columns)
+                result = await session.execute(query.execution_options(synchronize_session=False))
+                rows = list(result.all())
+                await self.commit(session)
+                await self.invalidate(model)
+                if self.logging:
+                    self.logging.info("Deleted %d records from %s", len(rows), model.__name__, extra=WRITE)
+                return rows
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error deleting records from %s: %s", model.__name__, e, exc_info=True)
+                raise
 
-                if records:
-                    for record in records:
-                        await session.delete(record)
-                    await session.commit()
-                    if self.logging:
-                        self.logging.info(f"Deleted {len(records)} records from {model.__name__}")
-                    return len(records)
-                return 0
+    @timed("replace")
+    async def replace(self, model: Type[SQLModel], filters: Dict[str, Any], instances: List[SQLModel]) -> List[int]:
+        """
+        Filtrga mos yozuvlarni o'chirib, yangi yozuvlarni bitta tranzaksiyada qo'shadi.
+        :param model: Model jadvali.
+        :param filters: O'chiriladigan yozuvlar uchun filtlash shartlari.
+        :param instances: Qo'shiladigan yangi yozuvlar.
+        :return: Qo'shilgan yozuvlar identifikatorlari (kiritish tartibida).
+        """
+        async with self.session_scope() as session:
+            try:
+                conditions = self.build_conditions(model, filters)
+                if not conditions:
+                    raise ValueError(f"No valid filters applied for model {model.__name__}")
+                query = delete(model).where(and_(*conditions))
+                result = await session.execute(query.execution_options(synchronize_session=False))
+                ids = await self._insert_rows(session, instances)
+                await self.commit(session)
+                await self.invalidate(model)
+                if self.logging:
+                    self.logging.info("Replaced %d records with %d in %s", result.rowcount, len(ids), model.__name__, extra=WRITE)
+                return ids
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
+            except Exception as e:
+                if self.logging:
+                    self.logging.error("Error replacing records in %s: %s", model.__name__, e, exc_info=True)
+                raise
+
+
+    @timed("rewrite_rows")
+    async def rewrite_rows(self, model: Type[SQLModel], values: Dict[int, Dict[str, Any]]) -> List[Row]:
+        """
+        Bir nechta yozuvni bir vaqtda ko'chiradi: yozuvlar o'chirilib, o'sha identifikatorlar bilan yangi
+        qiymatlarda qayta yoziladi (bitta tranzaksiya). Ketma-ket `UPDATE` lar (masalan, ikki yozuv joy
+        almashganda) kechiktirilmaydigan unique/EXCLUDE cheklovlarini oraliq holatda buzishi mumkin.
+        :param values: Yozuv id -> yangi ustun qiymatlari.
+        :return: O'zgarishdan oldingi qatorlar (topilmaganlari qaytarilmaydi va yozilmaydi).
+        """
+        if not values:
+            return []
+        async with self.session_scope() as session:
+            try:
+                query = delete(model).where(model.id.in_(list(values))).returning(*model.__table__.columns)
+                result = await session.execute(query.execution_options(synchronize_session=False))
+                previous = list(result.all())
+                if previous:
+                    # `updated_at` qayta yozilmaydi - server `now()` qo'yadi, o'zgarishlar lentasi ko'chishni ko'radi
+                    rows = [{**{key: value for key, value in row._mapping.items() if key != "updated_at"},
+                             **values[row.id]} for row in previous]
+                    await session.execute(insert(model), rows)
+                await self.commit(session)
+                await self.invalidate(model)
+                if self.logging:
+                    self.logging.info("Rewrote %d records in %s", len(previous), model.__name__, extra=WRITE)
+                return previous
+            except IntegrityError:
+                raise  # session_scope to'qnashuvni ConflictError ga aylantiradi
             except Exception as e:
                 if self.logging:
-                    self.logging.error(f"Error deleting records from {model.__name__}: {e}", exc_info=True)
-                raise
\ No newline at end of file
+                    self.logging.error("Error rewriting records in %s: %s", model.__name__, e, exc_info=True)
+                raise
+
+
+register_pool_metrics(DatabaseService1)
@@ -1,8 +1,17 @@
-from .models import Course, Group, Room, Teacher, TeacherInfo, LessonType, Subject, Schedule
-from .DatabaseSer import DatabaseService1
-from .base_models_ import GroupRequest
-from .config import DATABASE_URL, ENV
-from .core import DatabaseCore, get_db_core
+from .models import Course, Group, Room, Teacher, TeacherInfo, LessonType, Subject, Schedule, DeletedRow
+from .DatabaseSer import DatabaseService1, ConflictError, UnitOfWork
+from .base_models_ import GroupRequest, RepairRequest, SlotCell, UnavailabilityRequest
+from .config import DATABASE_URL, ENV, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, POOL_WARMUP_CONNECTIONS, DATABASE_REPLICA_URLS, \
+    REPLICA_STICKY_SECONDS, CHANGES_PAGE_SIZE, CHANGES_PAGE_SIZE_MAX, CHANGES_RETENTION_DAYS, CHANGES_PRUNE_INTERVAL
+from .budget import pool_budget, configured_pool
+from .replicas import Replica, ReplicaSet
+from .core import DatabaseCore, get_db_core, init_db_core, close_db_core
+from .occupancy import OccupancyIndex, occupancy_index
+from .statements import StatementCache, statement_cache
+from .cache import CacheBackend, LRUCacheBackend, AiocacheBackend, QueryCache, query_cache
+from .versions import REFERENCE_MODELS, TimetableVersions, timetable_versions
 
-__all__ = ["DatabaseService1", "DATABASE_URL", "ENV", "Course", "Group", "Room", "Teacher",
-           "GroupRequest", "DatabaseCore", "TeacherInfo", "LessonType", "get_db_core", "Subject", "Schedule"]
+__all__ = ["DatabaseService1", "ConflictError", "UnitOfWork", "DATABASE_URL", "ENV", "PAGE_SIZE_DEFAULT", "PAGE_SIZE_MAX", "POOL_WARMUP_CONNECTIONS", "DATABASE_REPLICA_URLS", "REPLICA_STICKY_SECONDS", "CHANGES_PAGE_SIZE", "CHANGES_PAGE_SIZE_MAX", "CHANGES_RETENTION_DAYS", "CHANGES_PRUNE_INTERVAL", "pool_budget", "configured_pool", "Replica", "ReplicaSet", "Course", "Group", "Room", "Teacher",
+           "GroupRequest", "RepairRequest", "SlotCell", "UnavailabilityRequest", "DatabaseCore", "TeacherInfo", "LessonType", "get_db_core", "init_db_core", "close_db_core", "Subject", "Schedule", "DeletedRow",
+           "OccupancyIndex", "occupancy_index", "CacheBackend", "LRUCacheBackend", "AiocacheBackend", "QueryCache",
+           "query_cache", "StatementCache", "statement_cache", "REFERENCE_MODELS", "TimetableVersions", "timetable_versions"]
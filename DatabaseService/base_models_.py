@@ -1,5 +1,30 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 class GroupRequest(BaseModel):
     name: str
-    course_id: int
\ No newline at end of file
+    course_id: int
+
+class RepairRequest(BaseModel):
+    """
+    Jadvalni buzadigan o'zgarish: o'qituvchi ayrim kunlarda (yoki butun hafta) band bo'ldi
+    va/yoki xona olib tashlandi.
+    """
+    teacher_id: Optional[int] = None
+    days: Optional[List[int]] = None  # None - o'qituvchi butun hafta band
+    room_id: Optional[int] = None  # xona butun hafta band (olib tashlangan)
+
+
+class SlotCell(BaseModel):
+    day: int
+    time_slot: int
+
+
+class UnavailabilityRequest(BaseModel):
+    """
+    O'qituvchi yoki xona band bo'lgan kataklar: tayyor `mask` (bit `(day - 1) * 4 + (time_slot - 1)`),
+    alohida `cells` va/yoki butun `days`. Berilganlari birlashtiriladi.
+    """
+    mask: Optional[int] = None
+    cells: Optional[List[SlotCell]] = None
+    days: Optional[List[int]] = None
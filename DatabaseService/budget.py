@@ -0,0 +1,35 @@
+from typing import Optional, Tuple
+from .config import DB_MAX_CONNECTIONS, DB_RESERVED_CONNECTIONS, DB_WORKER_EXTRA_CONNECTIONS, WEB_CONCURRENCY, \
+    WEB_SURGE_WORKERS, DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+
+def pool_budget(
+        workers: int = WEB_CONCURRENCY,
+        max_connections: int = DB_MAX_CONNECTIONS,
+        reserved: int = DB_RESERVED_CONNECTIONS,
+        extra_per_worker: int = DB_WORKER_EXTRA_CONNECTIONS,
+        surge: int = WEB_SURGE_WORKERS,
+) -> Tuple[int, int]:
+    """
+    Bitta worker havzasi o'lchami: `(pool_size, max_overflow)`.
+    `max_connections - reserved` ulanish `workers + surge` ta jarayonga teng bo'linadi (navbatma-navbat qayta
+    ishga tushirishda eski va yangi worker bir vaqtda ishlaydi); har biridan havzadan tashqari ulanishlar
+    ayiriladi. Ulushning taxminan uchdan ikkisi doimiy havza, qolgani vaqtinchalik ortiqcha ulanishlar.
+    :raise ValueError: Byudjet har bir workerga kamida ikki ulanish bermasa.
+    """
+    share = (max_connections - reserved) // max(1, workers + surge) - extra_per_worker
+    if share < 2:
+        raise ValueError(f"Connection budget too small: {max_connections} connections, {reserved} reserved, "
+                         f"{workers} workers (+{surge} surge) leave {share} per worker")
+    pool_size = max(1, share * 2 // 3)
+    return pool_size, share - pool_size
+
+
+def configured_pool() -> Tuple[int, int]:
+    """`DB_POOL_SIZE`/`DB_MAX_OVERFLOW` berilgan bo'lsa - ular, aks holda `pool_budget()`."""
+    pool_size, max_overflow = pool_budget()
+    return _int(DB_POOL_SIZE, pool_size), _int(DB_MAX_OVERFLOW, max_overflow)
+
+
+def _int(value: Optional[str], default: int) -> int:
+    return int(value) if value not in (None, "") else default
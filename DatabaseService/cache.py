@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pickle import dumps, loads
+from time import monotonic
+from .config import CACHE_BACKEND, CACHE_TTL, CACHE_MAX_SIZE, REDIS_URL
+
+
+class CacheBackend(ABC):
+    """Kesh saqlash joyi uchun interfeys. Xotira, Redis yoki test uchun o'rinbosar bo'lishi mumkin."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Qiymatni qaytaradi; topilmasa yoki muddati o'tgan bo'lsa None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Qiymatni yozadi; `ttl` - soniyalarda (None yoki 0 - muddatsiz)."""
+
+    @abstractmethod
+    async def increment(self, key: str) -> int:
+        """Hisoblagichni bittaga oshiradi va yangi qiymatini qaytaradi."""
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Hisoblagich qiymati (mavjud bo'lmasa 0)."""
+
+
+class LRUCacheBackend(CacheBackend):
+    """Jarayon ichidagi LRU kesh, har bir yozuv uchun TTL bilan."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}  # hisoblagichlar LRU bo'yicha chiqarib yuborilmaydi
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._entries[key] = (monotonic() + ttl if ttl else 0, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def increment(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+
+class AiocacheBackend(CacheBackend):
+    """
+    aiocache keshlari (masalan, Redis) ustidagi adapter.
+    Qiymatlar pickle orqali baytlarga o'giriladi, shuning uchun kesh NullSerializer bilan ishlatiladi.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    async def get(self, key: str) -> Any:
+        raw = await self.cache.get(key)
+        return loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self.cache.set(key, dumps(value), ttl=ttl or None)
+
+    async def increment(self, key: str) -> int:
+        return await self.cache.increment(key)
+
+    async def counter(self, key: str) -> int:
+        return int(await self.cache.get(key) or 0)
+
+
+class QueryCache:
+    """
+    Read-through kesh. Har bir model o'z nomlar fazosiga ega; fazoning avlod (generation) raqami
+    yozuv keyiga qo'shiladi, shuning uchun bekor qilish bitta hisoblagichni oshirishdan iborat va
+    bekor qilishdan oldin boshlangan o'qish eskirgan qiymatni joriy avlodga yoza olmaydi.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[int] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        self.listeners: List[Callable[[str], Awaitable[None]]] = []
+
+    async def get_or_load(self, namespace: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Keshdan qaytaradi, bo'lmasa `loader` orqali yuklab keshga yozadi."""
+        try:
+            generation = await self.generation(namespace)
+            full_key = f"{namespace}:{generation}:{key}"
+            value = await self.backend.get(full_key)
+        except Exception:
+            self.errors += 1
+            return await loader()
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = await loader()
+        try:
+            await self.backend.set(full_key, value, self.ttl)
+        except Exception:
+            self.errors += 1
+        return value
+
+    async def generation(self, namespace: str) -> int:
+        """Nomlar fazosining joriy avlod raqami."""
+        return await self.backend.counter(f"{namespace}:generation")
+
+    async def bump(self, namespace: str) -> None:
+        """Nomlar fazosining avlod raqamini oshiradi."""
+        try:
+            await self.backend.increment(f"{namespace}:generation")
+        except Exception:
+            self.errors += 1
+
+    async def invalidate(self, namespace: str, notify: bool = True) -> None:
+        """
+        Nomlar fazosidagi barcha yozuvlarni bekor qiladi.
+        :param notify: False bo'lsa, `on_invalidate` tinglovchilari chaqirilmaydi (boshqa workerdan kelgan bekor qilish).
+        """
+        self.invalidations += 1
+        await self.bump(namespace)
+        if notify:
+            for listener in self.listeners:
+                try:
+                    await listener(namespace)
+                except Exception:
+                    self.errors += 1
+
+    def on_invalidate(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        """
+        Har bir bekor qilishdan keyin chaqiriladigan tinglovchi, masalan, jarayon ichidagi keshlarni
+        bekor qilishni boshqa workerlarga yuborish uchun.
+        """
+        self.listeners.append(listener)
+
+    @property
+    def shared(self) -> bool:
+        """Avlod hisoblagichlari barcha workerlar uchun umumiymi (Redis) yoki jarayon ichidami."""
+        return not isinstance(self.backend, LRUCacheBackend)
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+def build_backend(name: str = CACHE_BACKEND) -> CacheBackend:
+    """Sozlamaga ko'ra kesh backendini yaratadi."""
+    if name == "redis":
+        from aiocache import Cache
+        from aiocache.serializers import NullSerializer
+
+        cache = Cache.from_url(REDIS_URL)
+        cache.serializer = NullSerializer()
+        return AiocacheBackend(cache)
+    return LRUCacheBackend(CACHE_MAX_SIZE)
+
+
+query_cache = QueryCache(build_backend(), ttl=CACHE_TTL)
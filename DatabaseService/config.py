@@ -4,4 +4,55 @@ from os import environ
 load_dotenv()
 
 DATABASE_URL = environ.get("DATABASE_URL")
-ENV = environ.get("ENV")
\ No newline at end of file
+ENV = environ.get("ENV")
+
+# Ma'lumotnoma jadvallari (Course, Teacher, Room, Subject) uchun kesh sozlamalari
+CACHE_BACKEND = environ.get("CACHE_BACKEND", "memory")  # "memory" yoki "redis" (`pip install .[redis]` kerak)
+CACHE_TTL = int(environ.get("CACHE_TTL", 300))
+CACHE_MAX_SIZE = int(environ.get("CACHE_MAX_SIZE", 1024))
+REDIS_URL = environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+# Ro'yxat endpointlari uchun sahifa hajmi
+PAGE_SIZE_DEFAULT = int(environ.get("PAGE_SIZE_DEFAULT", 100))
+PAGE_SIZE_MAX = int(environ.get("PAGE_SIZE_MAX", 1000))
+
+# Eksport: server tomonidagi kursordan bir martada o'qiladigan qatorlar soni
+STREAM_BATCH_SIZE = int(environ.get("STREAM_BATCH_SIZE", 1000))
+
+# Ilova ishga tushganda oldindan ochiladigan havza ulanishlari soni (0 - isitish o'chiriladi)
+POOL_WARMUP_CONNECTIONS = int(environ.get("POOL_WARMUP_CONNECTIONS", 10))
+
+# Ulanishlar byudjeti: Postgres `max_connections` workerlar havzalariga bo'linadi
+DB_MAX_CONNECTIONS = int(environ.get("DB_MAX_CONNECTIONS", 200))
+# Superuser, zaxira nusxa, migratsiya va psql uchun qoldiriladigan ulanishlar
+DB_RESERVED_CONNECTIONS = int(environ.get("DB_RESERVED_CONNECTIONS", 20))
+# Har bir workerning havzadan tashqari ulanishlari (o'zgarishlar shinasining LISTEN ulanishi)
+DB_WORKER_EXTRA_CONNECTIONS = int(environ.get("DB_WORKER_EXTRA_CONNECTIONS", 1))
+# Ishlab turgan workerlar soni (launcher o'rnatadi) va navbatma-navbat qayta ishga tushirishdagi qo'shimcha workerlar
+WEB_CONCURRENCY = int(environ.get("WEB_CONCURRENCY", 1))
+WEB_SURGE_WORKERS = int(environ.get("WEB_SURGE_WORKERS", 1))
+# Qo'lda berilgan havza o'lchamlari (bo'sh - byudjetdan hisoblanadi)
+DB_POOL_SIZE = environ.get("DB_POOL_SIZE")
+DB_MAX_OVERFLOW = environ.get("DB_MAX_OVERFLOW")
+
+# O'qish replikalari: vergul bilan ajratilgan ulanish satrlari (bo'sh - hamma so'rovlar primaryga)
+DATABASE_REPLICA_URLS = [url.strip() for url in environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Yozuvdan keyin shu so'rov/sessiya o'qishlari primaryda qoladigan oyna (soniya)
+REPLICA_STICKY_SECONDS = float(environ.get("REPLICA_STICKY_SECONDS", 5))
+# Replika shundan ko'p orqada qolsa, o'qishlar primaryga o'tadi (soniya)
+REPLICA_MAX_LAG_SECONDS = float(environ.get("REPLICA_MAX_LAG_SECONDS", 2))
+# Replika kechikishini tekshirish oralig'i, tekshiruv/ulanish vaqt chegarasi va ishlamayotgan replikani qayta sinash
+REPLICA_CHECK_INTERVAL = float(environ.get("REPLICA_CHECK_INTERVAL", 5))
+REPLICA_CHECK_TIMEOUT = float(environ.get("REPLICA_CHECK_TIMEOUT", 2))
+REPLICA_RETRY_SECONDS = float(environ.get("REPLICA_RETRY_SECONDS", 30))
+
+# `get`/`get_for_schedule`/`get_table` uchun so'rov shakllari keshi hajmi (0 - o'chirilgan)
+STATEMENT_CACHE_SIZE = int(environ.get("STATEMENT_CACHE_SIZE", 512))
+
+# /api/changes: bitta sahifadagi qatorlar (upserted + deleted) soni va uning yuqori chegarasi
+CHANGES_PAGE_SIZE = int(environ.get("CHANGES_PAGE_SIZE", 1000))
+CHANGES_PAGE_SIZE_MAX = int(environ.get("CHANGES_PAGE_SIZE_MAX", 10000))
+# O'chirilgan yozuvlar izi (deleted_rows) saqlanadigan muddat (kun); `since` bundan eski bo'lsa - to'liq nusxa
+CHANGES_RETENTION_DAYS = int(environ.get("CHANGES_RETENTION_DAYS", 30))
+# Muddati o'tgan izlarni tozalash oralig'i (soniya)
+CHANGES_PRUNE_INTERVAL = float(environ.get("CHANGES_PRUNE_INTERVAL", 3600))
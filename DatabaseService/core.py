@@ -1,5 +1,6 @@
 from .DatabaseSer import DatabaseService1
 from typing import List, Optional
+from LoggerService import LoggerService
 from .models import Course
 
 class DatabaseCore(DatabaseService1):
@@ -8,11 +9,31 @@ class DatabaseCore(DatabaseService1):
         course = Course(name=name, description=description)
         try:
             course_id = await self.execute_query(self.add, course)  # Yangi kursni qo'shish
-            self.logging.info(f"Successfully added course: {course}")
+            self.logging.info("Successfully added course: %s", name)
             return course_id
         except Exception as e:
-            self.logging.error(f"Failed to add course: {e}", exc_info=True)
+            self.logging.error("Failed to add course: %s", e, exc_info=True)
             return None
 
+
+# Ilova bo'ylab yagona xizmat ob'ekti (main.py dagi lifespan yaratadi va yopadi)
+_db_core: Optional[DatabaseCore] = None
+
+
+def init_db_core(logger: Optional[LoggerService] = None) -> DatabaseCore:
+    """Yagona xizmat ob'ektini yaratadi."""
+    global _db_core
+    _db_core = DatabaseCore(logger or LoggerService())
+    return _db_core
+
+
+async def close_db_core() -> None:
+    """Yagona xizmat ob'ektini unutadi va ulanishlar havzasini yopadi."""
+    global _db_core
+    _db_core = None
+    await DatabaseCore.dispose()
+
+
 async def get_db_core() -> DatabaseCore:
-    return DatabaseCore()
+    """Yagona xizmat ob'ektini qaytaradi; lifespan ishlamagan bo'lsa (skriptlar) shu yerda yaratiladi."""
+    return _db_core or init_db_core()
@@ -0,0 +1,68 @@
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from MetricsService import REGISTRY
+from .cache import query_cache
+
+DB_LATENCY = REGISTRY.histogram(
+    "db_operation_duration_seconds", "DatabaseService1 amallari vaqti (model va amal bo'yicha)",
+    ("model", "operation"))
+POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds", "Havzadan ulanish olishni kutish vaqti (yangi ulanish ochish bilan)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0))
+
+DB_READS = REGISTRY.counter("db_reads_total", "Replikaga yo'naltiriladigan o'qishlar qayerda bajarilgani", ("target",))
+
+
+def model_name(target: Any) -> str:
+    """Amal nishonidan model nomi: model klassi, yozuv yoki yozuvlar ro'yxati."""
+    if isinstance(target, type):
+        return target.__name__
+    if isinstance(target, (list, tuple)):
+        return type(target[0]).__name__ if target else "none"
+    return type(target).__name__
+
+
+def timed(operation: str) -> Callable:
+    """`DatabaseService1` metodining bajarilish vaqtini `DB_LATENCY` ga yozadi (birinchi argument - model)."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(self, target, *args, **kwargs):
+            started = perf_counter()
+            try:
+                return await func(self, target, *args, **kwargs)
+            finally:
+                DB_LATENCY.observe(perf_counter() - started, model=model_name(target), operation=operation)
+
+        return wrapper
+
+    return decorator
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Ulanish olish (kutish yoki yangisini ochish) vaqtini `POOL_CHECKOUT_WAIT` ga yozadigan havza."""
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(perf_counter() - started)
+
+
+def register_pool_metrics(service: type) -> None:
+    """Havza holati va kesh hisoblagichlari uchun o'qish paytida hisoblanadigan metrikalar."""
+    REGISTRY.gauge("db_pool_connections", "Havza ulanishlari holat bo'yicha", ("state",),
+                   callback=lambda: {(state,): value for state, value in service.pool_status().items()})
+    REGISTRY.gauge("db_replica_lag_seconds", "O'qish replikasi kechikishi (ishlamayotgani - -1)", ("replica",),
+                   callback=lambda: {(item["name"],): -1 if item["lag"] is None else item["lag"]
+                                     for item in service.REPLICAS.status()})
+    REGISTRY.gauge("cache_requests_total", "Ma'lumotnoma keshiga murojaatlar", ("result",), type="counter",
+                   callback=lambda: {("hit",): query_cache.hits, ("miss",): query_cache.misses})
+    REGISTRY.gauge("db_statement_cache_requests_total", "So'rov shakllari keshiga murojaatlar", ("result",),
+                   type="counter", callback=lambda: {("hit",): service.STATEMENTS.hits,
+                                                     ("miss",): service.STATEMENTS.misses})
+    REGISTRY.gauge("cache_hit_ratio", "Ma'lumotnoma keshi hit ulushi",
+                   callback=lambda: {(): query_cache.stats()["hit_rate"]})
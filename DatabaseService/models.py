@@ -1,26 +1,36 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, List, Union
 from sqlalchemy.orm import joinedload
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, Index, BigInteger, CheckConstraint, DateTime, FetchedValue
 from datetime import datetime
-from pytz import timezone
 from json import dumps
 
+# Jadvalga yozilgan vaqt bazada belgilanadi: `created_at` - INSERT da `now()`, `updated_at` - INSERT va har
+# UPDATE da `set_updated_at` triggeri orqali (migratsiya e4b9c2d7a1f3). Ilovada hech qachon to'ldirilmaydi.
+SERVER_TIMESTAMPS = ("created_at", "updated_at")
+
 
 class BaseModel(SQLModel):
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_date: str = Field(default_factory=lambda: datetime.now(timezone('Asia/Tashkent')).strftime("%d:%m:%y"),
-                              description="Yaratilgan vaqt")
-    created_time: str = Field(default_factory=lambda: datetime.now(timezone('Asia/Tashkent')).strftime("%H:%M:%S"),
-                              description="Yaratilgan vaqt")
+    created_at: Optional[datetime] = Field(
+        default=None, sa_type=DateTime(timezone=True), nullable=False, index=True,
+        sa_column_kwargs={"server_default": func.now()}, description="Yaratilgan vaqt")
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_type=DateTime(timezone=True), nullable=False, index=True,
+        sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()},
+        description="Oxirgi o'zgartirilgan vaqt")
+
+    # Trigger qo'ygan `updated_at` UPDATE ... RETURNING bilan darhol o'qiladi (async sessiyada lazy load yo'q)
+    __mapper_args__ = {"eager_defaults": True}
 
     def to_dict(self) -> dict:
         return {col.name: getattr(self, col.name) for col in self.__table__.columns}
 
     def to_json(self) -> str:
         """Ob'ektni JSON formatiga o'tkazadi."""
-        return dumps(self.to_dict(), ensure_ascii=False, indent=4)
+        return dumps(self.to_dict(), ensure_ascii=False, indent=4, default=str)
 
     def update_from_dict(self, data: dict) -> None:
         """
@@ -33,7 +43,7 @@ class BaseModel(SQLModel):
 
     def __repr__(self) -> str:
         """Ob'ektni string formatida taqdim etadi."""
-        return f"<{self.__class__.__name__}(id={self.id}, created_date={self.created_date}, created_time={self.created_time})>"
+        return f"<{self.__class__.__name__}(id={self.id}, created_at={self.created_at}, updated_at={self.updated_at})>"
 
     @classmethod
     def find_by_id(cls, session, obj_id: int) -> Union["BaseModel", None]:
@@ -59,12 +69,18 @@ class Group(BaseModel, table=True):
     course: Course = Relationship(back_populates="groups")
     schedules: List["Schedule"] = Relationship(back_populates="group")  # Guruhdagi jadval
 
+# Band kataklar niqobi 6 x 4 setkadan (24 bit) oshmaydi
+UNAVAILABLE_CHECK = "unavailable BETWEEN 0 AND 16777215"
+
 # O'qituvchi modeli
 class Teacher(BaseModel, table=True):
     __tablename__ = 'teachers'
+    __table_args__ = (CheckConstraint(UNAVAILABLE_CHECK, name="ck_teachers_unavailable"),)
     name: str = Field(..., description="O'qituvchi ismi")
     sciencename: str = Field(None, description="O'qituvchi fani nomi")
     classtime: str = Field(None, description="O'qituvchi vaqti")
+    # Band kataklar: bit `(day - 1) * 4 + (time_slot - 1)` yoqilgan bo'lsa - o'qituvchi shu vaqtda dars o'tolmaydi
+    unavailable: int = Field(0, sa_column_kwargs={"server_default": "0"}, description="Band kataklar niqobi")
     schedules: List["Schedule"] = Relationship(back_populates="teacher")  # O'qituvchining jadvali
 
 class TeacherInfo(BaseModel, table=True):
@@ -95,13 +111,26 @@ class LessonType(BaseModel, table=True):
 # Xona modeli
 class Room(BaseModel, table=True):
     __tablename__ = 'rooms'
+    __table_args__ = (CheckConstraint(UNAVAILABLE_CHECK, name="ck_rooms_unavailable"),)
     name: str = Field(..., description="Xona nomi")
     roomstype: str = Field(..., description="Xona turi")
+    unavailable: int = Field(0, sa_column_kwargs={"server_default": "0"}, description="Band kataklar niqobi")
     schedules: List["Schedule"] = Relationship(back_populates="room")  # Xonadagi jadval
 
 # Jadval modeli
 class Schedule(BaseModel, table=True):
     __tablename__ = 'schedules'
+    __table_args__ = (
+        # Guruh bir katakda faqat bitta darsda bo'ladi
+        Index("uq_schedules_group_slot", "group_id", "day", "time_slot", unique=True),
+        Index("ix_schedules_course_id", "course_id"),
+        # O'qituvchi/xona birgalikdagi darsda bir nechta guruhga xizmat qilishi mumkin,
+        # lekin bir katakda o'qituvchi ikki xonada (yoki xonada ikki o'qituvchi) bo'lolmaydi
+        ExcludeConstraint(("teacher_id", "="), ("day", "="), ("time_slot", "="), ("room_id", "<>"),
+                          name="ex_schedules_teacher_slot", using="gist"),
+        ExcludeConstraint(("room_id", "="), ("day", "="), ("time_slot", "="), ("teacher_id", "<>"),
+                          name="ex_schedules_room_slot", using="gist"),
+    )
     course_id: int = Field(foreign_key="courses.id", description="Kurs identifikatori")
     course: Course = Relationship(back_populates="schedules")
 
@@ -121,6 +150,21 @@ class Schedule(BaseModel, table=True):
     time_slot: int = Field(..., description="Dars vaqti (1, 2, 3, 4)")
 
 
+# O'chirilgan yozuvlar izi: `/api/changes` mijozlari o'chirishlarni ham ko'rishi uchun. Har bir jadvaldagi
+# `record_deletions` triggeri yozadi (migratsiya e4b9c2d7a1f3), ilova faqat o'qiydi va CHANGES_RETENTION_DAYS dan
+# eskilarini o'chiradi
+class DeletedRow(SQLModel, table=True):
+    __tablename__ = "deleted_rows"
+    __table_args__ = (Index("ix_deleted_rows_table_deleted_at", "table_name", "deleted_at"),
+                      Index("ix_deleted_rows_deleted_at", "deleted_at"))  # muddati o'tganlarni tozalash
+    id: Optional[int] = Field(default=None, sa_type=BigInteger, primary_key=True)
+    table_name: str = Field(..., description="Jadval nomi")
+    row_id: int = Field(..., description="O'chirilgan yozuv identifikatori")
+    deleted_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True), nullable=False,
+                                           sa_column_kwargs={"server_default": func.now()},
+                                           description="O'chirilgan vaqt")
+
+
 # O'qituvchi jadvali
 # Teacher.schedules: List[Schedule] = Relationship(back_populates="teacher")
 # Group.schedules: List[Schedule] = Relationship(back_populates="group")
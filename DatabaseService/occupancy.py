@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, List, Tuple
+from .models import Schedule
+
+TEACHER, ROOM, GROUP = "teacher", "room", "group"
+KINDS = (TEACHER, ROOM, GROUP)
+
+Row = Tuple[int, int, int, int, int, int]  # (course_id, day, time_slot, teacher_id, room_id, group_id)
+
+
+class OccupancyIndex:
+    """
+    Jarayon ichidagi bandlik indeksi.
+    Har bir (day, time_slot) uchun o'qituvchi, xona va guruhlar bo'yicha bittadan bitmap saqlanadi:
+    `id` raqamli bit yoqilgan bo'lsa - shu katakda band. Bitta o'qituvchi/xona bir nechta guruhga
+    birgalikda dars o'tishi mumkinligi uchun bitlar hisoblagich bilan boshqariladi.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._bitmaps: Dict[Tuple[int, int], Dict[str, int]] = {}
+        self._counts: Dict[Tuple[str, int, int, int], int] = {}
+        self._rows: Dict[int, Row] = {}
+
+    @staticmethod
+    def _row(schedule: Schedule) -> Row:
+        return (schedule.course_id, schedule.day, schedule.time_slot,
+                schedule.teacher_id, schedule.room_id, schedule.group_id)
+
+    def _mark(self, kind: str, day: int, time_slot: int, entity_id: int, delta: int) -> None:
+        key = (kind, day, time_slot, entity_id)
+        count = self._counts.get(key, 0) + delta
+        cell = self._bitmaps.setdefault((day, time_slot), {TEACHER: 0, ROOM: 0, GROUP: 0})
+        if count > 0:
+            self._counts[key] = count
+            cell[kind] |= 1 << entity_id
+        else:
+            self._counts.pop(key, None)
+            cell[kind] &= ~(1 << entity_id)
+
+    def _apply(self, row: Row, delta: int) -> None:
+        _, day, time_slot, teacher_id, room_id, group_id = row
+        self._mark(TEACHER, day, time_slot, teacher_id, delta)
+        self._mark(ROOM, day, time_slot, room_id, delta)
+        self._mark(GROUP, day, time_slot, group_id, delta)
+
+    def load(self, schedules: Iterable[Schedule]) -> None:
+        """Indeksni berilgan jadval yozuvlaridan qaytadan quradi."""
+        self._reset()
+        for schedule in schedules:
+            self.add(schedule)
+        self.ready = True
+
+    async def build(self, db) -> None:
+        """Indeksni ma'lumotlar bazasidagi barcha jadval yozuvlaridan quradi."""
+        with db.primary_reads():  # replika orqada qolgan bo'lsa, indeks eskirgan holatda qolib ketardi
+            self.load(await db.get(Schedule))
+
+    def add(self, schedule: Schedule) -> None:
+        """Yangi yoki o'zgargan jadval yozuvini indeksga yozadi."""
+        self.remove(schedule.id)
+        row = self._row(schedule)
+        self._rows[schedule.id] = row
+        self._apply(row, 1)
+
+    def remove(self, schedule_id: int) -> None:
+        """Jadval yozuvini indeksdan olib tashlaydi."""
+        row = self._rows.pop(schedule_id, None)
+        if row is not None:
+            self._apply(row, -1)
+
+    def discard_course(self, course_id: int) -> None:
+        """Kursga tegishli barcha yozuvlarni indeksdan olib tashlaydi."""
+        for schedule_id in [key for key, row in self._rows.items() if row[0] == course_id]:
+            self.remove(schedule_id)
+
+    def busy(self, kind: str, day: int, time_slot: int) -> int:
+        """Katakda band bo'lgan `kind` turidagi ob'ektlar bitmapi."""
+        cell = self._bitmaps.get((day, time_slot))
+        return cell[kind] if cell else 0
+
+    def matrix(self) -> Dict[Tuple[int, int], Dict[str, int]]:
+        """Barcha kataklar bitmaplari nusxasi: {(day, time_slot): {kind: bitmap}}."""
+        return {cell: dict(bitmaps) for cell, bitmaps in self._bitmaps.items()}
+
+    def is_busy(self, kind: str, day: int, time_slot: int, entity_id: int) -> bool:
+        return bool(self.busy(kind, day, time_slot) >> entity_id & 1)
+
+    def free(self, kind: str, day: int, time_slot: int, entity_ids: Iterable[int]) -> List[int]:
+        """Berilgan identifikatorlardan katakda bo'shlarini qaytaradi."""
+        busy = self.busy(kind, day, time_slot)
+        return [entity_id for entity_id in entity_ids if not busy >> entity_id & 1]
+
+    async def verify(self, db, repair: bool = False) -> Dict[str, object]:
+        """
+        Indeksni ma'lumotlar bazasi bilan solishtiradi.
+        :param repair: True bo'lsa, farq topilganda indeks bazadan qayta quriladi.
+        :return: Farqlar hisoboti.
+        """
+        with db.primary_reads():
+            actual = {schedule.id: self._row(schedule) for schedule in await db.get(Schedule)}
+        missing = sorted(key for key in actual if key not in self._rows)
+        stale = sorted(key for key in self._rows if key not in actual)
+        changed = sorted(key for key, row in actual.items() if key in self._rows and self._rows[key] != row)
+        consistent = not (missing or stale or changed)
+        if repair and not consistent:
+            self._reset()
+            for schedule_id, row in actual.items():
+                self._rows[schedule_id] = row
+                self._apply(row, 1)
+            self.ready = True
+        return {"consistent": consistent, "rows": len(actual), "missing": missing, "stale": stale,
+                "changed": changed, "repaired": repair and not consistent}
+
+
+occupancy_index = OccupancyIndex()
@@ -0,0 +1,164 @@
+from asyncio import Task, TimeoutError, ensure_future, shield, wait_for
+from logging import getLogger
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import REPLICA_CHECK_INTERVAL, REPLICA_CHECK_TIMEOUT, REPLICA_MAX_LAG_SECONDS, REPLICA_RETRY_SECONDS
+
+logger = getLogger("database.replicas")
+
+# Replika qancha orqada: WAL to'liq qo'llangan bo'lsa 0 (yozuv bo'lmasa ham `now() - replay_timestamp` o'sadi),
+# replika bo'lmagan server uchun ham 0
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+# serialization_failure: hot standbyda WAL qo'llanishi bilan to'qnashib bekor qilingan so'rov
+RETRY_SQLSTATES = {"40001"}
+
+
+def replica_name(url: str) -> str:
+    """Metrikalar va loglar uchun parolsiz nom: host:port/baza."""
+    parsed = make_url(url)
+    return f"{parsed.host}:{parsed.port or 5432}/{parsed.database}"
+
+
+def is_unavailable(error: BaseException) -> bool:
+    """Xatolik replikaning o'zi ishlamayotganini (ulanish uzilgan yoki ochilmaydi) bildiradimi."""
+    if isinstance(error, (OSError, TimeoutError)):
+        return True
+    return isinstance(error, (OperationalError, InterfaceError)) or \
+        (isinstance(error, DBAPIError) and error.connection_invalidated)
+
+
+class Replica:
+    """Bitta o'qish replikasi: dvigatel (birinchi murojaatda yaratiladi) va oxirgi tekshiruv natijasi."""
+    __slots__ = ("url", "name", "engine", "session_factory", "lag", "checked_at", "down_until", "error", "checking")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.name = replica_name(url)
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[sessionmaker] = None
+        self.lag: Optional[float] = None  # soniya; None - hali o'lchanmagan yoki ishlamayapti
+        self.checked_at = float("-inf")
+        self.down_until = 0.0
+        self.error: Optional[str] = None
+        self.checking: Optional[Task] = None
+
+    def session(self) -> AsyncSession:
+        return self.session_factory()
+
+    def status(self) -> Dict[str, Any]:
+        now = monotonic()
+        return {"name": self.name, "lag": self.lag, "down": self.down_until > now, "error": self.error,
+                "checked_ago": round(now - self.checked_at, 3) if self.checked_at > float("-inf") else None}
+
+
+class ReplicaSet:
+    """
+    O'qish replikalari. `choose()` navbat bilan sog' replikani qaytaradi: kechikishi `max_lag` dan oshgan
+    yoki ulanib bo'lmagan replika o'tkazib yuboriladi (ishlamayotgani `retry_after` soniyadan keyin qayta
+    sinaladi). Kechikish har `check_interval` soniyada so'rov yo'lida o'lchanadi; bir vaqtdagi so'rovlar
+    bitta tekshiruvni kutadi. Mos replika bo'lmasa None - o'qish primaryda bajariladi.
+    """
+
+    def __init__(self, urls: Sequence[str], engine_factory: Callable[[str], AsyncEngine],
+                 max_lag: float = REPLICA_MAX_LAG_SECONDS, check_interval: float = REPLICA_CHECK_INTERVAL,
+                 check_timeout: float = REPLICA_CHECK_TIMEOUT, retry_after: float = REPLICA_RETRY_SECONDS):
+        self.replicas: List[Replica] = [Replica(url) for url in urls]
+        self.engine_factory = engine_factory
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.retry_after = retry_after
+        self._next = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def _connect(self, replica: Replica) -> None:
+        if replica.engine is None:
+            replica.engine = self.engine_factory(replica.url)
+            replica.session_factory = sessionmaker(bind=replica.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def choose(self) -> Optional[Replica]:
+        """Navbatdagi sog' va yetarlicha yangi replika yoki None."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.down_until > monotonic():
+                continue
+            if monotonic() - replica.checked_at >= self.check_interval:
+                await self.check(replica)
+            if replica.lag is not None and replica.lag <= self.max_lag:
+                return replica
+        return None
+
+    async def check(self, replica: Replica) -> Optional[float]:
+        """Replika kechikishini o'lchaydi; parallel chaqiruvlar bitta tekshiruvni bo'lishadi."""
+        if replica.checking is None:
+            replica.checking = ensure_future(self._check(replica))
+        await shield(replica.checking)
+        return replica.lag
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            self._connect(replica)
+            replica.lag = float(await wait_for(self._measure(replica), self.check_timeout))
+            replica.error = None
+            if replica.lag > self.max_lag:
+                logger.warning("Replica %s is %.1fs behind, reading from primary", replica.name, replica.lag)
+        except Exception as e:
+            self.mark_down(replica, e)
+        finally:
+            replica.checked_at = monotonic()
+            replica.checking = None
+
+    @staticmethod
+    async def _measure(replica: Replica) -> float:
+        async with replica.engine.connect() as connection:
+            return await connection.scalar(LAG_QUERY) or 0
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        """Replikani `retry_after` soniyaga o'qishlardan chiqaradi."""
+        replica.lag = None
+        replica.error = str(error) or type(error).__name__
+        replica.down_until = monotonic() + self.retry_after
+        logger.warning("Replica %s is unavailable for %.0fs: %s", replica.name, self.retry_after, replica.error)
+
+    def should_fallback(self, replica: Replica, error: BaseException) -> bool:
+        """
+        Replikadagi o'qish xatosidan keyin so'rovni primaryda takrorlash kerakmi. Ulanish xatolarida replika
+        vaqtincha chiqariladi; WAL bilan to'qnashuvda faqat shu so'rov takrorlanadi.
+        """
+        if is_unavailable(error):
+            self.mark_down(replica, error)
+            return True
+        return getattr(getattr(error, "orig", None), "sqlstate", None) in RETRY_SQLSTATES
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [replica.status() for replica in self.replicas]
+
+    def pool_status(self) -> Dict[str, Dict[str, int]]:
+        """Har bir ochilgan replika havzasida band ulanishlar soni."""
+        return {replica.name: {"size": replica.engine.pool.size(), "checked_out": replica.engine.pool.checkedout()}
+                for replica in self.replicas if replica.engine is not None}
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.checking is not None:
+                replica.checking.cancel()
+            if replica.engine is not None:
+                await replica.engine.dispose()
+                replica.engine = replica.session_factory = None
+            replica.checked_at = float("-inf")
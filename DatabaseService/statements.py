@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from sqlalchemy import Integer, all_, and_, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import selectinload
+from sqlmodel import SQLModel, select
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Type
+from .config import STATEMENT_CACHE_SIZE
+
+# So'rov shakli: ((ustun, amal), ...) - qiymatlar kirmaydi
+Shape = Tuple[Tuple[str, str], ...]
+
+# `FILTER_OPERATORS` ning bog'langan parametrli ko'rinishi. Ro'yxatlar `= ANY(:p)` / `!= ALL(:p)` massiv
+# parametri bilan beriladi: `IN (:p_1, :p_2, ...)` ro'yxat uzunligi bilan SQL matnini o'zgartiradi va
+# asyncpg prepared statement keshiga tushmaydi
+BOUND_OPERATORS: Dict[str, Callable[[Any, str], Any]] = {
+    "eq": lambda column, name: column == bindparam(name, type_=column.type),
+    "is_null": lambda column, name: column.is_(None),
+    "in": lambda column, name: column == any_(bindparam(name, type_=ARRAY(column.type))),
+    "not_in": lambda column, name: column != all_(bindparam(name, type_=ARRAY(column.type))),
+    "gt": lambda column, name: column > bindparam(name, type_=column.type),
+    "gte": lambda column, name: column >= bindparam(name, type_=column.type),
+    "lt": lambda column, name: column < bindparam(name, type_=column.type),
+    "lte": lambda column, name: column <= bindparam(name, type_=column.type),
+    "ne": lambda column, name: column != bindparam(name, type_=column.type),
+    "between": lambda column, name: column.between(bindparam(name, type_=column.type),
+                                                   bindparam(f"{name}_hi", type_=column.type)),
+    "bits_clear": lambda column, name: column.op("&")(bindparam(name, type_=column.type)) == 0,
+}
+
+
+def filter_shape(filters: Optional[Dict[str, Any]]) -> Tuple[Shape, Dict[str, Any]]:
+    """
+    Filtr lug'atini so'rov shakli va parametr qiymatlariga ajratadi:
+    {"day": 1, "id": {"in": [1, 2]}} -> ((("day", "eq"), ("id", "in")), {"p0": 1, "p1": [1, 2]}).
+    Kalitlar saralanadi, shuning uchun bir xil shartlar tartibidan qat'i nazar bitta shaklga tushadi.
+    """
+    shape: List[Tuple[str, str]] = []
+    params: Dict[str, Any] = {}
+    for key, value in sorted((filters or {}).items()):
+        operations = sorted(value.items()) if isinstance(value, dict) else [("is_null" if value is None else "eq", value)]
+        for operation, operand in operations:
+            if operation not in BOUND_OPERATORS:
+                raise ValueError(f"Unsupported filter operation: {value}")
+            name = f"p{len(shape)}"
+            shape.append((key, operation))
+            if operation == "between":
+                params[name], params[f"{name}_hi"] = operand
+            elif operation in ("in", "not_in"):
+                params[name] = list(operand)
+            elif operation != "is_null":
+                params[name] = operand
+    return tuple(shape), params
+
+
+def build_statement(model: Type[SQLModel], shape: Shape, limit: bool = False,
+                    relationships: Sequence[str] = ()) -> Any:
+    """Shakldan `select(model)` so'rovini bog'langan parametrlar (`p0`, `p1`, ..., `limit`) bilan quradi."""
+    query = select(model)
+    for relation in relationships:
+        query = query.options(selectinload(getattr(model, relation)))
+    if shape:
+        query = query.where(and_(*(BOUND_OPERATORS[operation](getattr(model, key), f"p{index}")
+                                   for index, (key, operation) in enumerate(shape))))
+    if limit:
+        query = query.limit(bindparam("limit", type_=Integer))
+    return query
+
+
+class StatementCache:
+    """
+    So'rov shakli bo'yicha tayyor SELECT konstruksiyalari (LRU). Bir xil ob'ekt qayta ishlatilgani uchun
+    SQLAlchemy uning kesh kalitini qayta hisoblamaydi va kompilyatsiya keshidan oladi; SQL matni o'zgarmagani
+    uchun asyncpg ham ulanishdagi prepared statementni qayta ishlatadi. Chaqiruvlar orasida faqat
+    parametrlar o'zgaradi.
+    """
+    __slots__ = ("max_size", "_statements", "hits", "misses", "evictions")
+
+    def __init__(self, max_size: int = STATEMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._statements: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """`key` shakli uchun so'rov; yo'q bo'lsa `build()` bilan quriladi va saqlanadi."""
+        statement = self._statements.get(key)
+        if statement is not None:
+            self._statements.move_to_end(key)
+            self.hits += 1
+            return statement
+        self.misses += 1
+        statement = build()
+        if self.max_size > 0:
+            self._statements[key] = statement
+            if len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+        return statement
+
+    def select(self, model: Type[SQLModel], filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+               relationships: Sequence[str] = ()) -> Tuple[Any, Dict[str, Any]]:
+        """
+        `select(model)` so'rovi va uning parametrlari.
+        :return: (keshlangan so'rov, `session.execute` ga beriladigan parametrlar).
+        """
+        shape, params = filter_shape(filters)
+        if limit:
+            params["limit"] = limit
+        relationships = tuple(relationships)
+        statement = self.get((model, shape, bool(limit), relationships),
+                             lambda: build_statement(model, shape, bool(limit), relationships))
+        return statement, params
+
+    def clear(self) -> None:
+        self._statements.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"size": len(self._statements), "max_size": self.max_size, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+
+statement_cache = StatementCache()
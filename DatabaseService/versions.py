@@ -0,0 +1,33 @@
+from typing import Iterable
+from time import time
+from .cache import QueryCache, query_cache
+
+# Jadval jadvalidagi nomlar shu jadvallardan olinadi; ular o'zgarsa ETag ham o'zgaradi
+REFERENCE_MODELS = ("Group", "Course", "Subject", "Teacher", "Room")
+
+
+class TimetableVersions:
+    """
+    Kurs dars jadvali versiyalari. Har bir jadval yozuvi kurs versiyasini oshiradi,
+    ETag esa kurs versiyasi va ma'lumotnoma jadvallari avlodlaridan hosil qilinadi.
+    """
+
+    def __init__(self, cache: QueryCache):
+        self.cache = cache
+        # Xotiradagi hisoblagichlar qayta ishga tushganda nolga qaytadi - eski ETaglar mos kelmasligi uchun
+        self.epoch = format(int(time() * 1000), "x") if not cache.shared else "0"
+
+    async def bump(self, course_ids: Iterable[int]) -> None:
+        """Berilgan kurslar jadvali versiyasini oshiradi."""
+        for course_id in set(course_ids):
+            await self.cache.bump(f"timetable:{course_id}")
+
+    async def etag(self, course_id: int) -> str:
+        """Kurs jadvalining joriy (kuchsiz) ETagi."""
+        parts = [await self.cache.generation(f"timetable:{course_id}")]
+        for name in REFERENCE_MODELS:
+            parts.append(await self.cache.generation(name))
+        return f'W/"{course_id}-{self.epoch}-{"-".join(map(str, parts))}"'
+
+
+timetable_versions = TimetableVersions(query_cache)
@@ -0,0 +1,6 @@
+from .events import ChangeEvent, CREATED, UPDATED, DELETED, RESET, INVALIDATE
+from .bus import Subscription, ChangeBus, PostgresChangeBus, build_bus, change_bus
+from .config import FEED_BACKEND, FEED_HEARTBEAT
+
+__all__ = ["ChangeEvent", "CREATED", "UPDATED", "DELETED", "RESET", "INVALIDATE", "Subscription", "ChangeBus", "PostgresChangeBus",
+           "build_bus", "change_bus", "FEED_BACKEND", "FEED_HEARTBEAT"]
@@ -0,0 +1,261 @@
+from asyncio import Lock, Queue, QueueEmpty, QueueFull, Task, sleep, wait_for, get_running_loop
+from asyncio import TimeoutError as WaitTimeout
+from collections import deque
+from contextlib import contextmanager
+from json import dumps, loads
+from secrets import token_hex
+from typing import Awaitable, Callable, Deque, Iterator, List, Optional, Sequence, Set
+from LoggerService import LoggerService
+from MetricsService import REGISTRY
+from .config import FEED_BACKEND, FEED_CHANNEL, FEED_QUEUE_SIZE, FEED_HISTORY
+from .events import ChangeEvent, INVALIDATE
+
+# NOTIFY yuklamasi 8000 baytdan oshmasligi kerak
+MAX_NOTIFY_PAYLOAD = 7900
+
+FEED_EVENTS = REGISTRY.counter("feed_events_total", "O'zgarishlar shinasi yetkazgan hodisalar", ("kind",))
+FEED_OVERFLOWS = REGISTRY.counter("feed_subscriber_overflows_total",
+                                  "Navbati to'lib, `reset` olgan sekin obunachilar soni")
+
+RemoteHandler = Callable[[ChangeEvent], Awaitable[None]]
+
+
+class Subscription:
+    """
+    Bitta obunachi (SSE ulanishi) navbati. Noshir hech qachon kutmaydi: navbat to'lsa, undagi hodisalar
+    tashlanadi va o'rniga bitta `reset` qo'yiladi - sekin mijoz jadvalni qayta yuklaydi.
+    """
+
+    def __init__(self, bus: "ChangeBus", course_id: Optional[int], size: int):
+        self.bus = bus
+        self.course_id = course_id
+        self.queue: "Queue[ChangeEvent]" = Queue(size)
+        self.overflows = 0
+        self.closed = False  # worker to'xtamoqda: oqim oxirgi `reset` dan keyin yopiladi
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return self.course_id is None or event.course_id is None or event.course_id == self.course_id
+
+    def offer(self, event: ChangeEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except QueueFull:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except QueueEmpty:
+                    break
+            reset = ChangeEvent.reset(self.course_id, reason="overflow")
+            reset.seq = event.seq
+            self.queue.put_nowait(reset)
+            self.overflows += 1
+            FEED_OVERFLOWS.inc()
+
+    async def get(self, timeout: float) -> Optional[ChangeEvent]:
+        """Keyingi hodisa; `timeout` soniya ichida kelmasa None."""
+        try:
+            return await wait_for(self.queue.get(), timeout)
+        except WaitTimeout:
+            return None
+
+
+class ChangeBus:
+    """
+    Jarayon ichidagi o'zgarishlar shinasi: e'lon qilingan hodisalar shu jarayondagi obunachilarga tarqatiladi.
+    Har bir qabul qilingan hodisa tartib raqami (`seq`) oladi va oxirgi `history` tasi qayta ulanish uchun saqlanadi.
+    """
+
+    def __init__(self, queue_size: int = FEED_QUEUE_SIZE, history: int = FEED_HISTORY):
+        self.origin = token_hex(4)  # shina (worker) identifikatori, SSE `id` larining prefiksi
+        self.queue_size = queue_size
+        self.seq = 0
+        self.history: Deque[ChangeEvent] = deque(maxlen=history)
+        self.subscriptions: Set[Subscription] = set()
+        self.remote_handlers: List[RemoteHandler] = []
+        self.tasks: Set[Task] = set()  # fon vazifalari yig'ib olinmasligi uchun havolalar
+
+    async def start(self) -> None:
+        """Tashqi ulanishlarni ochadi (jarayon ichidagi shinada hech narsa qilmaydi)."""
+
+    async def stop(self) -> None:
+        """Tashqi ulanishlarni yopadi."""
+
+    async def reconnect(self) -> None:
+        """Tashqi ulanishni fonda qayta tiklaydi."""
+
+    async def publish(self, events: Sequence[ChangeEvent]) -> None:
+        """Hodisalarni e'lon qiladi. Commitdan keyin chaqirilishi kerak."""
+        for event in events:
+            event.source = event.source or self.origin
+        self.deliver(events)
+
+    def deliver(self, events: Sequence[ChangeEvent]) -> None:
+        """Qabul qilingan hodisalarni tartib raqami bilan obunachilar navbatlariga qo'yadi."""
+        for event in events:
+            if event.kind == INVALIDATE:
+                continue  # faqat boshqa workerlarning ishlov beruvchilari uchun
+            self.seq += 1
+            event.seq = self.seq
+            self.history.append(event)
+            FEED_EVENTS.inc(kind=event.kind)
+            for subscription in self.subscriptions:
+                if subscription.wants(event):
+                    subscription.offer(event)
+        remote = [event for event in events if event.source != self.origin]
+        if remote and self.remote_handlers:
+            self.spawn(self._handle_remote(remote))
+
+    def spawn(self, coroutine: Awaitable[None]) -> None:
+        """Fon vazifasini ishga tushiradi va tugaguncha havolasini saqlaydi."""
+        task = get_running_loop().create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def on_remote(self, handler: RemoteHandler) -> None:
+        """
+        Boshqa workerlar e'lon qilgan (yoki ulanish uzilganda yo'qolgan) hodisalar uchun ishlov beruvchi,
+        masalan, jarayon ichidagi bandlik indeksini yangilash uchun.
+        """
+        self.remote_handlers.append(handler)
+
+    async def _handle_remote(self, events: Sequence[ChangeEvent]) -> None:
+        for event in events:
+            for handler in self.remote_handlers:
+                try:
+                    await handler(event)
+                except Exception as e:
+                    LoggerService.log_exception(e, "Remote change handler failed")
+
+    @contextmanager
+    def subscribe(self, course_id: Optional[int] = None) -> Iterator[Subscription]:
+        """Obuna: blok tugaguncha hodisalar navbatga tushadi. `course_id` berilsa, faqat shu kurs va `reset`."""
+        subscription = Subscription(self, course_id, self.queue_size)
+        self.subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+
+    def drain(self) -> None:
+        """
+        Worker to'xtashidan oldin barcha obunachilarga `reset` yuborib, oqimlarini yopadi:
+        brauzer boshqa workerga qayta ulanadi va jadvalni qayta yuklaydi.
+        """
+        for subscription in self.subscriptions:
+            subscription.closed = True
+            subscription.offer(ChangeEvent.reset(subscription.course_id, reason="shutdown"))
+
+    def event_id(self, event: ChangeEvent) -> str:
+        return f"{self.origin}-{event.seq}"
+
+    def replay(self, last_event_id: str, course_id: Optional[int] = None) -> Optional[List[ChangeEvent]]:
+        """
+        `last_event_id` dan keyingi hodisalar. Identifikator boshqa shinaga (qayta ishga tushgan yoki boshqa
+        worker) tegishli bo'lsa yoki tarixdan chiqib ketgan bo'lsa None - mijoz jadvalni qayta yuklashi kerak.
+        """
+        origin, _, seq = last_event_id.rpartition("-")
+        if origin != self.origin or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self.seq or (self.history and self.history[0].seq > seq + 1):
+            return None
+        return [event for event in self.history
+                if event.seq > seq and (course_id is None or event.course_id in (None, course_id))]
+
+
+class PostgresChangeBus(ChangeBus):
+    """
+    Postgres LISTEN/NOTIFY orqali workerlar o'rtasidagi shina. Hodisalar NOTIFY bilan yuboriladi va
+    har bir worker (jumladan yuboruvchi ham) ularni LISTEN ulanishidan bir xil tartibda oladi.
+    Ulanish uzilsa, obunachilar `reset` oladi va ulanish qayta tiklanadi.
+    """
+
+    def __init__(self, dsn: str, channel: str = FEED_CHANNEL, **kwargs):
+        super().__init__(**kwargs)
+        self.dsn = dsn
+        self.channel = channel
+        self.connection = None
+        self.lock: Optional[Lock] = None  # asyncpg ulanishida bir vaqtda bitta so'rov (loop ichida yaratiladi)
+        self.stopping = False
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self.stopping = False
+        self.lock = self.lock or Lock()
+        self.connection = await asyncpg.connect(self.dsn)
+        await self.connection.add_listener(self.channel, self._on_notify)
+        self.connection.add_termination_listener(self._on_terminate)
+
+    async def stop(self) -> None:
+        self.stopping = True
+        if self.connection is not None:
+            connection, self.connection = self.connection, None
+            await connection.close()
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.deliver([ChangeEvent.from_dict(item) for item in loads(payload)])
+
+    def _on_terminate(self, connection) -> None:
+        if self.stopping:
+            return
+        self.connection = None
+        # Uzilish paytidagi hodisalar yo'qolgan bo'lishi mumkin (manbasi noma'lum - hamma qayta yuklaydi)
+        self.deliver([ChangeEvent.reset(reason="reconnect")])
+        self.spawn(self.reconnect())
+
+    async def reconnect(self, delay: float = 1.0, max_delay: float = 30.0) -> None:
+        """Ulanish tiklanguncha (yoki `stop()` gacha) eksponensial kutish bilan qayta urinadi."""
+        while not self.stopping and self.connection is None:
+            await sleep(delay)
+            try:
+                await self.start()
+            except Exception as e:
+                LoggerService.log_exception(e, "Change feed reconnect failed")
+                delay = min(delay * 2, max_delay)
+
+    @staticmethod
+    def payloads(events: Sequence[ChangeEvent]) -> Iterator[str]:
+        """Hodisalarni NOTIFY chegarasiga sig'adigan JSON massivlariga bo'ladi."""
+        batch: List[str] = []
+        length = 2
+        for event in events:
+            item = dumps(event.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+            if batch and length + len(item.encode("utf-8")) + 1 > MAX_NOTIFY_PAYLOAD:
+                yield "[" + ",".join(batch) + "]"
+                batch, length = [], 2
+            batch.append(item)
+            length += len(item.encode("utf-8")) + 1
+        if batch:
+            yield "[" + ",".join(batch) + "]"
+
+    async def publish(self, events: Sequence[ChangeEvent]) -> None:
+        for event in events:
+            event.source = event.source or self.origin
+        if self.connection is None:
+            # Ulanish tiklanguncha hech bo'lmasa shu workerning obunachilari hodisani oladi
+            self.deliver(events)
+            return
+        try:
+            async with self.lock:
+                for payload in self.payloads(events):
+                    await self.connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception as e:
+            LoggerService.log_exception(e, "Change feed NOTIFY failed")
+            self.deliver(events)
+
+
+def build_bus(name: str = FEED_BACKEND, dsn: Optional[str] = None) -> ChangeBus:
+    """Sozlamaga ko'ra o'zgarishlar shinasini yaratadi (ulanish `start()` da ochiladi)."""
+    if name == "postgres":
+        if not dsn:
+            from DatabaseService import DATABASE_URL
+
+            dsn = DATABASE_URL
+        return PostgresChangeBus(dsn.replace("+asyncpg", ""))
+    return ChangeBus()
+
+
+change_bus = build_bus()
+REGISTRY.gauge("feed_subscribers", "O'zgarishlar oqimiga ulangan obunachilar",
+               callback=lambda: {(): len(change_bus.subscriptions)})
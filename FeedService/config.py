@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from os import environ
+
+load_dotenv()
+
+# "memory" - bitta jarayon ichida, "postgres" - LISTEN/NOTIFY orqali barcha workerlar o'rtasida
+FEED_BACKEND = environ.get("FEED_BACKEND", "memory")
+FEED_CHANNEL = environ.get("FEED_CHANNEL", "timetable_changes")
+
+# Har bir obunachi navbati hajmi: to'lsa, obunachi `reset` hodisasini oladi
+FEED_QUEUE_SIZE = int(environ.get("FEED_QUEUE_SIZE", 256))
+# `Last-Event-ID` bo'yicha qayta ulanganda takrorlash uchun saqlanadigan oxirgi hodisalar soni
+FEED_HISTORY = int(environ.get("FEED_HISTORY", 1024))
+# Hodisa bo'lmaganda ulanishni ushlab turuvchi izoh satri oralig'i (soniya)
+FEED_HEARTBEAT = float(environ.get("FEED_HEARTBEAT", 15))
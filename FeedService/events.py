@@ -0,0 +1,45 @@
+from typing import Any, Dict, Iterable, Optional
+
+CREATED, UPDATED, DELETED, RESET = "created", "updated", "deleted", "reset"
+# Workerlar o'rtasidagi xizmat hodisasi: SSE obunachilariga yetkazilmaydi
+INVALIDATE = "invalidate"
+KINDS = (CREATED, UPDATED, DELETED, RESET, INVALIDATE)
+
+
+class ChangeEvent:
+    """
+    Dars jadvalidagi bitta o'zgarish. `schedule` - yozuv ustunlari (kamida id, course_id, group_id, day,
+    time_slot); `reset` hodisasida None: mijoz kurs jadvalini (course_id None bo'lsa - hammasini) qayta yuklaydi.
+    `invalidate` hodisasida {"models": [...]}: boshqa workerlar shu modellar keshini bekor qiladi.
+    """
+    __slots__ = ("kind", "course_id", "schedule", "source", "reason", "seq")
+
+    def __init__(self, kind: str, course_id: Optional[int], schedule: Optional[Dict[str, Any]] = None,
+                 source: Optional[str] = None, reason: Optional[str] = None):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown change kind: {kind}")
+        self.kind = kind
+        self.course_id = course_id
+        self.schedule = schedule
+        self.source = source  # hodisani e'lon qilgan shina (worker) identifikatori
+        self.reason = reason
+        self.seq = 0  # qabul qilgan shina ichidagi tartib raqami
+
+    @classmethod
+    def reset(cls, course_id: Optional[int] = None, reason: Optional[str] = None) -> "ChangeEvent":
+        return cls(RESET, course_id, reason=reason)
+
+    @classmethod
+    def invalidate(cls, models: Iterable[str]) -> "ChangeEvent":
+        return cls(INVALIDATE, None, {"models": list(models)})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "course_id": self.course_id, "schedule": self.schedule,
+                "source": self.source, "reason": self.reason}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChangeEvent":
+        return cls(data["kind"], data.get("course_id"), data.get("schedule"), data.get("source"), data.get("reason"))
+
+    def __repr__(self) -> str:
+        return f"<ChangeEvent(kind={self.kind}, course_id={self.course_id}, seq={self.seq})>"
@@ -1,3 +1,3 @@
-from .core import LoggerService
+from .core import LoggerService, SamplingFilter, LazyQueueHandler, parse_sample_rates, QUERY, WRITE
 
-__all__ = ["LoggerService"]
\ No newline at end of file
+__all__ = ["LoggerService", "SamplingFilter", "LazyQueueHandler", "parse_sample_rates", "QUERY", "WRITE"]
@@ -1,7 +1,57 @@
-from logging import INFO, getLogger, Formatter, StreamHandler
-from logging.handlers import RotatingFileHandler
+from logging import INFO, WARNING, getLogger, Filter, Formatter, LogRecord, StreamHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 # from DatabaseService import ENV
+from atexit import register
+from itertools import count
+from os import environ
 from os.path import join
+from queue import SimpleQueue
+from typing import Dict, Optional
+
+# Tez-tez yoziladigan xabarlar toifalari: logger.info("...", extra=QUERY)
+QUERY = {"category": "query"}
+WRITE = {"category": "write"}
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """`"query=0.01,write=0.5"` satrini {toifa: ulush} lug'atiga o'giradi."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        category, _, rate = item.partition("=")
+        rates[category.strip()] = float(rate)
+    return rates
+
+
+class SamplingFilter(Filter):
+    """
+    Toifali (`extra={"category": ...}`) INFO/DEBUG xabarlarining faqat `rate` ulushini o'tkazadi:
+    har N-chi xabar yoziladi (N = 1 / rate), tasodifiy son hosil qilinmaydi.
+    WARNING va undan yuqori darajalar hamda toifasiz xabarlar doim o'tadi.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {category: max(1, round(1 / rate)) if rate > 0 else 0 for category, rate in rates.items()}
+        self.counters = {category: count() for category in self.every}
+
+    def filter(self, record: LogRecord) -> bool:
+        if record.levelno >= WARNING:
+            return True
+        category = getattr(record, "category", None)
+        every = self.every.get(category)
+        if every is None:
+            return True
+        return every > 0 and next(self.counters[category]) % every == 0
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Yozuvni navbatga formatlamasdan qo'yadi: `%` formatlash va fayl yozish fon oqimida bajariladi.
+    Shuning uchun xabar argumentlari o'zgarmas oddiy qiymatlar (son, satr) bo'lishi kerak.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
 
 
 class LoggerService:
@@ -15,13 +65,22 @@ class LoggerService:
         return cls._instance
 
     def __init__(self, log_dir="LoggerService", log_file="app.log", log_level=INFO, max_bytes=1000000, backup_count=5,
-                 log_format=None):
-        """Logger xizmati uchun sozlamalar."""
+                 log_format=None, queued: Optional[bool] = None, sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Logger xizmati uchun sozlamalar.
+        :param queued: True bo'lsa, handlerlar QueueListener fon oqimida ishlaydi (standart: LOG_QUEUED=1).
+        :param sample_rates: Toifalar bo'yicha yoziladigan ulush (standart: LOG_SAMPLE_RATES, masalan "query=0.01").
+        """
         if hasattr(self, 'logger'):
             return  # Logni faqat bir marta sozlash uchun
+        if queued is None:
+            queued = environ.get("LOG_QUEUED", "1") == "1"
+        if sample_rates is None:
+            sample_rates = parse_sample_rates(environ.get("LOG_SAMPLE_RATES", ""))
         log_file_path = join(log_dir, log_file)
         self.logger = getLogger("TelegramBotLogger")
         self.logger.setLevel(log_level)
+        self.listener: Optional[QueueListener] = None
 
         # Log formatini sozlash
         log_format = log_format or "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -31,17 +90,31 @@ class LoggerService:
         handler = RotatingFileHandler(log_file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
         handler.setLevel(log_level)
         handler.setFormatter(formatter)
-
-        # Yangi handlerlar faqat bir marta qo‘shilishi uchun tekshiruv
-        if not self.logger.handlers:
-            self.logger.addHandler(handler)
+        handlers = [handler]
+        self.handlers = handlers  # navbat rejimida ham fayl/konsol handlerlari
 
         # Konsolga chiqish loglari (faqat ishlab chiqish muhiti uchun)
         if 'ENV' == "development":  # Muhitni o‘zgartirish uchun `ENV` o'zgaruvchisini qo'llash
             console_handler = StreamHandler()
             console_handler.setLevel(log_level)
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        # Yangi handlerlar faqat bir marta qo‘shilishi uchun tekshiruv
+        if not self.logger.handlers:
+            if queued:
+                # Event loop faqat yozuvni navbatga qo'yadi, fayl I/O fon oqimida
+                self.listener = QueueListener(SimpleQueue(), *handlers, respect_handler_level=True)
+                self.logger.addHandler(LazyQueueHandler(self.listener.queue))
+                self.listener.start()
+                register(self.stop)
+            else:
+                for item in handlers:
+                    self.logger.addHandler(item)
+        else:
+            self.handlers = list(self.logger.handlers)
+        if sample_rates:
+            self.logger.addFilter(SamplingFilter(sample_rates))
 
     def get_logger(self):
         """Logger ob'ektini qaytaradi."""
@@ -50,11 +123,17 @@ class LoggerService:
     def set_log_level(self, level):
         """Log darajasini sozlash funksiyasi."""
         self.logger.setLevel(level)
-        for handler in self.logger.handlers:
+        for handler in self.handlers:
             handler.setLevel(level)
 
+    def stop(self):
+        """Navbatdagi yozuvlarni faylga yozib, fon oqimini to'xtatadi."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
     @staticmethod
     def log_exception(exc: Exception, message: str = "Exception occurred"):
         """Istisno hodisalarini logga yozish uchun yordamchi funksiyasi."""
         logger = LoggerService().get_logger()
-        logger.error(f"{message}: {exc}", exc_info=True)
+        logger.error("%s: %s", message, exc, exc_info=True)
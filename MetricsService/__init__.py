@@ -0,0 +1,5 @@
+from .core import Metric, Counter, Gauge, Histogram, Registry, REGISTRY, CONTENT_TYPE, DEFAULT_BUCKETS
+from .middleware import MetricsMiddleware, HTTP_LATENCY
+
+__all__ = ["Metric", "Counter", "Gauge", "Histogram", "Registry", "REGISTRY", "CONTENT_TYPE", "DEFAULT_BUCKETS",
+           "MetricsMiddleware", "HTTP_LATENCY"]
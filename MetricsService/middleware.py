@@ -0,0 +1,36 @@
+from time import perf_counter
+from .core import REGISTRY
+
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP so'rovlarini bajarish vaqti (endpoint shabloni bo'yicha)",
+    ("method", "route", "status"))
+
+
+class MetricsMiddleware:
+    """
+    Har bir HTTP so'rov vaqtini `HTTP_LATENCY` ga yozadi (ASGI middleware, javob tanasi oxirigacha).
+    Yorliq sifatida yo'lning o'zi emas, endpoint shabloni (`/api/schedule/{schedule_id}`) olinadi.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_LATENCY.observe(perf_counter() - started, method=scope["method"],
+                                 route=getattr(route, "path", "unmatched"), status=str(status))
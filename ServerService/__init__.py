@@ -0,0 +1,6 @@
+from .config import WEB_APP, WEB_HOST, WEB_PORT, WEB_CONCURRENCY, WEB_GRACEFUL_TIMEOUT, WEB_READY_TIMEOUT, \
+    WEB_PID_FILE
+from .supervisor import Supervisor, Worker, default_workers, on_drain
+
+__all__ = ["WEB_APP", "WEB_HOST", "WEB_PORT", "WEB_CONCURRENCY", "WEB_GRACEFUL_TIMEOUT", "WEB_READY_TIMEOUT",
+           "WEB_PID_FILE", "Supervisor", "Worker", "default_workers", "on_drain"]
@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+from os import environ
+
+load_dotenv()
+
+# Production rejimi: bitta master jarayon va `WEB_CONCURRENCY` ta uvicorn worker (bo'sh - CPU soni)
+WEB_APP = environ.get("WEB_APP", "main:app")
+WEB_HOST = environ.get("WEB_HOST", "0.0.0.0")
+WEB_PORT = int(environ.get("WEB_PORT", 8001))
+WEB_CONCURRENCY = environ.get("WEB_CONCURRENCY")
+# Workerga to'xtash signalidan keyin ochiq so'rovlarni (va SSE oqimlarini) tugatish uchun beriladigan vaqt
+WEB_GRACEFUL_TIMEOUT = float(environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+# Yangi worker tayyor bo'lishini (lifespan startup) kutish chegarasi
+WEB_READY_TIMEOUT = float(environ.get("WEB_READY_TIMEOUT", 60))
+WEB_PID_FILE = environ.get("WEB_PID_FILE", "")
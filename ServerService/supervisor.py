@@ -0,0 +1,222 @@
+from logging import getLogger
+from multiprocessing import get_context
+from os import cpu_count, environ, getpid
+from signal import SIGHUP, SIGINT, SIGTERM, SIG_IGN, signal
+from socket import socket
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, List, Optional
+from .config import WEB_GRACEFUL_TIMEOUT, WEB_READY_TIMEOUT
+
+logger = getLogger("supervisor")
+
+# Workerlar `spawn` bilan yaratiladi: qayta ishga tushirilgan worker ilova kodini yangidan import qiladi
+CONTEXT = get_context("spawn")
+# Ketma-ket tez yiqilgan worker qayta yaratilishidan oldingi kutish (soniya)
+RESPAWN_BACKOFF = (0.5, 1, 2, 5, 10)
+
+# Worker to'xtash signalini olganda (ochiq so'rovlar kutilishidan oldin) chaqiriladigan funksiyalar
+_drain_callbacks: List[Callable[[], None]] = []
+
+
+def on_drain(callback: Callable[[], None]) -> None:
+    """
+    Worker to'xtay boshlaganda chaqiriladigan funksiyani ro'yxatga oladi: masalan, uzoq davom etadigan
+    SSE oqimlarini yopish - aks holda worker `timeout_graceful_shutdown` tugaguncha kutadi.
+    """
+    _drain_callbacks.append(callback)
+
+
+def default_workers() -> int:
+    """Jarayonga ruxsat berilgan CPU lar soni (konteyner cheklovlari `sched_getaffinity` da ko'rinadi)."""
+    try:
+        from os import sched_getaffinity
+
+        return max(1, len(sched_getaffinity(0)))
+    except ImportError:
+        return max(1, cpu_count() or 1)
+
+
+def serve_worker(app: str, options: Dict[str, Any], sock: socket, ready) -> None:
+    """Worker jarayoni: umumiy soketda uvicorn serverini ishga tushiradi va tayyor bo'lganda `ready` ni yoqadi."""
+    from uvicorn import Config, Server
+
+    signal(SIGHUP, SIG_IGN)  # qayta yuklash signali faqat masterga tegishli
+
+    class ReadyServer(Server):
+        async def startup(self, sockets=None) -> None:
+            await super().startup(sockets=sockets)
+            if not self.should_exit:  # lifespan startup muvaffaqiyatli
+                ready.set()
+
+        def handle_exit(self, sig, frame) -> None:
+            draining = not self.should_exit
+            super().handle_exit(sig, frame)
+            if draining:
+                for callback in _drain_callbacks:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.error("Drain callback failed: %s", e)
+
+    ReadyServer(Config(app, **options)).run(sockets=[sock])
+
+
+class Worker:
+    """Bitta uvicorn worker jarayoni."""
+    __slots__ = ("process", "ready", "started")
+
+    def __init__(self, process, ready):
+        self.process = process
+        self.ready = ready
+        self.started = monotonic()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Worker tayyor bo'lguncha kutadi; jarayon yiqilsa yoki vaqt tugasa False."""
+        deadline = monotonic() + timeout
+        while monotonic() < deadline:
+            if self.ready.wait(0.2):
+                return True
+            if not self.process.is_alive():
+                return False
+        return False
+
+    def stop(self, timeout: float) -> None:
+        """SIGTERM: uvicorn yangi ulanishlarni qabul qilmaydi, ochiq so'rovlarni `timeout` gacha tugatadi."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout + 5)
+        if self.process.is_alive():
+            logger.warning("Worker %s did not stop in %.0fs, killing", self.pid, timeout + 5)
+            self.process.kill()
+            self.process.join()
+
+
+class Supervisor:
+    """
+    Production rejimi: master jarayon soketni bir marta ochadi va `workers` ta uvicorn workerini yuritadi.
+
+    - Har bir worker ma'lumotlar bazasi havzasini `WEB_CONCURRENCY` bo'yicha byudjetdan oladi
+      (`DatabaseService.pool_budget`), shuning uchun workerlar soni Postgres `max_connections` ga sig'adi.
+    - SIGHUP - navbatma-navbat qayta ishga tushirish: yangi worker tayyor bo'lgach eskisi ochiq so'rovlarni
+      tugatib to'xtaydi; yangi worker ko'tarilmasa jarayon to'xtatiladi va eski workerlar ishlashda davom etadi.
+    - SIGTERM/SIGINT - barcha workerlar ochiq so'rovlarni tugatib to'xtaydi.
+    - Kutilmaganda yiqilgan worker qayta yaratiladi.
+    """
+
+    def __init__(self, app: str, host: str, port: int, workers: int, graceful_timeout: float = WEB_GRACEFUL_TIMEOUT,
+                 ready_timeout: float = WEB_READY_TIMEOUT, options: Optional[Dict[str, Any]] = None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.count = workers
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.options = {"proxy_headers": True, **(options or {}),
+                        "timeout_graceful_shutdown": int(graceful_timeout)}
+        self.workers: List[Worker] = []
+        self.sock: Optional[socket] = None
+        self.should_exit = False
+        self.reload_requested = False
+        self.failures = 0
+
+    def bind(self) -> socket:
+        from uvicorn import Config
+
+        return Config(self.app, host=self.host, port=self.port).bind_socket()
+
+    def prepare_environment(self) -> None:
+        """
+        Workerlar meros qiladigan sozlamalar: havza byudjeti uchun workerlar soni va umumiy o'zgarishlar shinasi.
+        CACHE_BACKEND=memory bo'lsa, keshlar shu shina orqali bekor qilinadi (`api.feed.publish_invalidation`).
+        """
+        environ["WEB_CONCURRENCY"] = str(self.count)
+        if self.count > 1 and environ.setdefault("FEED_BACKEND", "postgres") != "postgres":
+            # Jarayon ichidagi shina bilan workerlarning bandlik indekslari, keshlari va SSE oqimlari bir-birini
+            # ko'rmaydi: boshqa worker eskirgan ma'lumotnoma va ETag qaytaradi
+            logger.warning("FEED_BACKEND=%s with %d workers: changes and cache invalidations are not shared "
+                           "between workers", environ["FEED_BACKEND"], self.count)
+
+    def spawn(self) -> Worker:
+        ready = CONTEXT.Event()
+        process = CONTEXT.Process(target=serve_worker, args=(self.app, self.options, self.sock, ready),
+                                  name="uvicorn-worker")
+        process.start()
+        worker = Worker(process, ready)
+        logger.info("Started worker %s", worker.pid)
+        return worker
+
+    def handle_signal(self, signum, frame) -> None:
+        if signum == SIGHUP:
+            self.reload_requested = True
+        else:
+            self.should_exit = True
+
+    def run(self) -> None:
+        """Bloklovchi asosiy sikl."""
+        self.prepare_environment()
+        self.sock = self.bind()
+        for signum in (SIGHUP, SIGINT, SIGTERM):
+            signal(signum, self.handle_signal)
+        logger.info("Supervisor %s serving %s on http://%s:%d with %d workers", getpid(), self.app, self.host,
+                    self.port, self.count)
+        self.workers = [self.spawn() for _ in range(self.count)]
+        try:
+            while not self.should_exit:
+                if self.reload_requested:
+                    self.reload_requested = False
+                    self.rolling_restart()
+                self.reap()
+                sleep(0.5)
+        finally:
+            self.shutdown()
+
+    def reap(self) -> None:
+        """Yiqilgan workerlarni (kutish bilan) qayta yaratadi."""
+        for index, worker in enumerate(self.workers):
+            if worker.is_alive() or self.should_exit:
+                continue
+            # Ishga tushishda yiqilish takrorlansa - kutish oshadi
+            self.failures = self.failures + 1 if monotonic() - worker.started < self.ready_timeout else 0
+            delay = RESPAWN_BACKOFF[min(self.failures, len(RESPAWN_BACKOFF) - 1)]
+            logger.error("Worker %s exited with code %s, restarting in %.1fs", worker.pid, worker.process.exitcode,
+                         delay)
+            sleep(delay)
+            self.workers[index] = self.spawn()
+
+    def rolling_restart(self) -> bool:
+        """
+        Workerlarni bittadan almashtiradi: bir vaqtda ko'pi bilan `workers + 1` jarayon ishlaydi
+        (havza byudjeti shu qo'shimcha worker uchun joy qoldiradi).
+        :return: Hammasi almashtirilgan bo'lsa True.
+        """
+        logger.info("Rolling restart of %d workers", len(self.workers))
+        for index in range(len(self.workers)):
+            if self.should_exit:
+                return False
+            replacement = self.spawn()
+            if not replacement.wait_ready(self.ready_timeout):
+                logger.error("New worker %s failed to become ready, keeping the running workers", replacement.pid)
+                replacement.stop(0)
+                return False
+            old, self.workers[index] = self.workers[index], replacement
+            old.stop(self.graceful_timeout)
+            logger.info("Replaced worker %s with %s", old.pid, replacement.pid)
+        logger.info("Rolling restart complete")
+        return True
+
+    def shutdown(self) -> None:
+        logger.info("Stopping %d workers", len(self.workers))
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.process.terminate()
+        for worker in self.workers:
+            worker.stop(self.graceful_timeout)
+        if self.sock is not None:
+            self.sock.close()
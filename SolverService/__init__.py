@@ -0,0 +1,10 @@
+from .bitset import DAYS, SLOTS, CELLS, FULL_MASK, cell_index, cell_of, cell_bit, iter_bits, popcount
+from .core import Lesson, Placement, SolveResult, TimetableSolver
+from .repair import Booking, Move, RepairResult, TimetableRepair
+from .loader import subject_candidates, build_lessons, occupancy_from_schedules, load_course_problem, \
+    load_repair_problem
+
+__all__ = ["DAYS", "SLOTS", "CELLS", "FULL_MASK", "cell_index", "cell_of", "cell_bit", "iter_bits", "popcount",
+           "Lesson", "Placement", "SolveResult", "TimetableSolver", "Booking", "Move", "RepairResult",
+           "TimetableRepair", "subject_candidates", "build_lessons", "occupancy_from_schedules", "load_course_problem",
+           "load_repair_problem"]
@@ -0,0 +1,35 @@
+from typing import Iterator, Tuple
+
+# Haftalik setka: 6 kun x 4 dars vaqti. Har bir katak bitta bit bilan ifodalanadi.
+DAYS = 6
+SLOTS = 4
+CELLS = DAYS * SLOTS
+FULL_MASK = (1 << CELLS) - 1
+
+
+def cell_index(day: int, time_slot: int) -> int:
+    """(day, time_slot) juftligini 0..23 oralig'idagi katak raqamiga o'giradi."""
+    return (day - 1) * SLOTS + (time_slot - 1)
+
+
+def cell_of(index: int) -> Tuple[int, int]:
+    """Katak raqamidan (day, time_slot) juftligini qaytaradi."""
+    return index // SLOTS + 1, index % SLOTS + 1
+
+
+def cell_bit(day: int, time_slot: int) -> int:
+    """(day, time_slot) katagiga mos bit niqobi."""
+    return 1 << cell_index(day, time_slot)
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Niqobdagi yoqilgan bitlar raqamlarini o'sish tartibida qaytaradi."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask: int) -> int:
+    """Niqobdagi yoqilgan bitlar soni."""
+    return bin(mask).count("1")
@@ -0,0 +1,375 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from heapq import heapify, heappop, heappush
+from collections import deque
+from time import perf_counter
+from random import Random
+from .bitset import CELLS, FULL_MASK, SLOTS, cell_of, iter_bits, popcount
+
+
+class Lesson:
+    """Joylashtirilishi kerak bo'lgan bitta dars: guruh, fan va nomzod o'qituvchi/xonalar."""
+    __slots__ = ("group_id", "subject_id", "teachers", "rooms")
+
+    def __init__(self, group_id: int, subject_id: int, teachers: Sequence[int], rooms: Sequence[int]):
+        self.group_id = group_id
+        self.subject_id = subject_id
+        self.teachers = tuple(teachers)
+        self.rooms = tuple(rooms)
+
+    def __repr__(self) -> str:
+        return f"<Lesson(group_id={self.group_id}, subject_id={self.subject_id})>"
+
+
+class Placement:
+    """Darsning setkadagi o'rni: katak, o'qituvchi va xona."""
+    __slots__ = ("lesson", "cell", "teacher_id", "room_id")
+
+    def __init__(self, lesson: Lesson, cell: int, teacher_id: int, room_id: int):
+        self.lesson = lesson
+        self.cell = cell
+        self.teacher_id = teacher_id
+        self.room_id = room_id
+
+    @property
+    def day(self) -> int:
+        return cell_of(self.cell)[0]
+
+    @property
+    def time_slot(self) -> int:
+        return cell_of(self.cell)[1]
+
+    def to_dict(self) -> dict:
+        return {
+            "group_id": self.lesson.group_id,
+            "subject_id": self.lesson.subject_id,
+            "teacher_id": self.teacher_id,
+            "room_id": self.room_id,
+            "day": self.day,
+            "time_slot": self.time_slot,
+        }
+
+
+class SolveResult:
+    """Yechuvchi natijasi."""
+    __slots__ = ("placements", "unplaced", "elapsed", "iterations")
+
+    def __init__(self, placements: List[Placement], unplaced: List[Lesson], elapsed: float, iterations: int):
+        self.placements = placements
+        self.unplaced = unplaced
+        self.elapsed = elapsed
+        self.iterations = iterations
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.unplaced
+
+
+class TimetableSolver:
+    """
+    Kurs dars jadvalini avtomatik tuzuvchi.
+
+    O'qituvchi, xona va guruh bandligi 24 bitli niqoblarda saqlanadi. Avval MRV tartibida
+    (eng kam bo'sh katakli dars birinchi) ochko'z joylashtirish va cheklovlarni tarqatish,
+    so'ng joylashmay qolgan darslar uchun tabu bilan min-conflicts lokal qidiruv bajariladi.
+    """
+    TABU_TENURE = 12
+    SAMPLE_SIZE = 8
+
+    def __init__(
+            self,
+            lessons: Iterable[Lesson],
+            teacher_busy: Optional[Dict[int, int]] = None,
+            room_busy: Optional[Dict[int, int]] = None,
+            group_busy: Optional[Dict[int, int]] = None,
+            time_limit: float = 5.0,
+            max_iterations: int = 500000,
+            seed: int = 0,
+    ):
+        """
+        :param lessons: Joylashtiriladigan darslar.
+        :param teacher_busy: Tashqi bandlik (boshqa kurslar, band kunlar) - o'qituvchi id -> niqob.
+        :param room_busy: Xonalar uchun tashqi bandlik.
+        :param group_busy: Guruhlar uchun tashqi bandlik.
+        :param time_limit: Lokal qidiruv uchun vaqt chegarasi (soniya).
+        :param max_iterations: Lokal qidiruv qadamlari chegarasi.
+        :param seed: Tasodifiy sonlar generatori uchun urug'.
+        """
+        self.lessons = list(lessons)
+        self.fixed_teacher = dict(teacher_busy or {})
+        self.fixed_room = dict(room_busy or {})
+        self.fixed_group = dict(group_busy or {})
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.random = Random(seed)
+
+    # ---- holat ----
+
+    def _reset(self) -> None:
+        size = len(self.lessons)
+        self._cell = [-1] * size
+        self._teacher: List[Optional[int]] = [None] * size
+        self._room: List[Optional[int]] = [None] * size
+        self._placed_at = [-self.TABU_TENURE] * size
+        self._teacher_mask: Dict[int, int] = {}
+        self._room_mask: Dict[int, int] = {}
+        self._group_mask: Dict[int, int] = {}
+        self._teacher_at: Dict[Tuple[int, int], int] = {}
+        self._room_at: Dict[Tuple[int, int], int] = {}
+        self._group_at: Dict[Tuple[int, int], int] = {}
+        self._teacher_load: Dict[int, int] = {}
+        self._room_load: Dict[int, int] = {}
+
+    def _place(self, index: int, cell: int, teacher_id: int, room_id: int) -> None:
+        bit = 1 << cell
+        group_id = self.lessons[index].group_id
+        self._cell[index] = cell
+        self._teacher[index] = teacher_id
+        self._room[index] = room_id
+        self._teacher_mask[teacher_id] = self._teacher_mask.get(teacher_id, 0) | bit
+        self._room_mask[room_id] = self._room_mask.get(room_id, 0) | bit
+        self._group_mask[group_id] = self._group_mask.get(group_id, 0) | bit
+        self._teacher_at[(teacher_id, cell)] = index
+        self._room_at[(room_id, cell)] = index
+        self._group_at[(group_id, cell)] = index
+        self._teacher_load[teacher_id] = self._teacher_load.get(teacher_id, 0) + 1
+        self._room_load[room_id] = self._room_load.get(room_id, 0) + 1
+
+    def _unplace(self, index: int) -> None:
+        cell = self._cell[index]
+        if cell < 0:
+            return
+        bit = 1 << cell
+        teacher_id, room_id = self._teacher[index], self._room[index]
+        group_id = self.lessons[index].group_id
+        self._teacher_mask[teacher_id] ^= bit
+        self._room_mask[room_id] ^= bit
+        self._group_mask[group_id] ^= bit
+        del self._teacher_at[(teacher_id, cell)]
+        del self._room_at[(room_id, cell)]
+        del self._group_at[(group_id, cell)]
+        self._teacher_load[teacher_id] -= 1
+        self._room_load[room_id] -= 1
+        self._cell[index] = -1
+        self._teacher[index] = None
+        self._room[index] = None
+
+    def _free_mask(self, candidates: Sequence[int], fixed: Dict[int, int], dynamic: Dict[int, int]) -> int:
+        """Kamida bitta nomzod bo'sh bo'lgan kataklar niqobi."""
+        free = 0
+        for entity_id in candidates:
+            free |= FULL_MASK ^ (fixed.get(entity_id, 0) | dynamic.get(entity_id, 0))
+            if free == FULL_MASK:
+                break
+        return free
+
+    def _domain(self, index: int) -> int:
+        lesson = self.lessons[index]
+        group_busy = self.fixed_group.get(lesson.group_id, 0) | self._group_mask.get(lesson.group_id, 0)
+        domain = FULL_MASK ^ group_busy
+        if domain:
+            domain &= self._free_mask(lesson.teachers, self.fixed_teacher, self._teacher_mask)
+        if domain:
+            domain &= self._free_mask(lesson.rooms, self.fixed_room, self._room_mask)
+        return domain
+
+    def _pick_free(self, candidates: Sequence[int], bit: int, fixed: Dict[int, int], dynamic: Dict[int, int],
+                   load: Dict[int, int]) -> Optional[int]:
+        """Katakda bo'sh nomzodlar ichidan eng kam yuklanganini tanlaydi."""
+        best, best_load = None, None
+        for entity_id in candidates:
+            if (fixed.get(entity_id, 0) | dynamic.get(entity_id, 0)) & bit:
+                continue
+            entity_load = load.get(entity_id, 0)
+            if best is None or entity_load < best_load:
+                best, best_load = entity_id, entity_load
+                if entity_load == 0:
+                    break
+        return best
+
+    def _choose_cell(self, index: int, domain: int) -> int:
+        """Guruh darslari kunlar bo'yicha tekis taqsimlanishi uchun katak tanlaydi."""
+        group_mask = self._group_mask.get(self.lessons[index].group_id, 0)
+        day_mask = (1 << SLOTS) - 1
+        best_cell, best_key = -1, None
+        for cell in iter_bits(domain):
+            day = cell // SLOTS
+            key = (popcount((group_mask >> (day * SLOTS)) & day_mask), cell % SLOTS, day)
+            if best_key is None or key < best_key:
+                best_cell, best_key = cell, key
+        return best_cell
+
+    # ---- bosqichlar ----
+
+    def _impossible(self) -> set:
+        """Hech qachon joylashmaydigan darslarni oldindan ajratadi (bo'sh nomzodlar, guruh sig'imi)."""
+        impossible = set()
+        by_group: Dict[int, List[int]] = {}
+        for index, lesson in enumerate(self.lessons):
+            if not lesson.teachers or not lesson.rooms:
+                impossible.add(index)
+            else:
+                by_group.setdefault(lesson.group_id, []).append(index)
+        for group_id, indexes in by_group.items():
+            capacity = CELLS - popcount(self.fixed_group.get(group_id, 0))
+            if len(indexes) > capacity:
+                impossible.update(indexes[capacity:])
+        return impossible
+
+    def _construct(self, skip: set) -> List[int]:
+        """MRV tartibida ochko'z joylashtirish; joylashmaganlar ro'yxatini qaytaradi."""
+        by_group: Dict[int, List[int]] = {}
+        known: Dict[int, int] = {}
+        heap = []
+        for index, lesson in enumerate(self.lessons):
+            if index in skip:
+                continue
+            by_group.setdefault(lesson.group_id, []).append(index)
+            known[index] = self._domain(index)
+            heap.append((popcount(known[index]), len(lesson.teachers) * len(lesson.rooms), index))
+        heapify(heap)
+
+        unplaced = []
+        while heap:
+            size, weight, index = heappop(heap)
+            if index not in known or size != popcount(known[index]):
+                continue  # eskirgan yozuv
+            del known[index]
+            domain = self._domain(index)
+            if not domain:
+                unplaced.append(index)
+                continue
+            lesson = self.lessons[index]
+            cell = self._choose_cell(index, domain)
+            bit = 1 << cell
+            teacher_id = self._pick_free(lesson.teachers, bit, self.fixed_teacher, self._teacher_mask,
+                                         self._teacher_load)
+            room_id = self._pick_free(lesson.rooms, bit, self.fixed_room, self._room_mask, self._room_load)
+            self._place(index, cell, teacher_id, room_id)
+
+            # Cheklovni tarqatish: shu guruhdagi darslar uchun katak yopildi
+            for other in by_group[lesson.group_id]:
+                if other in known and known[other] & bit:
+                    known[other] ^= bit
+                    heappush(heap, (popcount(known[other]), weight, other))
+        return unplaced
+
+    def _best_move(self, index: int, iteration: int) -> Optional[Tuple[int, int, int, set]]:
+        """Eng kam darsni siqib chiqaradigan (katak, o'qituvchi, xona, siqiladiganlar) yurishini topadi."""
+        lesson = self.lessons[index]
+        group_fixed = self.fixed_group.get(lesson.group_id, 0)
+        free_teachers = self._free_mask(lesson.teachers, self.fixed_teacher, self._teacher_mask)
+        free_rooms = self._free_mask(lesson.rooms, self.fixed_room, self._room_mask)
+        tenure = self.TABU_TENURE
+        placed_at = self._placed_at
+        best, best_cost = None, None
+
+        for cell in range(CELLS):
+            bit = 1 << cell
+            if group_fixed & bit:
+                continue
+            evict = set()
+            occupant = self._group_at.get((lesson.group_id, cell))
+            if occupant is not None:
+                if iteration - placed_at[occupant] < tenure:
+                    continue
+                evict.add(occupant)
+
+            teacher_id = None
+            if not free_teachers & bit:
+                teacher_id = self._sample_busy(lesson.teachers, cell, self.fixed_teacher, self._teacher_at,
+                                               iteration, evict)
+                if teacher_id is None:
+                    continue
+            room_id = None
+            if not free_rooms & bit:
+                room_id = self._sample_busy(lesson.rooms, cell, self.fixed_room, self._room_at, iteration, evict)
+                if room_id is None:
+                    continue
+
+            cost = len(evict) + self.random.random() * 0.5
+            if best_cost is None or cost < best_cost:
+                best, best_cost = (cell, teacher_id, room_id, evict), cost
+
+        if best is None:
+            return None
+        cell, teacher_id, room_id, evict = best
+        bit = 1 << cell
+        if teacher_id is None:
+            teacher_id = self._pick_free(lesson.teachers, bit, self.fixed_teacher, self._teacher_mask,
+                                         self._teacher_load)
+        if room_id is None:
+            room_id = self._pick_free(lesson.rooms, bit, self.fixed_room, self._room_mask, self._room_load)
+        return cell, teacher_id, room_id, evict
+
+    def _sample_busy(self, candidates: Sequence[int], cell: int, fixed: Dict[int, int],
+                     occupied: Dict[Tuple[int, int], int], iteration: int, evict: set) -> Optional[int]:
+        """Band nomzodlar ichidan tabu bo'lmagan egasini siqish mumkin bo'lganini tanlaydi."""
+        bit = 1 << cell
+        if len(candidates) > self.SAMPLE_SIZE:
+            candidates = self.random.sample(candidates, self.SAMPLE_SIZE)
+        fallback = None
+        for entity_id in candidates:
+            if fixed.get(entity_id, 0) & bit:
+                continue
+            occupant = occupied[(entity_id, cell)]
+            if occupant in evict:
+                return entity_id  # qo'shimcha siqish talab qilinmaydi
+            if fallback is None and iteration - self._placed_at[occupant] >= self.TABU_TENURE:
+                fallback = entity_id
+        if fallback is not None:
+            evict.add(occupied[(fallback, cell)])
+        return fallback
+
+    def _snapshot(self) -> Tuple[List[int], List[Optional[int]], List[Optional[int]]]:
+        return list(self._cell), list(self._teacher), list(self._room)
+
+    def _restore(self, snapshot: Tuple[List[int], List[Optional[int]], List[Optional[int]]]) -> None:
+        cells, teachers, rooms = snapshot
+        self._reset()
+        for index, cell in enumerate(cells):
+            if cell >= 0:
+                self._place(index, cell, teachers[index], rooms[index])
+
+    def _local_search(self, unplaced: List[int], started: float) -> int:
+        """Tabu bilan min-conflicts lokal qidiruv; bajarilgan qadamlar sonini qaytaradi."""
+        queue = deque(unplaced)
+        best_missing = len(queue)
+        best = self._snapshot() if queue else None
+        iteration = 0
+        while queue and iteration < self.max_iterations:
+            if iteration & 127 == 0 and perf_counter() - started > self.time_limit:
+                break
+            iteration += 1
+            index = queue.popleft()
+            move = self._best_move(index, iteration)
+            if move is None:
+                queue.append(index)
+                continue
+            cell, teacher_id, room_id, evict = move
+            for other in evict:
+                self._unplace(other)
+                queue.append(other)
+            self._place(index, cell, teacher_id, room_id)
+            self._placed_at[index] = iteration
+            if len(queue) < best_missing:
+                best_missing = len(queue)
+                best = self._snapshot() if queue else None
+        if queue and best is not None and len(queue) > best_missing:
+            self._restore(best)
+        return iteration
+
+    def solve(self) -> SolveResult:
+        """Darslarni joylashtiradi va natijani qaytaradi."""
+        started = perf_counter()
+        self._reset()
+        impossible = self._impossible()
+        unplaced = self._construct(impossible)
+        iterations = self._local_search(unplaced, started) if unplaced else 0
+
+        placements, missing = [], []
+        for index, lesson in enumerate(self.lessons):
+            if self._cell[index] >= 0:
+                placements.append(Placement(lesson, self._cell[index], self._teacher[index], self._room[index]))
+            else:
+                missing.append(lesson)
+        return SolveResult(placements, missing, perf_counter() - started, iterations)
@@ -0,0 +1,131 @@
+from DatabaseService import DatabaseService1, Group, Subject, Teacher, TeacherInfo, Room, Schedule
+from typing import Dict, Iterable, List, Optional, Tuple
+from .bitset import SLOTS, cell_bit
+from .core import Lesson
+from .repair import Booking
+
+
+def _normalize(value) -> str:
+    return (value or "").strip().lower()
+
+
+def subject_candidates(subjects: Iterable[Subject], teachers: Iterable[Teacher], infos: Iterable[TeacherInfo],
+                       rooms: Iterable[Room]) -> Dict[int, Tuple[List[int], List[int]]]:
+    """
+    Har bir fan uchun nomzod o'qituvchilar va xonalar: fanga `TeacherInfo.subject_name` yoki
+    `Teacher.sciencename` mos kelgan o'qituvchilar, `Room.roomstype` fan turiga mos xonalar;
+    mosi topilmasa - barchasi.
+    """
+    teachers, rooms = list(teachers), list(rooms)
+    all_teachers = [teacher.id for teacher in teachers]
+    all_rooms = [room.id for room in rooms]
+
+    teachers_by_subject: Dict[str, List[int]] = {}
+    for info in infos:
+        teachers_by_subject.setdefault(_normalize(info.subject_name), []).append(info.teacher_id)
+    for teacher in teachers:
+        teachers_by_subject.setdefault(_normalize(teacher.sciencename), []).append(teacher.id)
+    rooms_by_type: Dict[str, List[int]] = {}
+    for room in rooms:
+        rooms_by_type.setdefault(_normalize(room.roomstype), []).append(room.id)
+
+    candidates = {}
+    for subject in subjects:
+        subject_teachers = list(dict.fromkeys(teachers_by_subject.get(_normalize(subject.name), ()))) or all_teachers
+        subject_rooms = rooms_by_type.get(_normalize(subject.subject_type)) or all_rooms
+        candidates[subject.id] = (subject_teachers, subject_rooms)
+    return candidates
+
+
+def build_lessons(groups: Iterable[Group], subjects: Iterable[Subject], teachers: Iterable[Teacher],
+                  infos: Iterable[TeacherInfo], rooms: Iterable[Room], lessons_per_subject: int = 1) -> List[Lesson]:
+    """
+    Kurs guruhlari va fanlaridan joylashtiriladigan darslar ro'yxatini tuzadi
+    (nomzodlar `subject_candidates` bo'yicha).
+    """
+    candidates = subject_candidates(subjects, teachers, infos, rooms)
+    return [Lesson(group.id, subject_id, subject_teachers, subject_rooms)
+            for group in groups
+            for subject_id, (subject_teachers, subject_rooms) in candidates.items()
+            for _ in range(lessons_per_subject)]
+
+
+def unavailable_masks(entities: Iterable[object]) -> Dict[int, int]:
+    """O'qituvchi/xonalarning doimiy band kataklari (`unavailable` niqobi) - bo'sh bo'lmaganlari."""
+    return {entity.id: entity.unavailable for entity in entities if entity.unavailable}
+
+
+def merge_masks(*masks: Dict[int, int]) -> Dict[int, int]:
+    """Bir nechta {id: niqob} lug'atini bitli OR bilan birlashtiradi."""
+    merged: Dict[int, int] = {}
+    for items in masks:
+        for entity_id, mask in items.items():
+            merged[entity_id] = merged.get(entity_id, 0) | mask
+    return merged
+
+
+def occupancy_from_schedules(schedules: Iterable[Schedule]) -> Tuple[Dict[int, int], Dict[int, int], Dict[int, int]]:
+    """Mavjud jadval yozuvlaridan o'qituvchi, xona va guruh bandlik niqoblarini yig'adi."""
+    teacher_busy: Dict[int, int] = {}
+    room_busy: Dict[int, int] = {}
+    group_busy: Dict[int, int] = {}
+    for schedule in schedules:
+        bit = cell_bit(schedule.day, schedule.time_slot)
+        teacher_busy[schedule.teacher_id] = teacher_busy.get(schedule.teacher_id, 0) | bit
+        room_busy[schedule.room_id] = room_busy.get(schedule.room_id, 0) | bit
+        group_busy[schedule.group_id] = group_busy.get(schedule.group_id, 0) | bit
+    return teacher_busy, room_busy, group_busy
+
+
+async def load_course_problem(db: DatabaseService1, course_id: int, lessons_per_subject: int = 1) \
+        -> Tuple[List[Lesson], Dict[int, int], Dict[int, int]]:
+    """
+    Kurs uchun darslar va boshqa kurslar tomonidan band qilingan (hamda `unavailable` deb belgilangan)
+    o'qituvchi/xona niqoblarini yuklaydi. Kursning o'z jadvali hisobga olinmaydi - u yangi yechim bilan almashtiriladi.
+    """
+    groups = await db.get(Group, {"course_id": course_id})
+    subjects = await db.get(Subject, {"course_id": f"{course_id}"})
+    teachers = await db.get(Teacher)
+    infos = await db.get(TeacherInfo)
+    rooms = await db.get(Room)
+    bookings = await db.get_for_schedule(Schedule, {"course_id": {"not_in": [course_id]}})
+
+    lessons = build_lessons(groups, subjects, teachers, infos, rooms, lessons_per_subject)
+    teacher_busy, room_busy, _ = occupancy_from_schedules(bookings)
+    teacher_busy = merge_masks(teacher_busy, unavailable_masks(teachers))
+    room_busy = merge_masks(room_busy, unavailable_masks(rooms))
+    return lessons, teacher_busy, room_busy
+
+
+# Tuzatish uchun jadval yozuvi ustunlari
+REPAIR_COLUMNS = ["id", "course_id", "group_id", "subject_id", "teacher_id", "room_id", "day", "time_slot"]
+
+
+async def load_repair_problem(db: DatabaseService1, teacher_blocked: Optional[Dict[int, int]] = None,
+                              room_blocked: Optional[Dict[int, int]] = None) \
+        -> Tuple[List[Booking], Dict[int, Tuple[List[int], List[int]]], Dict[int, int], Dict[int, int]]:
+    """
+    O'zgarish ta'sir qilgan kurslarning jadvali (ko'chirilishi mumkin), ularning fanlari uchun nomzodlar
+    va boshqa kurslarning o'qituvchi/xona bandlik niqoblarini (ikkita `GROUP BY` so'rovi, `unavailable` bilan) yuklaydi.
+    :param teacher_blocked: O'qituvchi id -> endi band bo'lgan kataklar niqobi.
+    :param room_blocked: Xona id -> band kataklar niqobi.
+    """
+    affected = set()
+    for column, blocked in (("teacher_id", teacher_blocked), ("room_id", room_blocked)):
+        if blocked:
+            rows = await db.select_columns(Schedule, ["course_id", "day", "time_slot", column],
+                                           {column: {"in": list(blocked)}})
+            affected.update(row["course_id"] for row in rows
+                            if blocked[row[column]] & cell_bit(row["day"], row["time_slot"]))
+    if not affected:
+        return [], {}, {}, {}
+
+    course_ids = sorted(affected)
+    rows = await db.select_columns(Schedule, REPAIR_COLUMNS, {"course_id": {"in": course_ids}})
+    subjects = await db.get(Subject, {"course_id": {"in": [f"{course_id}" for course_id in course_ids]}})
+    teachers, rooms = await db.get(Teacher), await db.get(Room)
+    candidates = subject_candidates(subjects, teachers, await db.get(TeacherInfo), rooms)
+    others = {"course_id": {"not_in": course_ids}}
+    teacher_busy = merge_masks(await db.cell_masks(Schedule, "teacher_id", SLOTS, others), unavailable_masks(teachers))
+    room_busy = merge_masks(await db.cell_masks(Schedule, "room_id", SLOTS, others), unavailable_masks(rooms))
+    return [Booking.from_row(row) for row in rows], candidates, teacher_busy, room_busy
@@ -0,0 +1,279 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from time import perf_counter
+from .bitset import CELLS, SLOTS, cell_index, cell_of
+
+GROUP, TEACHER, ROOM = 0, 1, 2
+
+# (yozuv indeksi, katak, o'qituvchi, xona)
+Step = Tuple[int, int, int, int]
+# ((ko'chirilgan yozuvlar soni, o'zgarish darajasi), qadamlar)
+Plan = Tuple[Tuple[int, int], List[Step]]
+
+
+class Booking:
+    """Jadvaldagi mavjud yozuv va uning dastlabki joyi."""
+    __slots__ = ("id", "course_id", "group_id", "subject_id", "teacher_id", "room_id", "cell")
+
+    def __init__(self, id: int, course_id: int, group_id: int, subject_id: int, teacher_id: int, room_id: int,
+                 cell: int):
+        self.id = id
+        self.course_id = course_id
+        self.group_id = group_id
+        self.subject_id = subject_id
+        self.teacher_id = teacher_id
+        self.room_id = room_id
+        self.cell = cell
+
+    @classmethod
+    def from_row(cls, row: Dict[str, int]) -> "Booking":
+        return cls(row["id"], row["course_id"], row["group_id"], row["subject_id"], row["teacher_id"],
+                   row["room_id"], cell_index(row["day"], row["time_slot"]))
+
+    def placement(self) -> dict:
+        day, time_slot = cell_of(self.cell)
+        return {"day": day, "time_slot": time_slot, "teacher_id": self.teacher_id, "room_id": self.room_id}
+
+    def __repr__(self) -> str:
+        return f"<Booking(id={self.id}, group_id={self.group_id}, cell={self.cell})>"
+
+
+class Move:
+    """Yozuvning yangi joyi: katak, o'qituvchi va xona."""
+    __slots__ = ("booking", "cell", "teacher_id", "room_id")
+
+    def __init__(self, booking: Booking, cell: int, teacher_id: int, room_id: int):
+        self.booking = booking
+        self.cell = cell
+        self.teacher_id = teacher_id
+        self.room_id = room_id
+
+    def to_dict(self) -> dict:
+        day, time_slot = cell_of(self.cell)
+        return {
+            "id": self.booking.id,
+            "course_id": self.booking.course_id,
+            "group_id": self.booking.group_id,
+            "from": self.booking.placement(),
+            "to": {"day": day, "time_slot": time_slot, "teacher_id": self.teacher_id, "room_id": self.room_id},
+        }
+
+
+class RepairResult:
+    """Tuzatish natijasi: ko'chirishlar va joy topilmagan yozuvlar."""
+    __slots__ = ("moves", "unresolved", "elapsed", "nodes")
+
+    def __init__(self, moves: List[Move], unresolved: List[Booking], elapsed: float, nodes: int):
+        self.moves = moves
+        self.unresolved = unresolved
+        self.elapsed = elapsed
+        self.nodes = nodes
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.unresolved
+
+
+class TimetableRepair:
+    """
+    Bitta o'zgarishdan keyin (o'qituvchi ayrim kataklarda band bo'ldi, xona olib tashlandi) jadvalni tuzatadi.
+
+    Faqat to'qnashgan yozuvlardan boshlanadi: avval o'sha katakda o'qituvchi/xonani almashtirish yoki bo'sh
+    katakka ko'chirish, bo'lmasa chuqurligi `max_depth` bilan cheklangan siqib chiqarish zanjiri (boshqa
+    yozuvni bo'shatib, uni ham shu usulda joylashtirish) sinaladi. Eng kam yozuv ko'chiradigan reja tanlanadi;
+    teng bo'lsa - katak, kun, o'qituvchi va xona o'zgarishlari kamrog'i. Butun kurs qayta tuzilmaydi.
+    """
+    SAMPLE_SIZE = 8
+
+    def __init__(
+            self,
+            bookings: Iterable[Booking],
+            candidates: Dict[int, Tuple[Sequence[int], Sequence[int]]],
+            teacher_blocked: Optional[Dict[int, int]] = None,
+            room_blocked: Optional[Dict[int, int]] = None,
+            teacher_busy: Optional[Dict[int, int]] = None,
+            room_busy: Optional[Dict[int, int]] = None,
+            max_depth: int = 2,
+            time_limit: float = 0.05,
+            max_nodes: int = 20000,
+    ):
+        """
+        :param bookings: Ko'chirilishi mumkin bo'lgan yozuvlar (odatda ta'sirlangan kurslarning butun jadvali).
+        :param candidates: Fan id -> (nomzod o'qituvchilar, nomzod xonalar); fan topilmasa, joriylari qoladi.
+        :param teacher_blocked: O'zgarish: o'qituvchi id -> endi band bo'lgan kataklar niqobi.
+        :param room_blocked: O'zgarish: xona id -> band kataklar niqobi (olib tashlangan xona - FULL_MASK).
+        :param teacher_busy: `bookings` dan tashqaridagi (boshqa kurslar) o'qituvchi bandligi.
+        :param room_busy: `bookings` dan tashqaridagi xona bandligi.
+        :param max_depth: Siqib chiqarish zanjiri chuqurligi (0 - faqat bo'sh joylar).
+        :param time_limit: Qidiruv uchun vaqt chegarasi (soniya).
+        :param max_nodes: Qidiruv tugunlari chegarasi.
+        """
+        self.bookings = list(bookings)
+        self.candidates = candidates
+        self.teacher_blocked = dict(teacher_blocked or {})
+        self.room_blocked = dict(room_blocked or {})
+        self.fixed = {TEACHER: dict(teacher_busy or {}), ROOM: dict(room_busy or {})}
+        for kind, blocked in ((TEACHER, self.teacher_blocked), (ROOM, self.room_blocked)):
+            for entity_id, mask in blocked.items():
+                self.fixed[kind][entity_id] = self.fixed[kind].get(entity_id, 0) | mask
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+
+    # ---- holat ----
+
+    def _reset(self) -> None:
+        self._cell = [booking.cell for booking in self.bookings]
+        self._teacher = [booking.teacher_id for booking in self.bookings]
+        self._room = [booking.room_id for booking in self.bookings]
+        # (tur, ob'ekt, katak) -> shu yerdagi yozuvlar (birgalikdagi darslarda bir nechta)
+        self._at: Dict[Tuple[int, int, int], Set[int]] = {}
+        for index in range(len(self.bookings)):
+            self._mark(index, True)
+
+    def _keys(self, index: int) -> Tuple[Tuple[int, int, int], ...]:
+        cell = self._cell[index]
+        return ((GROUP, self.bookings[index].group_id, cell), (TEACHER, self._teacher[index], cell),
+                (ROOM, self._room[index], cell))
+
+    def _mark(self, index: int, present: bool) -> None:
+        for key in self._keys(index):
+            if present:
+                self._at.setdefault(key, set()).add(index)
+            else:
+                occupants = self._at[key]
+                occupants.discard(index)
+                if not occupants:
+                    del self._at[key]
+
+    def _place(self, index: int, cell: int, teacher_id: int, room_id: int) -> None:
+        self._cell[index], self._teacher[index], self._room[index] = cell, teacher_id, room_id
+        self._mark(index, True)
+
+    def _unplace(self, index: int) -> None:
+        if self._cell[index] >= 0:
+            self._mark(index, False)
+            self._cell[index] = -1
+
+    def _occupants(self, kind: int, entity_id: int, cell: int) -> Set[int]:
+        return self._at.get((kind, entity_id, cell), set())
+
+    def _conflicts(self, index: int) -> bool:
+        booking = self.bookings[index]
+        bit = 1 << booking.cell
+        return bool(self.teacher_blocked.get(booking.teacher_id, 0) & bit
+                    or self.room_blocked.get(booking.room_id, 0) & bit)
+
+    def _exhausted(self) -> bool:
+        if self.nodes >= self.max_nodes:
+            return True
+        if self.nodes & 63 == 0:
+            self._timed_out = self._timed_out or perf_counter() - self._started > self.time_limit
+        return self._timed_out
+
+    # ---- qidiruv ----
+
+    def _choices(self, kind: int, candidates: Sequence[int], current: int, cell: int, frozen: FrozenSet[int],
+                 allow_evict: bool) -> List[Tuple[int, Set[int]]]:
+        """
+        Katak uchun o'qituvchi/xona variantlari: joriysi (bloklanmagan bo'lsa), birinchi bo'sh nomzod va
+        (`allow_evict` bo'lsa) bitta yozuvni siqib chiqarish bilan bo'shaydigan bir nechta nomzod.
+        """
+        bit = 1 << cell
+        fixed = self.fixed[kind]
+        choices: List[Tuple[int, Set[int]]] = []
+        if not fixed.get(current, 0) & bit:
+            occupants = self._occupants(kind, current, cell)
+            if not occupants or (allow_evict and len(occupants) == 1 and not occupants & frozen):
+                choices.append((current, occupants))
+                if not occupants:
+                    return choices
+        evictable = 0
+        for entity_id in candidates:
+            if entity_id == current or fixed.get(entity_id, 0) & bit:
+                continue
+            occupants = self._occupants(kind, entity_id, cell)
+            if not occupants:
+                choices.append((entity_id, occupants))
+                break
+            if allow_evict and evictable < self.SAMPLE_SIZE and len(occupants) == 1 and not occupants & frozen:
+                choices.append((entity_id, occupants))
+                evictable += 1
+        return choices
+
+    def _options(self, index: int, frozen: FrozenSet[int], allow_evict: bool) -> List[tuple]:
+        """Yozuv uchun barcha variantlar: (siqiladiganlar soni, o'zgarish darajasi, katak, o'qituvchi, xona, siqiladigan)."""
+        booking = self.bookings[index]
+        teachers, rooms = self.candidates.get(booking.subject_id, ((), ()))
+        original_day = booking.cell // SLOTS
+        options = []
+        for cell in range(CELLS):
+            group_occupants = self._occupants(GROUP, booking.group_id, cell)
+            if group_occupants and (not allow_evict or len(group_occupants) > 1 or group_occupants & frozen):
+                continue
+            teacher_choices = self._choices(TEACHER, teachers, booking.teacher_id, cell, frozen, allow_evict)
+            if not teacher_choices:
+                continue
+            room_choices = self._choices(ROOM, rooms, booking.room_id, cell, frozen, allow_evict)
+            for teacher_id, teacher_occupants in teacher_choices:
+                for room_id, room_occupants in room_choices:
+                    evict = group_occupants | teacher_occupants | room_occupants
+                    if len(evict) > (1 if allow_evict else 0):
+                        continue
+                    disruption = ((cell != booking.cell) * 2 + (cell // SLOTS != original_day)
+                                  + (teacher_id != booking.teacher_id) + (room_id != booking.room_id))
+                    options.append((len(evict), disruption, cell, teacher_id, room_id, evict))
+        options.sort(key=lambda option: option[:3])
+        return options
+
+    def _plan(self, index: int, depth: int, frozen: FrozenSet[int]) -> Optional[Plan]:
+        """Joylashmagan yozuv uchun eng arzon rejani topadi (holat o'zgarishsiz qaytadi)."""
+        self.nodes += 1
+        best: Optional[Plan] = None
+        for evicted, disruption, cell, teacher_id, room_id, evict in self._options(index, frozen, depth > 0):
+            if not evicted:
+                return (1, disruption), [(index, cell, teacher_id, room_id)]
+            if self._exhausted():
+                break
+            other = next(iter(evict))
+            saved = (self._cell[other], self._teacher[other], self._room[other])
+            self._unplace(other)
+            self._place(index, cell, teacher_id, room_id)
+            sub = self._plan(other, depth - 1, frozen | {index})
+            self._unplace(index)
+            self._place(other, *saved)
+            if sub is None:
+                continue
+            cost = (1 + sub[0][0], disruption + sub[0][1])
+            if best is None or cost < best[0]:
+                best = cost, [(index, cell, teacher_id, room_id)] + sub[1]
+            if best[0][0] == 2:
+                break  # siqib chiqarish bilan bundan kam ko'chirish bo'lmaydi
+        return best
+
+    def solve(self) -> RepairResult:
+        """To'qnashgan yozuvlarni tuzatadi va o'zgarishlar ro'yxatini qaytaradi (ma'lumotlar bazasiga yozmaydi)."""
+        self._started = perf_counter()
+        self._timed_out = False
+        self.nodes = 0
+        self._reset()
+        conflicts = [index for index in range(len(self.bookings)) if self._conflicts(index)]
+        # Bekor bo'lgan joylar boshqa yozuvlarni to'smasligi uchun hammasi avval bo'shatiladi
+        for index in conflicts:
+            self._unplace(index)
+
+        unresolved = []
+        for index in conflicts:
+            plan = self._plan(index, self.max_depth, frozenset())
+            if plan is None:
+                unresolved.append(self.bookings[index])
+                continue
+            for step_index, cell, teacher_id, room_id in plan[1]:
+                self._unplace(step_index)
+                self._place(step_index, cell, teacher_id, room_id)
+
+        moves = []
+        for index, booking in enumerate(self.bookings):
+            cell, teacher_id, room_id = self._cell[index], self._teacher[index], self._room[index]
+            if cell >= 0 and (cell, teacher_id, room_id) != (booking.cell, booking.teacher_id, booking.room_id):
+                moves.append(Move(booking, cell, teacher_id, room_id))
+        return RepairResult(moves, unresolved, perf_counter() - self._started, self.nodes)
@@ -0,0 +1,89 @@
+from base64 import b64encode
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from DatabaseService import UnavailabilityRequest
+from SolverService import DAYS, SLOTS, CELLS, FULL_MASK, cell_bit, cell_of, iter_bits
+
+# Katak -> tur -> band ob'ektlar bitmapi (`id` raqamli bit, bandlik indeksidagidek)
+BusyMatrix = Dict[Tuple[int, int], Dict[str, int]]
+
+
+def mask_of(ids: Iterable[int]) -> int:
+    """Identifikatorlar to'plamini bitmapga o'giradi."""
+    mask = 0
+    for entity_id in ids:
+        mask |= 1 << entity_id
+    return mask
+
+
+def encode_mask(mask: int) -> str:
+    """Bitmapni base64 satrga o'giradi: baytlar little-endian, `i` biti `bytes[i >> 3] >> (i & 7)`."""
+    return b64encode(mask.to_bytes((mask.bit_length() + 7) // 8, "little")).decode("ascii")
+
+
+def request_mask(request: UnavailabilityRequest) -> int:
+    """So'rovdagi `mask`, `cells` va `days` ni bitta katak niqobiga birlashtiradi; noto'g'ri qiymatda ValueError."""
+    mask = request.mask or 0
+    if not 0 <= mask <= FULL_MASK:
+        raise ValueError(f"mask must be between 0 and {FULL_MASK}")
+    for cell in request.cells or ():
+        if not (1 <= cell.day <= DAYS and 1 <= cell.time_slot <= SLOTS):
+            raise ValueError(f"Invalid cell: day={cell.day}, time_slot={cell.time_slot}")
+        mask |= cell_bit(cell.day, cell.time_slot)
+    for day in request.days or ():
+        if not 1 <= day <= DAYS:
+            raise ValueError(f"Invalid day: {day}")
+        mask |= ((1 << SLOTS) - 1) << (day - 1) * SLOTS
+    return mask
+
+
+def cells_of(mask: int) -> List[Dict[str, int]]:
+    """Katak niqobini [{day, time_slot}] ro'yxatiga o'giradi."""
+    return [dict(zip(("day", "time_slot"), cell_of(index))) for index in iter_bits(mask)]
+
+
+def positional(mask: int, positions: Dict[int, int]) -> int:
+    """`id` raqamli bitmapni `positions` (id -> massivdagi o'rni) bo'yicha bitmapga o'giradi; boshqalari tashlanadi."""
+    result = 0
+    for entity_id in iter_bits(mask):
+        position = positions.get(entity_id)
+        if position is not None:
+            result |= 1 << position
+    return result
+
+
+def busy_from_groups(groups: Dict[Tuple[int, int], Dict[str, List[int]]]) -> BusyMatrix:
+    """`group_ids(Schedule, ["day", "time_slot"], ...)` natijasini bandlik bitmaplariga o'giradi."""
+    return {cell: {column[:-len("_id")]: mask_of(ids) for column, ids in columns.items()}
+            for cell, columns in groups.items()}
+
+
+def build_availability(course_id: int, busy: BusyMatrix, entities: Dict[str, Sequence[Dict[str, Any]]]) -> Dict:
+    """
+    Kursning barcha kataklari uchun bo'sh o'qituvchi, xona va guruhlar bitmaplari.
+    `free[tur][cell_index(day, time_slot)]` - shu katakda bo'sh ob'ektlar bitmapi: `i` biti javobdagi
+    `<tur>s.id[i]` ob'ektini bildiradi, shuning uchun hajmi identifikatorlar qiymatiga emas, soniga bog'liq.
+    :param busy: Katak bo'yicha band bitmaplar ("teacher", "room", "group"; `id` raqamli bit).
+    :param entities: {"teacher": [...], "room": [...], "group": [...]} - {id, name} ro'yxatlari; `unavailable`
+        (katak niqobi) bo'lsa, ob'ekt shu kataklarda band hisoblanadi.
+    """
+    free = {}
+    for kind, items in entities.items():
+        positions = {item["id"]: position for position, item in enumerate(items)}
+        everyone = (1 << len(items)) - 1
+        # Katak -> shu katakda mavjud bo'lmagan ob'ektlar bitmapi
+        unavailable = [0] * CELLS
+        for position, item in enumerate(items):
+            for index in iter_bits(item.get("unavailable", 0)):
+                unavailable[index] |= 1 << position
+        free[kind] = [encode_mask(everyone & ~positional(busy.get(cell_of(index), {}).get(kind, 0), positions)
+                                  & ~unavailable[index])
+                      for index in range(CELLS)]
+    return {
+        "course_id": course_id,
+        "days": DAYS,
+        "slots": SLOTS,
+        "encoding": "base64-le-bitmask",
+        **{f"{kind}s": {"id": [item["id"] for item in items], "name": [item["name"] for item in items]}
+           for kind, items in entities.items()},
+        "free": free,
+    }
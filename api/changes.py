@@ -0,0 +1,86 @@
+from DatabaseService import DatabaseCore, get_db_core, Course, Group, Subject, Teacher, TeacherInfo, LessonType, Room, \
+    Schedule, CHANGES_PAGE_SIZE, CHANGES_PAGE_SIZE_MAX, CHANGES_PRUNE_INTERVAL, CHANGES_RETENTION_DAYS
+from LoggerService import LoggerService
+from asyncio import sleep
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Dict, Optional
+from .errors import server_error
+from .transaction import UnitOfWorkRoute
+
+router = APIRouter(
+    prefix="/api",
+    route_class=UnitOfWorkRoute,
+    tags=["Changes"],
+    responses={404: {"description": "Not found"}, 410: {"description": "since is older than the retention window"}},
+)
+
+# Sinxronlanadigan jadvallar (javobdagi kalitlar - jadval nomlari)
+ENTITIES: Dict[str, Any] = {model.__tablename__: model for model in
+                            (Course, Group, Subject, Teacher, TeacherInfo, LessonType, Room, Schedule)}
+
+
+def retention_start() -> datetime:
+    """O'chirilgan yozuvlar izi shu vaqtdan beri to'liq."""
+    return datetime.now(timezone.utc) - timedelta(days=CHANGES_RETENTION_DAYS)
+
+
+@router.get("/changes")
+async def read_changes(since: Optional[datetime] = None, entities: Optional[str] = None,
+                       after: Optional[str] = Query(None, description="Oldingi sahifaning `next` qiymati"),
+                       limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=CHANGES_PAGE_SIZE_MAX),
+                       db: DatabaseCore = Depends(get_db_core)):
+    """
+    Oynalar (mirror) va keshlar uchun o'zgarishlar: `since` dan beri yaratilgan yoki o'zgartirilgan qatorlar
+    (`upserted`) va o'chirilgan identifikatorlar (`deleted`), sahifasiga jami `limit` tadan.
+    Javobda `next` bo'lsa, keyingi sahifa `after=<next>` bilan (o'sha `entities` bilan) olinadi; `since` va
+    kursor birinchi sahifadan saqlanadi. Oxirgi sahifadagi `cursor` keyingi sinxronlashning `since` qiymati
+    bo'ladi. `since` berilmasa - to'liq nusxa. Vaqt zonasisiz `since` UTC deb olinadi.
+    `since` o'chirishlar izi saqlanadigan muddatdan (CHANGES_RETENTION_DAYS) eski bo'lsa - 410: mijoz
+    `since` siz to'liq nusxa olishi kerak.
+    :param entities: Vergul bilan ajratilgan jadvallar (masalan, `schedules,teachers`); sukut bo'yicha hammasi.
+    """
+    names = [name.strip() for name in entities.split(",") if name.strip()] if entities else list(ENTITIES)
+    unknown = [name for name in names if name not in ENTITIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown entities: {', '.join(unknown)}")
+    cursor = position = None
+    if after is not None:
+        try:
+            token_names, since_value, cursor_value, position = db.decode_cursor(after, "changes")
+            since = datetime.fromisoformat(since_value) if since_value else None
+            cursor = datetime.fromisoformat(cursor_value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if token_names != names:
+            raise HTTPException(status_code=400, detail="Cursor does not match entities")
+    elif since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if since is not None and since < retention_start():
+        raise HTTPException(status_code=410, detail="since is older than the retention window, resync without it")
+    try:
+        cursor, changes, position = await db.changes([ENTITIES[name] for name in names], since, limit, cursor,
+                                                      position)
+        next_page = db.encode_cursor("changes", [names, since.isoformat() if since else None, cursor.isoformat(),
+                                                 position]) if position else None
+        return {"since": since, "cursor": None if next_page else cursor, "next": next_page, "full": since is None,
+                "changes": changes}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
+
+async def prune_deleted_rows(db: DatabaseCore) -> None:
+    """
+    Muddati o'tgan o'chirishlar izini CHANGES_PRUNE_INTERVAL oralig'ida tozalaydi (lifespan fon vazifasi).
+    Bir nechta workerda har biri tozalaydi - takroriy DELETE hech narsa o'chirmaydi.
+    """
+    while True:
+        try:
+            await db.prune_deleted_rows(retention_start())
+        except Exception as e:
+            LoggerService.log_exception(e, "Deleted rows pruning failed")
+        await sleep(CHANGES_PRUNE_INTERVAL)
@@ -1,11 +1,14 @@
 from DatabaseService import Course, DatabaseCore, get_db_core
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from .errors import server_error
+from .pagination import PageParams, fetch_page
 from typing import List
+from .transaction import UnitOfWorkRoute
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Courses"],
-    dependencies=[Depends(get_db_core)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -18,31 +21,33 @@ async def create_course(course: Course, db: DatabaseCore = Depends(get_db_core))
             course.id = course_id
             return course
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/courses/", response_model=List[dict])
-async def read_courses(db: DatabaseCore = Depends(get_db_core)):
+async def read_courses(request: Request, response: Response, page: PageParams = Depends(),
+                       db: DatabaseCore = Depends(get_db_core)):
     """
-    Get all courses.
-    Returns a list of Course objects.
+    Get courses page by page.
+    Returns a list of courses; the next page cursor is sent in the X-Next-Cursor header.
     """
     try:
-        # Get all courses from the database
-        courses = await db.get(Course)
-        # Return a list of dictionaries containing the name and description of each course
-        return [{"name": course.name, "description": course.description} for course in courses]
+        # Get only the name and description columns of the courses
+        return await fetch_page(db, Course, ["name", "description"], page, request, response)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         # If an error occurs, raise an HTTPException with a 500 status code
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/courses/for/groups")
 async def read_courses(db: DatabaseCore = Depends(get_db_core)):
     try:
-        return [{"id": course.id, "name": f"{course.name} {course.description}"} for course in await db.get(Course)]
+        return [{"id": course["id"], "name": f"{course['name']} {course['description']}"}
+                for course in await db.select_columns(Course, ["id", "name", "description"])]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.put("/courses/{course_id}", response_model=Course)
@@ -53,7 +58,7 @@ async def update_course(course_id: int, course: Course, db: DatabaseCore = Depen
         if updated_id:
             return course # Return the updated course
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.delete("/courses/{course_id}")
@@ -61,10 +66,12 @@ async def delete_course(course_id: int, db: DatabaseCore = Depends(get_db_core))
     try:
         deleted_count = await db.delete(Course, {"id": course_id})
         if deleted_count:
-            raise HTTPException(status_code=status.HTTP_200_OK, detail= {"message": "Course deleted successfully"})
+            return {"message": "Course deleted successfully"}
         raise HTTPException(status_code=404, detail="Course not found")
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 '''
@@ -96,7 +103,6 @@ class GroupAPI:
         self.router = APIRouter(
             prefix="/groups",
             tags=["Groups"],
-            dependencies=[Depends(get_db_core)],
             responses={404: {"description": "Not found"}},
         )
         self.router.add_api_route("/", self.read_groups, methods=["GET"])
@@ -114,14 +120,14 @@ class GroupAPI:
                 return new_group
             raise HTTPException(status_code=500, detail="Failed to create group")
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise server_error(e)
 
     async def read_groups(self, db: DatabaseCore = Depends(get_db_core)):
         try:
             groups = await db.get(Group)
             return [GroupOut(id=group.id, name=group.name, course_id=group.course_id) for group in groups]
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise server_error(e)
 
     async def read_groups_for_courses(self, db: DatabaseCore = Depends(get_db_core)):
         try:
@@ -131,7 +137,7 @@ class GroupAPI:
                 for group in groups
             ]
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise server_error(e)
 
     async def update_group(self, group_id: int, group: GroupIn, db: DatabaseCore = Depends(get_db_core)):
         try:
@@ -143,7 +149,7 @@ class GroupAPI:
                 return existing_group
             raise HTTPException(status_code=404, detail="Group not found")
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise server_error(e)
 
     async def delete_group(self, group_id: int, db: DatabaseCore = Depends(get_db_core)):
         try:
@@ -152,7 +158,7 @@ class GroupAPI:
                 return {"message": "Group deleted successfully"}
             raise HTTPException(status_code=404, detail="Group not found")
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            raise server_error(e)
 
 # GroupAPI classining instansiyasini yaratish va routerni qo‘shish
 group_api = GroupAPI(db=db_core)
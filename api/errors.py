@@ -0,0 +1,11 @@
+from fastapi import HTTPException
+from LoggerService import LoggerService
+
+# Kutilmagan xatolik matni (SQL, ulanish manzili, ustun nomlari) mijozga chiqmaydi - faqat logga yoziladi
+SERVER_ERROR_MESSAGE = "Internal server error"
+
+
+def server_error(error: Exception) -> HTTPException:
+    """Kutilmagan xatolikni logga yozadi va umumiy 500 javobiga o'giradi."""
+    LoggerService.log_exception(error, "Unhandled API error")
+    return HTTPException(status_code=500, detail=SERVER_ERROR_MESSAGE)
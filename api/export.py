@@ -0,0 +1,45 @@
+from csv import writer
+from io import StringIO
+from json import dumps
+from typing import Any, AsyncIterator, Dict, Sequence
+
+# Bitta tarmoq bo'lagi (chunk) hajmi: har bir qator alohida yuborilmaydi
+CHUNK_SIZE = 64 * 1024
+
+# format -> (media turi, fayl kengaytmasi)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+
+async def ndjson_lines(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Har bir qatorni alohida JSON satriga o'giradi."""
+    async for row in rows:
+        yield dumps(row, ensure_ascii=False, default=str) + "\n"
+
+
+async def csv_lines(rows: AsyncIterator[Dict[str, Any]], header: Sequence[str]) -> AsyncIterator[str]:
+    """Sarlavha va qatorlarni CSV satrlariga o'giradi."""
+    buffer = StringIO()
+    out = writer(buffer)
+    out.writerow(header)
+    async for row in rows:
+        out.writerow([row[key] for key in header])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()  # bo'sh natijada faqat sarlavha
+
+
+async def chunked(lines: AsyncIterator[str], size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Satrlarni taxminan `size` baytlik bo'laklarga yig'adi; xotirada bittadan ortiq bo'lak saqlanmaydi."""
+    parts, length = [], 0
+    async for line in lines:
+        parts.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(parts).encode()
+            parts, length = [], 0
+    if parts:
+        yield "".join(parts).encode()
@@ -0,0 +1,126 @@
+from json import dumps
+from typing import Any, AsyncIterator, Iterable, List, Optional, Sequence
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from DatabaseService import DatabaseCore, Schedule, get_db_core, occupancy_index, timetable_versions, query_cache, \
+    REFERENCE_MODELS
+from FeedService import ChangeEvent, DELETED, INVALIDATE, RESET, FEED_HEARTBEAT, change_bus
+from .grid import GRID_COLUMNS
+
+# Uzoq davom etadigan oqim: unit of work (va uning sessiyasi) kerak emas, shuning uchun UnitOfWorkRoute yo'q
+router = APIRouter(
+    prefix="/api",
+    tags=["Feed"],
+)
+
+# Hodisadagi yozuv: katakni qayta chizish uchun yetarli ustunlar (nomlar bilan)
+FEED_COLUMNS = ["course_id", *GRID_COLUMNS]
+# O'chirilgan yozuvdan hodisaga o'tadigan ustunlar
+DELETED_COLUMNS = ("id", "course_id", "group_id", "day", "time_slot", "teacher_id", "room_id", "subject_id")
+# Brauzer uzilgandan keyin qayta ulanishdan oldin kutadigan vaqt (ms)
+RETRY_MS = 3000
+
+
+async def schedule_events(db: DatabaseCore, kind: str, ids: Sequence[int]) -> List[ChangeEvent]:
+    """Yozilgan (hali commit qilinmagan bo'lishi mumkin) jadval yozuvlari uchun hodisalar - bitta so'rov."""
+    if not ids:
+        return []
+    rows = await db.select_columns(Schedule, FEED_COLUMNS, {"id": {"in": list(ids)}})
+    return [ChangeEvent(kind, row["course_id"], row) for row in rows]
+
+
+def deleted_events(rows: Iterable[Any]) -> List[ChangeEvent]:
+    """`delete_rows` qaytargan qatorlardan `deleted` hodisalari."""
+    return [ChangeEvent(DELETED, row.course_id, {column: getattr(row, column) for column in DELETED_COLUMNS})
+            for row in rows]
+
+
+async def apply_changes(db: DatabaseCore, events: Iterable[ChangeEvent] = (), added: Iterable[Any] = (),
+                        removed: Iterable[int] = (), discarded: Iterable[int] = (),
+                        courses: Iterable[int] = ()) -> None:
+    """
+    Bandlik indeksi (`discarded` kurslar, `removed` va `added` yozuvlar), kurs ETag versiyalari va hodisalarni
+    tranzaksiya commit qilingandan keyin yangilaydi. Bekor qilingan tranzaksiya indeksda iz qoldirmaydi,
+    parallel so'rov esa commitdan oldingi ma'lumotga yangi ETag olmaydi.
+    """
+    events, added, removed = list(events), list(added), list(removed)
+    discarded, courses = list(discarded), set(courses)
+
+    async def apply() -> None:
+        for course_id in discarded:
+            occupancy_index.discard_course(course_id)
+        for schedule_id in removed:
+            occupancy_index.remove(schedule_id)
+        for schedule in added:
+            occupancy_index.add(schedule)
+        await timetable_versions.bump(courses)
+        if events:
+            await change_bus.publish(events)
+
+    await db.after_commit(apply)
+
+
+async def publish_invalidation(namespace: str) -> None:
+    """
+    Jarayon ichidagi (LRU) kesh bekor qilinishini boshqa workerlarga yuboradi: ular `apply_remote_change` da
+    o'z keshlari va ma'lumotnoma ETaglarini eskirtiradi (`query_cache.on_invalidate` orqali ulanadi).
+    """
+    await change_bus.publish([ChangeEvent.invalidate([namespace])])
+
+
+async def apply_remote_change(event: ChangeEvent) -> None:
+    """
+    Boshqa worker yozgan o'zgarishni shu jarayondagi bandlik indeksi, ETag versiyalari va keshga qo'llaydi
+    (`change_bus.on_remote` orqali ulanadi; bitta workerda chaqirilmaydi).
+    """
+    if event.kind == INVALIDATE:
+        for namespace in event.schedule["models"]:
+            await query_cache.invalidate(namespace, notify=False)
+        return
+    if event.kind == RESET:
+        db = await get_db_core()
+        if event.course_id is None and not query_cache.shared:
+            # Shina uzilgan paytdagi bekor qilishlar yo'qolgan bo'lishi mumkin
+            for namespace in {*db.CACHED_MODELS, *REFERENCE_MODELS}:
+                await query_cache.invalidate(namespace, notify=False)
+        await occupancy_index.build(db)
+    elif event.kind == DELETED:
+        occupancy_index.remove(event.schedule["id"])
+    else:
+        occupancy_index.add(Schedule(**{column: event.schedule[column] for column in DELETED_COLUMNS}))
+    if event.course_id is not None:
+        await timetable_versions.bump([event.course_id])
+
+
+def sse_message(event: ChangeEvent) -> str:
+    data = dumps(event.to_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"id: {change_bus.event_id(event)}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+async def event_stream(request: Request, course_id: Optional[int], last_event_id: Optional[str]) -> AsyncIterator[str]:
+    # Obuna takrorlashdan oldin ochiladi: oradagi hodisa yo'qolmaydi (takrorlanishi mumkin, patch idempotent)
+    with change_bus.subscribe(course_id) as subscription:
+        yield f"retry: {RETRY_MS}\n\n"
+        if last_event_id:
+            missed = change_bus.replay(last_event_id, course_id)
+            for event in missed if missed is not None else [ChangeEvent.reset(course_id, reason="resume")]:
+                yield sse_message(event)
+        while not await request.is_disconnected():
+            event = await subscription.get(FEED_HEARTBEAT)
+            # Hodisa bo'lmasa izoh satri: proksilar ulanishni yopmaydi, uzilgan mijoz aniqlanadi
+            yield sse_message(event) if event is not None else ": ping\n\n"
+            if subscription.closed and subscription.queue.empty():
+                break  # worker to'xtamoqda (`change_bus.drain`)
+
+
+@router.get("/schedule/feed")
+async def schedule_feed(request: Request, course_id: Optional[int] = None,
+                        last_event_id: Optional[str] = Header(None)):
+    """
+    Dars jadvali o'zgarishlari oqimi (Server-Sent Events): `created`, `updated`, `deleted` va `reset`.
+    `course_id` berilsa, faqat shu kurs hodisalari (va umumiy `reset`). Qayta ulanishda `Last-Event-ID`
+    bo'yicha o'tkazib yuborilgan hodisalar takrorlanadi; imkon bo'lmasa `reset` yuboriladi.
+    Sekin mijoz navbati to'lsa, u ham `reset` oladi va jadvalni qayta yuklaydi.
+    """
+    return StreamingResponse(event_stream(request, course_id, last_event_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,126 @@
+from json import dumps
+from typing import Any, Dict, List, Optional, Sequence
+from SolverService import DAYS, SLOTS, CELLS, cell_index
+
+try:
+    import orjson
+except ImportError:  # ixtiyoriy: bo'lmasa standart json ishlatiladi
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # ixtiyoriy: bo'lmasa faqat JSON beriladi
+    msgpack = None
+
+# Katakda dars yo'qligini bildiradi (lug'at indekslari 0 dan boshlanadi)
+EMPTY = -1
+
+# format -> media turi
+GRID_FORMATS = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# Setka uchun ustunlar: nomlar har bir katakda takrorlanmaydi, lug'atlarga bir marta yoziladi
+GRID_COLUMNS = ["id", "day", "time_slot", "group_id", "subject_id", "subject.name", "subject.subject_type",
+                "teacher_id", "teacher.name", "room_id", "room.name"]
+
+
+class Interner:
+    """Identifikatorlarni ketma-ket indekslarga o'giradi va {id: [...], name: [...]} lug'atini yig'adi."""
+
+    def __init__(self):
+        self.index: Dict[int, int] = {}
+        self.ids: List[int] = []
+        self.names: List[str] = []
+
+    def __call__(self, record_id: Optional[int], name: Optional[str]) -> int:
+        if record_id is None:
+            return EMPTY
+        position = self.index.get(record_id)
+        if position is None:
+            position = self.index[record_id] = len(self.ids)
+            self.ids.append(record_id)
+            self.names.append(name)
+        return position
+
+    def as_dict(self) -> Dict[str, list]:
+        return {"id": self.ids, "name": self.names}
+
+
+def build_grid(course_id: int, groups: Sequence[Dict[str, Any]], rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Kurs jadvalini ustunli (columnar) ko'rinishga o'giradi.
+    Tekis massivlar `(kun, dars vaqti, guruh)` bo'yicha indekslanadi:
+    `i = cell_index(day, time_slot) * len(groups.id) + guruh o'rni`; qiymat - lug'atdagi indeks yoki -1.
+    :param groups: Kurs guruhlari (`id`, `name`) - ustunlar tartibi shu.
+    :param rows: `GRID_COLUMNS` bo'yicha olingan jadval qatorlari.
+    """
+    group_of, subject_of, teacher_of, room_of = Interner(), Interner(), Interner(), Interner()
+    for group in groups:
+        group_of(group["id"], group["name"])
+    # Boshqa kurs guruhiga yozilgan dars bo'lsa ham setkaga tushishi uchun guruhlar avval to'ldiriladi
+    for row in rows:
+        group_of(row["group_id"], None)
+
+    size = CELLS * len(group_of.ids)
+    schedule_ids = [0] * size
+    subjects, teachers, rooms = [EMPTY] * size, [EMPTY] * size, [EMPTY] * size
+    width = len(group_of.ids)
+    for row in rows:
+        position = cell_index(row["day"], row["time_slot"]) * width + group_of.index[row["group_id"]]
+        schedule_ids[position] = row["id"]
+        subjects[position] = subject_of(row["subject_id"], f"{row['subject_name']} {row['subject_subject_type']}")
+        teachers[position] = teacher_of(row["teacher_id"], row["teacher_name"])
+        rooms[position] = room_of(row["room_id"], row["room_name"])
+
+    return {
+        "course_id": course_id,
+        "days": DAYS,
+        "slots": SLOTS,
+        "groups": group_of.as_dict(),
+        "subjects": subject_of.as_dict(),
+        "teachers": teacher_of.as_dict(),
+        "rooms": room_of.as_dict(),
+        "cells": {"schedule_id": schedule_ids, "subject": subjects, "teacher": teachers, "room": rooms},
+    }
+
+
+def negotiate(accept: Optional[str], format: Optional[str] = None) -> str:
+    """
+    Javob formatini tanlaydi: `?format=` ustun, keyin `Accept` sarlavhasi (q qiymatlari hisobga olinadi).
+    msgpack o'rnatilmagan bo'lsa doim JSON.
+    """
+    if format:
+        if format not in GRID_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        return format if format != "msgpack" or msgpack is not None else "json"
+    if msgpack is None or not accept:
+        return "json"
+    best, best_q = "json", 0.0
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidate = "msgpack" if media_type.lower() in MSGPACK_MEDIA_TYPES else "json" \
+            if media_type.lower() in ("application/json", "application/*", "*/*") else None
+        # Teng q da JSON afzal: brauzerlar */* yuboradi
+        if candidate and (quality > best_q or (quality == best_q and candidate == "json")):
+            best, best_q = candidate, quality
+    return best
+
+
+def encode(payload: Dict[str, Any], format: str) -> bytes:
+    """Setkani tanlangan formatga seriyalaydi (orjson/msgpack bo'lsa, ular orqali)."""
+    if format == "msgpack":
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from typing import Optional
+from .errors import server_error
+from .pagination import PageParams, fetch_page
 from DatabaseService import Course, Group, get_db_core, DatabaseCore
+from .transaction import UnitOfWorkRoute
 
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Groups"],
-    dependencies=[Depends(get_db_core)],
     responses={404: {"description": "Not found"}},
 )
 
@@ -19,28 +23,44 @@ async def create_group(group: Group, db: DatabaseCore = Depends(get_db_core)):
             group.id = group_id
             return group
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/courses/for/groups", operation_id="read_courses_for_groups")
 async def read_courses(db: DatabaseCore = Depends(get_db_core)):
     try:
         raise HTTPException(status_code=status.HTTP_200_OK,
-                            detail=[{"id": course.id, "name": f"{course.name} {course.description}"} for course in
-                                    await db.get(Course)])
+                            detail=[{"id": course["id"], "name": f"{course['name']} {course['description']}"}
+                                    for course in await db.select_columns(Course, ["id", "name", "description"])])
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/groups/")
-async def read_groups(db: DatabaseCore = Depends(get_db_core)):
+async def read_groups(request: Request, response: Response, page: PageParams = Depends(),
+                      course_id: Optional[int] = None, db: DatabaseCore = Depends(get_db_core)):
     try:
-        groups = await db.get(Group)  # Guruhlar ro'yxati
-        courses = {course.id: f"{course.name} {course.description}" for course in
-                   await db.get(Course)}  # Kurslarni lug'atga o'girish
+        # Guruhlar kurs nomi bilan bitta JOIN so'rovida, sahifalab olinadi
+        groups = await fetch_page(db, Group, ["name", "course.name", "course.description"], page, request, response,
+                                  filters={"course_id": course_id})
+        return [{"name": group["name"],
+                 "course_id": f"{group['course_name']} {group['course_description']}"
+                 if group["course_name"] is not None else "Noma'lum"}
+                for group in groups]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
 
-        # Kurs nomini guruhlarga qo'shib chiqamiz
-        return [{"name": group.name, "course_id": courses.get(group.course_id, "Noma'lum")}
-                                    for group in groups]
+@router.delete("/groups/{group_id}")
+async def delete_group(group_id: int, db: DatabaseCore = Depends(get_db_core)):
+    try:
+        deleted_count = await db.delete(Group, {"id": group_id})
+        if deleted_count:
+            return {"message": "Group deleted successfully"}
+        raise HTTPException(status_code=404, detail="Group not found")
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
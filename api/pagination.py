@@ -0,0 +1,66 @@
+from DatabaseService import DatabaseCore, PAGE_SIZE_DEFAULT
+from fastapi import HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+from sqlmodel import SQLModel
+
+
+class PageParams:
+    """Ro'yxat endpointlari uchun umumiy keyset sahifalash, saralash va `id` oralig'i parametrlari."""
+
+    def __init__(
+            self,
+            sort: str = Query("id", description="Saralash ustuni; '-' prefiksi kamayish tartibi"),
+            cursor: Optional[str] = Query(None, description="Oldingi javobning X-Next-Cursor sarlavhasi"),
+            after_id: Optional[int] = Query(None, description="Shu id dan keyingi yozuvlar (faqat sort=id)"),
+            limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, description="Sahifa hajmi (PAGE_SIZE_MAX bilan cheklanadi)"),
+            id_from: Optional[int] = Query(None, description="id >= id_from"),
+            id_to: Optional[int] = Query(None, description="id <= id_to"),
+    ):
+        self.sort = sort
+        self.cursor = cursor
+        self.after_id = after_id
+        self.limit = limit
+        self.id_from = id_from
+        self.id_to = id_to
+
+    def filters(self) -> Dict[str, Any]:
+        id_range = {}
+        if self.id_from is not None:
+            id_range["gte"] = self.id_from
+        if self.id_to is not None:
+            id_range["lte"] = self.id_to
+        return {"id": id_range} if id_range else {}
+
+
+async def fetch_page(
+        db: DatabaseCore,
+        model: Type[SQLModel],
+        columns: Union[Sequence[str], Dict[str, str]],
+        page: PageParams,
+        request: Request,
+        response: Response,
+        sorts: Sequence[str] = ("id", "name"),
+        filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Bitta sahifani o'qiydi. Keyingi sahifa kursori `X-Next-Cursor` va `Link` sarlavhalarida
+    qaytariladi, javob tanasi esa avvalgidek oddiy ro'yxat bo'lib qoladi.
+    """
+    if page.sort.lstrip("-") not in sorts:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort field: {page.sort}")
+    cursor = page.cursor
+    if page.after_id is not None:
+        if page.sort != "id":
+            raise HTTPException(status_code=400, detail="after_id can only be used with sort=id")
+        cursor = db.encode_cursor("id", [page.after_id])
+
+    conditions = {**page.filters(), **{key: value for key, value in (filters or {}).items() if value is not None}}
+    try:
+        rows, next_cursor = await db.select_page(model, columns, conditions, page.sort, cursor, page.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return rows
@@ -1,49 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from DatabaseService import Room, get_db_core, DatabaseCore
-from typing import List
+from typing import List, Optional
+from .errors import server_error
+from .pagination import PageParams, fetch_page
+from .transaction import UnitOfWorkRoute
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Rooms"],
-    dependencies=[Depends(get_db_core)],
     responses={404: {"description": "Not found"}},
 )
 
+# `response_model=List[Room]`: loyihalash modelning barcha ustunlarini qamrashi kerak, aks holda tushib qolgan
+# maydonlar (niqob, vaqtlar) javobda sukut qiymatlari bilan chiqadi
+ROOM_COLUMNS = ["id", "name", "roomstype", "unavailable", "created_at", "updated_at"]
+
 
 @router.get("/rooms/", response_model=List[Room])
-async def read_rooms(db: DatabaseCore = Depends(get_db_core)):
-    return await db.get(Room)
+async def read_rooms(request: Request, response: Response, page: PageParams = Depends(),
+                     roomstype: Optional[str] = None, db: DatabaseCore = Depends(get_db_core)):
+    return await fetch_page(db, Room, ROOM_COLUMNS, page, request, response,
+                            sorts=("id", "name", "roomstype"), filters={"roomstype": roomstype})
 
 
 @router.post("/rooms/")
 async def create_room(room: Room, db: DatabaseCore = Depends(get_db_core)):
     try:
-        rooms = await db.add(room)
-        if rooms:
-            rooms.id = rooms
-            return rooms
-        raise HTTPException(status_code=500, detail="Teacher creation failed")
+        # Band kataklar faqat /availability endpointlari orqali (tekshirilgan niqob bilan) o'zgaradi
+        room.unavailable = 0
+        room_id = await db.add(room)
+        if room_id:
+            room.id = room_id
+            return room
+        raise HTTPException(status_code=500, detail="Room creation failed")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/rooms/{room_id}", response_model=Room)
 async def read_room(room_id: int, db: DatabaseCore = Depends(get_db_core)):
     try:
-        room = await db.get(Room, {"id": room_id})
-        if room:
-            return room
+        rooms = await db.get(Room, {"id": room_id})
+        if rooms:
+            return rooms[0]
         raise HTTPException(status_code=404, detail="Room not found")
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
-@router.delete("/teachers/{id}")
-async def delete_teacher(id: int, db: DatabaseCore = Depends(get_db_core)):
+@router.delete("/rooms/{id}")
+async def delete_room(id: int, db: DatabaseCore = Depends(get_db_core)):
     try:
         deleted_count = await db.delete(Room, {"id": id})
         if deleted_count:
             return {"message": "Room deleted successfully"}
         raise HTTPException(status_code=404, detail="Room not found")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
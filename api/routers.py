@@ -5,6 +5,10 @@ from .subject import router as subject_router
 from .teachers import router as teachers_router
 from .rooms_api import router as rooms_router
 from .schedules import router as schedules_router
+from .feed import router as feed_router
+from .unavailability import router as unavailability_router
+from .changes import router as changes_router
+from .system import router as system_router, root_router as system_root_router
 
 router = APIRouter()
 
@@ -13,6 +17,12 @@ router.include_router(groups_router)
 router.include_router(subject_router)
 router.include_router(teachers_router)
 router.include_router(rooms_router)
+# `/schedule/feed` `/schedule/{course_id}` dan oldin ro'yxatga olinadi
+router.include_router(feed_router)
 router.include_router(schedules_router)
+router.include_router(unavailability_router)
+router.include_router(changes_router)
+router.include_router(system_router)
+router.include_router(system_root_router)
 
 __all__ = ["router"]
\ No newline at end of file
@@ -1,24 +1,104 @@
-from DatabaseService import DatabaseCore, get_db_core, Subject, Group, Schedule, Teacher, Room
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+from DatabaseService import DatabaseCore, get_db_core, Subject, Group, Schedule, Teacher, Room, occupancy_index, \
+    ConflictError, RepairRequest, timetable_versions
+from SolverService import CELLS, FULL_MASK, DAYS, SLOTS, TimetableRepair, TimetableSolver, cell_bit, cell_index, \
+    load_course_problem, load_repair_problem
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from .export import EXPORT_FORMATS, chunked, csv_lines, ndjson_lines
+from .grid import GRID_COLUMNS, GRID_FORMATS, build_grid, encode, negotiate
+from .availability import build_availability, busy_from_groups
+from .errors import server_error
+from .feed import apply_changes, deleted_events, schedule_events
+from .unavailability import blocked_bookings
+from FeedService import ChangeEvent, CREATED, UPDATED
+from typing import List, Dict, Any, Optional
+from .transaction import UnitOfWorkRoute
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Schedules"],
-    dependencies=[Depends(get_db_core)],
-    responses={404: {"description": "Not found"}},
+    responses={404: {"description": "Not found"}, 409: {"description": "Conflict"}},
 )
 
+# Ma'lumotlar bazasi cheklovlari nomlari -> foydalanuvchiga xabar
+CONFLICT_MESSAGES = {
+    "uq_schedules_group_slot": "Guruh bu vaqtda boshqa darsda band",
+    "ex_schedules_teacher_slot": "O'qituvchi bu vaqtda boshqa xonada band",
+    "ex_schedules_room_slot": "Xona bu vaqtda boshqa o'qituvchi bilan band",
+}
+UNAVAILABLE_MESSAGE = "O'qituvchi yoki xona bu vaqtda dars o'ta olmaydi"
+
+# Jadval tuzuvchi thread havzasida ishlaydi: bitta so'rov uni (va workerni) cheksiz band qilmasin
+GENERATE_TIME_LIMIT_MAX = 30.0
+# Tuzatish siqib chiqarish zanjiri bo'yicha eksponensial: chuqurlik va vaqt ham cheklanadi
+REPAIR_DEPTH_MAX = 4
+REPAIR_TIME_LIMIT_MAX = 5.0
+
+
+def conflict_exception(error: ConflictError) -> HTTPException:
+    """Cheklov buzilishini 409 javobiga o'giradi."""
+    return HTTPException(status_code=409, detail=CONFLICT_MESSAGES.get(error.constraint, "Dars jadvalida to'qnashuv"))
+
+
+# Dars jadvali jadvali uchun ustunlar (munosabatlar LEFT JOIN orqali)
+TABLE_COLUMNS = ["id", "day", "time_slot", "group_id", "group.name", "course_id", "course.name",
+                 "subject_id", "subject.name", "subject.subject_type", "teacher_id", "teacher.name",
+                 "room_id", "room.name"]
+
+
+def table_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    """`TABLE_COLUMNS` qatorini front-end kutadigan ichma-ich ko'rinishga o'giradi."""
+    return {
+        "id": row["id"],
+        "group": {"id": row["group_id"], "name": row["group_name"]},
+        "course": {"id": row["course_id"], "name": row["course_name"]},
+        "subject": {"id": row["subject_id"], "name": f"{row['subject_name']} {row['subject_subject_type']}"},
+        "teacher": {"id": row["teacher_id"], "name": row["teacher_name"]},
+        "room": {"id": row["room_id"], "name": row["room_name"]},
+        "day": row["day"],
+        "time_slot": row["time_slot"],
+    }
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """`If-None-Match` sarlavhasi joriy ETagga mos keladimi."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in header.split(","))
+
+
+# `/schedule/{course_id}` dan oldin e'lon qilinadi, aks holda "export" kurs identifikatori deb olinadi
+@router.get("/schedule/export")
+async def export_schedules(format: str = "ndjson", course_id: Optional[int] = None,
+                           db: DatabaseCore = Depends(get_db_core)):
+    """
+    Dars jadvalini (barcha kurslar yoki bitta kurs) NDJSON yoki CSV ko'rinishida oqim bilan eksport qiladi.
+    Qatorlar server tomonidagi kursordan kelishi bilan yoziladi, shuning uchun xotira sarfi jadval hajmiga bog'liq emas.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    media_type, extension = EXPORT_FORMATS[format]
+    filters = {"course_id": course_id} if course_id is not None else None
+    rows = db.stream_columns(Schedule, TABLE_COLUMNS, filters, order_by=["course_id", "group_id", "day", "time_slot"])
+    header = [path.replace(".", "_") for path in TABLE_COLUMNS]
+    lines = csv_lines(rows, header) if format == "csv" else ndjson_lines(rows)
+    filename = f"schedule-{course_id}.{extension}" if course_id is not None else f"schedule.{extension}"
+    return StreamingResponse(chunked(lines), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
 
 @router.get("/schedule/{course_id}")
 async def get_groups_by_course(course_id: int, db: DatabaseCore = Depends(get_db_core)):
     try:
-        groups = await db.get(Group, {"course_id": course_id})
+        groups = await db.select_columns(Group, ["id", "name"], {"course_id": course_id})
         if not groups:
             raise HTTPException(status_code=404, detail="No groups found for this course")
-        return [{"id": group.id, "name": group.name} for group in groups]
+        return groups
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/available-teachers/")
@@ -27,19 +107,29 @@ async def get_available_teachers(day: int, time_slot: int, db: DatabaseCore = De
     Tanlangan `day` va `time_slot` uchun bo'sh o'qituvchilar ro'yxatini qaytaradi.
     """
     try:
-        # Band bo'lgan o'qituvchilarni olish
-        occupied_teachers = await db.get_for_schedule(Schedule, filters={"day": day, "time_slot": time_slot})
-        occupied_teacher_ids = {schedule.teacher_id for schedule in occupied_teachers}
-
-        # Band bo'lmagan o'qituvchilarni olish
-        available_teachers = await db.get_for_schedule(Teacher, filters={"id": {"not_in": list(occupied_teacher_ids)}})
+        # O'qituvchi shu katakda mavjud emas deb belgilanmagan: SQLda bitta `unavailable & bit = 0`
+        unavailable = {"unavailable": {"bits_clear": cell_bit(day, time_slot)}}
+        if occupancy_index.ready:
+            # Bandlik xotiradagi indeksdan olinadi
+            busy = occupancy_index.busy("teacher", day, time_slot)
+            available_teachers = [teacher for teacher in await db.select_columns(Teacher, ["id", "name"], unavailable)
+                                  if not busy >> teacher["id"] & 1]
+        else:
+            # Band bo'lgan o'qituvchilarni olish
+            occupied_teachers = await db.get_for_schedule(Schedule, filters={"day": day, "time_slot": time_slot})
+            occupied_teacher_ids = {schedule.teacher_id for schedule in occupied_teachers}
+
+            # Band bo'lmagan o'qituvchilarni olish
+            available_teachers = await db.select_columns(Teacher, ["id", "name"],
+                                                         filters={"id": {"not_in": list(occupied_teacher_ids)},
+                                                                  **unavailable})
 
         if not available_teachers:
             return {"message": "No available teachers for the selected day and time slot"}
 
-        return [{"id": teacher.id, "name": teacher.name} for teacher in available_teachers]
+        return available_teachers
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/available-rooms/")
@@ -48,65 +138,275 @@ async def get_available_rooms(day: int, time_slot: int, db: DatabaseCore = Depen
     Tanlangan `day` va `time_slot` uchun bo'sh xonalar ro'yxatini qaytaradi.
     """
     try:
-        # Band bo'lgan xonalarni olish
-        occupied_rooms = await db.get_for_schedule(Schedule, filters={"day": day, "time_slot": time_slot})
-        occupied_room_ids = {schedule.room_id for schedule in occupied_rooms}
-
-        # Band bo'lmagan xonalarni olish
-        available_rooms = await db.get_for_schedule(Room, filters={"id": {"not_in": list(occupied_room_ids)}})
+        unavailable = {"unavailable": {"bits_clear": cell_bit(day, time_slot)}}
+        if occupancy_index.ready:
+            # Bandlik xotiradagi indeksdan olinadi
+            busy = occupancy_index.busy("room", day, time_slot)
+            available_rooms = [room for room in await db.select_columns(Room, ["id", "name", "roomstype"], unavailable)
+                               if not busy >> room["id"] & 1]
+        else:
+            # Band bo'lgan xonalarni olish
+            occupied_rooms = await db.get_for_schedule(Schedule, filters={"day": day, "time_slot": time_slot})
+            occupied_room_ids = {schedule.room_id for schedule in occupied_rooms}
+
+            # Band bo'lmagan xonalarni olish
+            available_rooms = await db.select_columns(Room, ["id", "name", "roomstype"],
+                                                      filters={"id": {"not_in": list(occupied_room_ids)},
+                                                               **unavailable})
 
         if not available_rooms:
             return {"message": "No available rooms for the selected day and time slot"}
 
-        return [{"id": room.id, "name": f"{room.name} {room.roomstype}"} for room in available_rooms]
+        return [{"id": room["id"], "name": f"{room['name']} {room['roomstype']}"} for room in available_rooms]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
+
+
+@router.get("/schedule/availability/{course_id}", responses={200: {"content": {"application/msgpack": {}}}})
+async def get_availability(course_id: int, request: Request, format: Optional[str] = None,
+                           db: DatabaseCore = Depends(get_db_core)):
+    """
+    Kursning barcha (day, time_slot) kataklari uchun bo'sh o'qituvchi, xona va guruhlar - bitta javobda.
+    Bandlik xotiradagi indeksdan yoki bitta `GROUP BY` so'rovidan olinadi; natija bitmaplar
+    (tuzilishi: `api/availability.py`), shuning uchun mijoz har bir katak uchun so'rov yubormaydi.
+    """
+    try:
+        fmt = negotiate(request.headers.get("accept"), format)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    try:
+        if occupancy_index.ready:
+            busy = occupancy_index.matrix()
+        else:
+            busy = busy_from_groups(await db.group_ids(Schedule, ["day", "time_slot"],
+                                                       ["teacher_id", "room_id", "group_id"]))
+        rooms = await db.select_columns(Room, ["id", "name", "roomstype", "unavailable"], order_by=["id"])
+        entities = {
+            "teacher": await db.select_columns(Teacher, ["id", "name", "unavailable"], order_by=["id"]),
+            "room": [{"id": room["id"], "name": f"{room['name']} {room['roomstype']}",
+                      "unavailable": room["unavailable"]} for room in rooms],
+            "group": await db.select_columns(Group, ["id", "name"], {"course_id": course_id}, order_by=["id"]),
+        }
+        content = encode(build_availability(course_id, busy, entities), fmt)
+        return Response(content=content, media_type=GRID_FORMATS[fmt],
+                        headers={"Cache-Control": "no-store", "Vary": "Accept"})
+    except Exception as e:
+        raise server_error(e)
 
 
 @router.get("/schedule/subjects/{course_id}", response_model=List[dict])
 async def read_subjects(course_id: int, db: DatabaseCore = Depends(get_db_core)):
     try:
         return [
-            {"id": subject.id, "name": f"{subject.name} {subject.subject_type}", "subject_type": subject.subject_type,
-             "course_name": subject.course_name}
-            for subject in await db.get(Subject, filters={"course_id": f"{course_id}"})]
+            {"id": subject["id"], "name": f"{subject['name']} {subject['subject_type']}",
+             "subject_type": subject["subject_type"], "course_name": subject["course_name"]}
+            for subject in await db.select_columns(Subject, ["id", "name", "subject_type", "course_name"],
+                                                   filters={"course_id": f"{course_id}"})]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.get("/schedule/table/{course_id}")
-async def get_schedule_table(course_id: int, db: DatabaseCore = Depends(get_db_core)):
+async def get_schedule_table(course_id: int, request: Request, response: Response,
+                             db: DatabaseCore = Depends(get_db_core)):
+    """
+    Kurs dars jadvali. Jadval o'zgarmagan bo'lsa (`If-None-Match` joriy ETagga teng),
+    ma'lumotlar bazasiga murojaat qilinmasdan 304 qaytariladi.
+    """
     try:
-        relationships = ["group", "course", "subject", "teacher", "room"]
-        schedules = await db.get_table(Schedule, {"course_id": course_id}, relationships=relationships)
-        return [
-            {
-                "id": schedule.id,
-                "group": {"id": schedule.group_id, "name": schedule.group.name},
-                "course": {"id": schedule.course_id, "name": schedule.course.name},
-                "subject": {"id": schedule.subject_id,
-                            "name": f"{schedule.subject.name} {schedule.subject.subject_type}"},
-                "teacher": {"id": schedule.teacher_id, "name": schedule.teacher.name},
-                "room": {"id": schedule.room_id, "name": schedule.room.name},
-                "day": schedule.day,
-                "time_slot": schedule.time_slot,
-            }
-            for schedule in schedules]
+        # ETag ma'lumotlar o'qilishidan oldin olinadi - parallel yozuv bo'lsa keyingi so'rov 200 oladi
+        etag = await timetable_versions.etag(course_id)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+
+        # Bitta JOIN so'rovi: faqat kerakli ustunlar, ORM ob'ektlarisiz
+        rows = await db.select_columns(Schedule, TABLE_COLUMNS, {"course_id": course_id})
+        return [table_item(row) for row in rows]
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
+
+
+@router.get("/schedule/grid/{course_id}", responses={200: {"content": {"application/msgpack": {}}}})
+async def get_schedule_grid(course_id: int, request: Request, format: Optional[str] = None,
+                            db: DatabaseCore = Depends(get_db_core)):
+    """
+    Kurs dars jadvali ustunli setka ko'rinishida: har bir tur uchun nomlar lug'ati va
+    `(kun, dars vaqti, guruh)` bo'yicha tekis indeks massivlari (tuzilishi: `api/grid.py`).
+    Format `Accept: application/msgpack` yoki `?format=msgpack|json` bilan tanlanadi.
+    """
+    try:
+        fmt = negotiate(request.headers.get("accept"), format)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    try:
+        # Har bir format alohida ko'rinish: ETag ham formatga bog'liq
+        etag = (await timetable_versions.etag(course_id))[:-1] + f'-{fmt}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        groups = await db.select_columns(Group, ["id", "name"], {"course_id": course_id}, order_by=["id"])
+        rows = await db.select_columns(Schedule, GRID_COLUMNS, {"course_id": course_id})
+        content = encode(build_grid(course_id, groups, rows), fmt)
+        return Response(content=content, media_type=GRID_FORMATS[fmt], headers=headers)
+    except Exception as e:
+        raise server_error(e)
 
 
 @router.post("/schedule/")
 async def create_schedule(schedule: List[Schedule], db: DatabaseCore = Depends(get_db_core)):
+    """
+    Dars jadvali yozuvlarini bitta tranzaksiyada qo'shadi (yo hammasi, yo hech biri).
+    Identifikatorlar yuborilgan tartibda qaytariladi.
+    """
     try:
-        added_ids = []
-        for sched in schedule:
-            schedule_id = await db.add(sched)
-            added_ids.append(schedule_id)
+        if await blocked_bookings(db, schedule):
+            raise HTTPException(status_code=409, detail=UNAVAILABLE_MESSAGE)
+        added_ids = await db.add_all(schedule)
+        await apply_changes(db, await schedule_events(db, CREATED, added_ids), added=schedule,
+                            courses=(sched.course_id for sched in schedule))
         return added_ids  # Return a list of IDs
+    except HTTPException as he:
+        raise he
+    except ConflictError as ce:
+        raise conflict_exception(ce)
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.post("/schedule/generate/{course_id}")
+async def generate_schedule(
+        course_id: int,
+        apply: bool = False,
+        lessons_per_subject: int = Query(1, ge=1, le=CELLS),
+        time_limit: float = Query(5.0, gt=0, le=GENERATE_TIME_LIMIT_MAX),
+        seed: int = 0,
+        db: DatabaseCore = Depends(get_db_core)
+):
+    """
+    Kurs uchun to'liq, to'qnashuvsiz dars jadvalini avtomatik tuzadi.
+
+    Parameters:
+    - course_id: Kurs identifikatori
+    - apply: True bo'lsa, kursning mavjud jadvali yangi yechim bilan almashtiriladi
+    - lessons_per_subject: Har bir guruhda har bir fan uchun haftalik darslar soni (1..CELLS)
+    - time_limit: Lokal qidiruv uchun vaqt chegarasi (soniya, GENERATE_TIME_LIMIT_MAX gacha)
+    - seed: Tasodifiy qidiruv urug'i
+
+    Returns:
+    - Taklif qilingan jadval, joylashmay qolgan darslar va (apply bo'lsa) saqlangan identifikatorlar
+    """
+    try:
+        # Yechim uzoq davom etadi: masala qisqa o'qish blokida yuklanadi, so'rov tranzaksiyasi faqat saqlashda ochiladi
+        async with db.read_scope():
+            lessons, teacher_busy, room_busy = await load_course_problem(db, course_id, lessons_per_subject)
+        if not lessons:
+            raise HTTPException(status_code=404, detail="No groups or subjects found for this course")
+
+        solver = TimetableSolver(lessons, teacher_busy=teacher_busy, room_busy=room_busy,
+                                 time_limit=time_limit, seed=seed)
+        result = await run_in_threadpool(solver.solve)
+        schedule = [placement.to_dict() for placement in result.placements]
+
+        added_ids = []
+        if apply:
+            instances = [Schedule(course_id=course_id, **item) for item in schedule]
+            added_ids = await db.replace(Schedule, {"course_id": course_id}, instances)
+            # Butun kurs almashdi: alohida hodisalar o'rniga bitta `reset`
+            await apply_changes(db, [ChangeEvent.reset(course_id, reason="generate")], added=instances,
+                                discarded=[course_id], courses=[course_id])
+        return {
+            "complete": result.is_complete,
+            "elapsed": round(result.elapsed, 4),
+            "iterations": result.iterations,
+            "schedule": schedule,
+            "unplaced": [{"group_id": lesson.group_id, "subject_id": lesson.subject_id} for lesson in result.unplaced],
+            "added_ids": added_ids,
+        }
+    except HTTPException as he:
+        raise he
+    except ConflictError as ce:
+        raise conflict_exception(ce)
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.post("/schedule/repair")
+async def repair_schedule(
+        change: RepairRequest,
+        apply: bool = False,
+        drop_unresolved: bool = False,
+        max_depth: int = Query(2, ge=0, le=REPAIR_DEPTH_MAX),
+        time_limit: float = Query(0.05, gt=0, le=REPAIR_TIME_LIMIT_MAX),
+        db: DatabaseCore = Depends(get_db_core)
+):
+    """
+    O'zgarishdan keyin (o'qituvchi kunlarda band bo'ldi, xona olib tashlandi) jadvalni lokal tuzatadi:
+    butun kurs qayta tuzilmaydi, imkon qadar kam yozuv ko'chiriladi.
+
+    Parameters:
+    - change: O'qituvchi (va kunlar) va/yoki xona
+    - apply: True bo'lsa, ko'chirishlar bitta tranzaksiyada saqlanadi
+    - drop_unresolved: True bo'lsa (apply bilan), joy topilmagan yozuvlar o'chiriladi
+    - max_depth: Siqib chiqarish zanjiri chuqurligi (0..REPAIR_DEPTH_MAX)
+    - time_limit: Qidiruv uchun vaqt chegarasi (soniya, REPAIR_TIME_LIMIT_MAX gacha)
+
+    Returns:
+    - Ko'chirishlar (`from` -> `to`), joy topilmagan yozuvlar va (apply bo'lsa) saqlanganlar soni
+    """
+    if change.teacher_id is None and change.room_id is None:
+        raise HTTPException(status_code=400, detail="teacher_id yoki room_id berilishi kerak")
+    if change.days and not all(1 <= day <= DAYS for day in change.days):
+        raise HTTPException(status_code=400, detail=f"Kun 1..{DAYS} oralig'ida bo'lishi kerak")
+    try:
+        teacher_blocked, room_blocked = {}, {}
+        if change.teacher_id is not None:
+            teacher_blocked[change.teacher_id] = FULL_MASK if not change.days else sum(
+                1 << cell_index(day, time_slot) for day in set(change.days) for time_slot in range(1, SLOTS + 1))
+        if change.room_id is not None:
+            room_blocked[change.room_id] = FULL_MASK
+
+        async with db.read_scope():
+            bookings, candidates, teacher_busy, room_busy = await load_repair_problem(db, teacher_blocked,
+                                                                                      room_blocked)
+        repair = TimetableRepair(bookings, candidates, teacher_blocked, room_blocked, teacher_busy, room_busy,
+                                 max_depth=max_depth, time_limit=time_limit)
+        result = await run_in_threadpool(repair.solve)
+        moves = [move.to_dict() for move in result.moves]
+
+        moved, dropped = [], []
+        if apply:
+            values = {move["id"]: move["to"] for move in moves}
+            previous = await db.rewrite_rows(Schedule, values)
+            # Taklifdan keyin jadval o'zgargan bo'lsa, tranzaksiya bekor qilinadi
+            expected = {move["id"]: move["from"] for move in moves}
+            if len(previous) != len(moves) or any(
+                    {key: getattr(row, key) for key in expected[row.id]} != expected[row.id] for row in previous):
+                raise ConflictError()
+            moved = [row.id for row in previous]
+            if drop_unresolved and result.unresolved:
+                dropped = await db.delete_rows(Schedule, {"id": {"in": [booking.id for booking in result.unresolved]}})
+            await apply_changes(db, await schedule_events(db, UPDATED, moved) + deleted_events(dropped),
+                                added=[Schedule(**{**row._mapping, **values[row.id]}) for row in previous],
+                                removed=[row.id for row in dropped],
+                                courses=[row.course_id for row in [*previous, *dropped]])
+        return {
+            "complete": result.is_complete,
+            "elapsed": round(result.elapsed, 4),
+            "nodes": result.nodes,
+            "moves": moves,
+            "unresolved": [{"id": booking.id, "course_id": booking.course_id, "group_id": booking.group_id,
+                            **booking.placement()} for booking in result.unresolved],
+            "moved": len(moved),
+            "dropped": len(dropped),
+        }
+    except ConflictError as ce:
+        raise conflict_exception(ce)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.put("/schedule/{schedule_id}")
@@ -127,14 +427,6 @@ async def update_schedule(
     - Yangilangan jadval identifikatori
     """
     try:
-        # Ma'lumotlar bazasidan jadvalni olish
-        existing_schedules = await db.get(Schedule, filters={"id": schedule_id})
-
-        if not existing_schedules:
-            raise HTTPException(status_code=404, detail=f"ID {schedule_id} ga ega jadval topilmadi")
-
-        schedule_instance = existing_schedules[0]  # Birinchi natija
-
         # Yangi ma'lumotlarni filtrlash
         allowed_fields = {"room_id", "teacher_id", "subject_id"}
         update_data = {key: value for key, value in updated_data.items() if key in allowed_fields}
@@ -142,27 +434,72 @@ async def update_schedule(
         if not update_data:
             raise HTTPException(status_code=400, detail="Yangilash uchun hech qanday ma'lumot berilmagan")
 
-        # Jadvalni yangilash
-        schedule_instance.update_from_dict(update_data)
+        # Bitta UPDATE ... RETURNING so'rovi bilan yangilash; oldingi kurs ham qaytadi (ikkala ETag eskiradi)
+        updated = await db.update_fields(Schedule, schedule_id, update_data, previous=["course_id"])
+
+        if updated is None:
+            raise HTTPException(status_code=404, detail=f"ID {schedule_id} ga ega jadval topilmadi")
+        if await blocked_bookings(db, [updated]):
+            raise HTTPException(status_code=409, detail=UNAVAILABLE_MESSAGE)  # unit of work bekor qilinadi
 
-        # DatabaseService1.update funksiyasidan foydalanib yangilash
-        updated_id = await db.update(schedule_instance)
+        await apply_changes(db, await schedule_events(db, UPDATED, [updated.id]), added=[updated],
+                            courses={updated.previous_course_id, updated.course_id})
 
         return {
             "message": "Dars jadvali muvaffaqiyatli yangilandi",
-            "updated_id": updated_id
+            "updated_id": updated.id,
+            "schedule": {key: value for key, value in updated._mapping.items() if key != "previous_course_id"}
         }
 
     except HTTPException as he:
         raise he
+    except ConflictError as ce:
+        raise conflict_exception(ce)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Jadval yangilashda xatolik: {str(e)}")
+        raise server_error(e)
 
 
 @router.delete("/schedule/{schedule_id}")
 async def delete_schedule(schedule_id: int, db: DatabaseCore = Depends(get_db_core)):
     try:
-        await db.delete(Schedule, {"id": schedule_id})
-        return {"message": "Dars jadvali muvaffaqiyatli o'chirildi"}
+        deleted = await db.delete_rows(Schedule, {"id": schedule_id})
+        await apply_changes(db, deleted_events(deleted), removed=[row.id for row in deleted],
+                            courses=[row.course_id for row in deleted])
+        return {"message": "Dars jadvali muvaffaqiyatli o'chirildi", "deleted": len(deleted)}
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.delete("/schedule/course/{course_id}")
+async def delete_course_schedule(course_id: int, day: Optional[int] = None, db: DatabaseCore = Depends(get_db_core)):
+    """
+    Kursning butun dars jadvalini (yoki `day` berilsa, faqat shu kunini) bitta so'rov bilan o'chiradi.
+    """
+    try:
+        filters = {"course_id": course_id}
+        if day is not None:
+            filters["day"] = day
+        deleted_ids = await db.delete_many(Schedule, filters)
+        await apply_changes(db, [ChangeEvent.reset(course_id, reason="delete")] if deleted_ids else [],
+                            removed=deleted_ids, courses=[course_id])
+        return {"message": "Dars jadvali muvaffaqiyatli o'chirildi", "deleted": len(deleted_ids)}
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.get("/schedule/occupancy/verify")
+async def verify_occupancy(db: DatabaseCore = Depends(get_db_core)):
+    """Xotiradagi bandlik indeksini ma'lumotlar bazasi bilan solishtiradi (indeks o'zgarmaydi)."""
+    try:
+        return await occupancy_index.verify(db)
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.post("/schedule/occupancy/rebuild")
+async def rebuild_occupancy(db: DatabaseCore = Depends(get_db_core)):
+    """Bandlik indeksini bazadan qayta quradi (farq bo'lsa); hisobot `verify` niki bilan bir xil."""
+    try:
+        return await occupancy_index.verify(db, repair=True)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
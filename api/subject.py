@@ -1,22 +1,29 @@
 from DatabaseService import Course, DatabaseCore, get_db_core, Subject
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from typing import List, Optional
+from .errors import server_error
+from .pagination import PageParams, fetch_page
+from .transaction import UnitOfWorkRoute
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Subjects"],
-    dependencies=[Depends(get_db_core)],
     responses={404: {"description": "Not found"}},
 )
 
 
 @router.get("/subjects/", response_model=List[dict])
-async def read_subjects(db: DatabaseCore = Depends(get_db_core)):
+async def read_subjects(request: Request, response: Response, page: PageParams = Depends(),
+                        course_id: Optional[str] = None, subject_type: Optional[str] = None,
+                        db: DatabaseCore = Depends(get_db_core)):
     try:
-        return [{"id": subject.id, "name": subject.name, "subject_type": subject.subject_type, "course_name": subject.course_name}
-                for subject in await db.get(Subject)]
+        return await fetch_page(db, Subject, ["id", "name", "subject_type", "course_name"], page, request, response,
+                                filters={"course_id": course_id, "subject_type": subject_type})
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 @router.post("/subjects/", response_model=Subject)
 async def create_subject(subject: Subject, db: DatabaseCore = Depends(get_db_core)):
@@ -26,7 +33,7 @@ async def create_subject(subject: Subject, db: DatabaseCore = Depends(get_db_cor
             subject.id = subject_id
             return subject
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 
 @router.delete("/subjects/{id}", response_model=dict)
@@ -37,4 +44,4 @@ async def delete_subject(id: int, db: DatabaseCore = Depends(get_db_core)):  # '
             return {"message": "Subject deleted successfully"}  # DELETE muvaffaqiyatli
         raise HTTPException(status_code=404, detail="Subject not found")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise server_error(e)
\ No newline at end of file
@@ -0,0 +1,43 @@
+from DatabaseService import DatabaseService1, occupancy_index, query_cache, statement_cache
+from MetricsService import REGISTRY, CONTENT_TYPE
+from fastapi import APIRouter, Response
+
+router = APIRouter(
+    prefix="/api",
+    tags=["System"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Monitoring va docker-compose healthcheck uchun prefikssiz yo'llar
+root_router = APIRouter(tags=["System"])
+
+
+@router.get("/cache/stats")
+async def read_cache_stats():
+    """Ma'lumotnoma keshi statistikasi: hit/miss soni, hit ulushi, bekor qilishlar."""
+    return query_cache.stats()
+
+
+@router.get("/cache/statements")
+async def read_statement_cache_stats():
+    """So'rov shakllari keshi: saqlangan shakllar soni, hit/miss, chiqarib yuborilganlar."""
+    return statement_cache.stats()
+
+
+@root_router.get("/health")
+async def health():
+    """
+    Arzon holat tekshiruvi: bazaga so'rov yubormaydi, faqat havza va indeks holatini qaytaradi.
+    Havzada bo'sh ulanish qolmagan va overflow ham to'lgan bo'lsa - "degraded". Replikalar oxirgi
+    tekshiruv natijasi bilan ko'rsatiladi (ishlamayotgan replika o'qishlarni primaryga o'tkazadi, holatni emas).
+    """
+    pool = DatabaseService1.pool_status()
+    exhausted = bool(pool) and pool["checked_in"] == 0 and pool["overflow"] >= DatabaseService1.MAX_OVERFLOW
+    return {"status": "degraded" if exhausted else "ok", "pool": pool, "replicas": DatabaseService1.REPLICAS.status(),
+            "occupancy_index": occupancy_index.ready}
+
+
+@root_router.get("/metrics")
+async def metrics():
+    """Metrikalar Prometheus text formatida."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
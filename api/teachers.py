@@ -1,32 +1,41 @@
 from DatabaseService import Course, DatabaseCore, get_db_core, Teacher, TeacherInfo
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from typing import List, Optional
+from .errors import server_error
+from .pagination import PageParams, fetch_page
+from .transaction import UnitOfWorkRoute
 
 router = APIRouter(
     prefix="/api",
+    route_class=UnitOfWorkRoute,
     tags=["Teachers"],
-    dependencies=[Depends(get_db_core)],
     responses={404: {"description": "Not found"}},
 )
 
 
 @router.get("/teachers/", response_model=List[dict])
-async def read_teachers(db: DatabaseCore = Depends(get_db_core)):
+async def read_teachers(request: Request, response: Response, page: PageParams = Depends(),
+                        sciencename: Optional[str] = None, db: DatabaseCore = Depends(get_db_core)):
     try:
-        return [{"id": teacher.id, "name": teacher.name, "sciencename": teacher.sciencename, "classtime": teacher.classtime} for teacher in await db.get(Teacher)]
+        return await fetch_page(db, Teacher, ["id", "name", "sciencename", "classtime"], page, request, response,
+                                sorts=("id", "name", "sciencename"), filters={"sciencename": sciencename})
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 @router.post("/teachers/")
 async def create_teacher(teacher: Teacher, db: DatabaseCore = Depends(get_db_core)):
     try:
+        # Band kataklar faqat /availability endpointlari orqali (tekshirilgan niqob bilan) o'zgaradi
+        teacher.unavailable = 0
         teacher_id = await db.add(teacher)
         if teacher_id:
             teacher.id = teacher_id
             return teacher
         raise HTTPException(status_code=500, detail="Teacher creation failed")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
 @router.delete("/teachers/{id}", operation_id="delete_teacher_by_id")
 async def delete_teacher(id: int, db: DatabaseCore = Depends(get_db_core)):
@@ -36,5 +45,5 @@ async def delete_teacher(id: int, db: DatabaseCore = Depends(get_db_core)):
             return {"message": "Teacher deleted successfully"}
         raise HTTPException(status_code=404, detail="Teacher not found")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise server_error(e)
 
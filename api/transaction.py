@@ -0,0 +1,50 @@
+from DatabaseService import get_db_core, REPLICA_STICKY_SECONDS
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from math import ceil
+from time import time
+from typing import Callable, Coroutine, Any, Optional
+
+# Yozuvdan keyin mijozning keyingi so'rovlari ham primarydan o'qishi uchun (unix vaqti)
+STICKY_COOKIE = "db-primary-until"
+
+
+def sticky_until(request: Request) -> Optional[float]:
+    """Cookie dagi chegara; `REPLICA_STICKY_SECONDS` dan uzog'i qabul qilinmaydi."""
+    try:
+        value = float(request.cookies.get(STICKY_COOKIE, ""))
+    except ValueError:
+        return None
+    return min(value, time() + REPLICA_STICKY_SECONDS)
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Endpointni bitta unit of work ichida bajaradi: handlerdagi barcha xizmat chaqiruvlari bitta sessiya va
+    tranzaksiyani ishlatadi. Commit javob yuborilishidan oldin bir marta bajariladi, istisnoda (HTTPException
+    ham) hammasi bekor qilinadi. `yield`li dependency o'rniga ishlatiladi, chunki FastAPI <0.106 da uning
+    yakunlovchi qismi javob yuborilgandan keyin ishlaydi.
+
+    Replikalar sozlangan bo'lsa, yozgan so'rov javobiga `STICKY_COOKIE` qo'yiladi: shu mijozning keyingi
+    so'rovlari `REPLICA_STICKY_SECONDS` davomida o'z yozuvini primarydan o'qiydi.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            db = await get_db_core()
+            if not db.REPLICAS:
+                async with db.unit_of_work():
+                    return await handler(request)
+            until = sticky_until(request)
+            if until is not None:
+                db.stick_to_primary(until)
+            async with db.unit_of_work() as uow:
+                response = await handler(request)
+            if uow.invalidated:
+                response.set_cookie(STICKY_COOKIE, f"{db.stick_to_primary():.3f}",
+                                    max_age=ceil(REPLICA_STICKY_SECONDS), httponly=True, samesite="lax")
+            return response
+
+        return route_handler
@@ -0,0 +1,150 @@
+from DatabaseService import DatabaseCore, get_db_core, Teacher, Room, Schedule, UnavailabilityRequest
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Sequence, Type
+from SolverService import CELLS, cell_bit, popcount
+from .availability import cells_of, request_mask
+from .errors import server_error
+from .transaction import UnitOfWorkRoute
+
+router = APIRouter(
+    prefix="/api",
+    route_class=UnitOfWorkRoute,
+    tags=["Availability"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Yo'ldagi tur -> (model, jadval yozuvidagi ustun)
+KINDS: Dict[str, Any] = {"teachers": (Teacher, "teacher_id"), "rooms": (Room, "room_id")}
+
+
+def resolve_kind(kind: str) -> Type:
+    if kind not in KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind: {kind}")
+    return KINDS[kind][0]
+
+
+def parse_mask(body: UnavailabilityRequest) -> int:
+    try:
+        return request_mask(body)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+
+def unavailability_item(row: Any) -> Dict[str, Any]:
+    mask = row["unavailable"]
+    return {"id": row["id"], "name": row["name"], "mask": mask, "cells": cells_of(mask),
+            "available_slots": CELLS - popcount(mask)}
+
+
+async def blocked_bookings(db: DatabaseCore, schedules: Sequence[Any]) -> List[Any]:
+    """
+    Jadval yozuvlaridan o'qituvchisi yoki xonasi o'sha katakda mavjud bo'lmaganlari.
+    Niqoblar har bir tur uchun bitta (keshlangan) so'rovda olinadi.
+    """
+    masks = {}
+    for model, column in KINDS.values():
+        ids = list({getattr(schedule, column) for schedule in schedules})
+        rows = await db.select_columns(model, ["id", "unavailable"], {"id": {"in": ids}, "unavailable": {"ne": 0}})
+        masks[column] = {row["id"]: row["unavailable"] for row in rows}
+    return [schedule for schedule in schedules
+            if (masks["teacher_id"].get(schedule.teacher_id, 0) | masks["room_id"].get(schedule.room_id, 0))
+            & cell_bit(schedule.day, schedule.time_slot)]
+
+
+async def save_mask(db: DatabaseCore, kind: str, entity_id: int, value: Any) -> Dict[str, Any]:
+    """
+    Niqobni bitta `UPDATE ... RETURNING` bilan yozadi va endi to'qnashib qolgan jadval yozuvlarini
+    (`/api/schedule/repair` bilan tuzatish uchun) qaytaradi.
+    """
+    model, column = KINDS[kind]
+    updated = await db.update_fields(model, entity_id, {"unavailable": value})
+    if updated is None:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    bookings = await db.select_columns(Schedule, ["id", "course_id", "day", "time_slot"], {column: entity_id})
+    return {
+        **unavailability_item(updated._mapping),
+        "conflicts": [booking for booking in bookings
+                      if updated.unavailable & cell_bit(booking["day"], booking["time_slot"])],
+    }
+
+
+@router.get("/availability/{kind}")
+async def list_unavailability(kind: str, only_blocked: bool = True, db: DatabaseCore = Depends(get_db_core)):
+    """
+    O'qituvchilar (`teachers`) yoki xonalar (`rooms`) band kataklari. Sukut bo'yicha faqat
+    cheklovi borlari; `only_blocked=false` - hammasi.
+    """
+    model = resolve_kind(kind)
+    try:
+        filters = {"unavailable": {"ne": 0}} if only_blocked else None
+        rows = await db.select_columns(model, ["id", "name", "unavailable"], filters, order_by=["id"])
+        return [unavailability_item(row) for row in rows]
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.get("/availability/{kind}/{entity_id}")
+async def read_unavailability(kind: str, entity_id: int, db: DatabaseCore = Depends(get_db_core)):
+    model = resolve_kind(kind)
+    try:
+        rows = await db.select_columns(model, ["id", "name", "unavailable"], {"id": entity_id})
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+        return unavailability_item(rows[0])
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.put("/availability/{kind}/{entity_id}")
+async def replace_unavailability(kind: str, entity_id: int, body: UnavailabilityRequest,
+                                 db: DatabaseCore = Depends(get_db_core)):
+    """Band kataklarni to'liq almashtiradi."""
+    resolve_kind(kind)
+    mask = parse_mask(body)
+    try:
+        return await save_mask(db, kind, entity_id, mask)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.post("/availability/{kind}/{entity_id}/block")
+async def block_cells(kind: str, entity_id: int, body: UnavailabilityRequest, db: DatabaseCore = Depends(get_db_core)):
+    """Kataklarni band qiladi: `unavailable = unavailable | mask` (o'qish-o'zgartirish-yozishsiz)."""
+    model = resolve_kind(kind)
+    mask = parse_mask(body)
+    try:
+        return await save_mask(db, kind, entity_id, model.unavailable.op("|")(mask))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.post("/availability/{kind}/{entity_id}/unblock")
+async def unblock_cells(kind: str, entity_id: int, body: UnavailabilityRequest,
+                        db: DatabaseCore = Depends(get_db_core)):
+    """Kataklarni bo'shatadi: `unavailable = unavailable & ~mask`."""
+    model = resolve_kind(kind)
+    mask = parse_mask(body)
+    try:
+        return await save_mask(db, kind, entity_id, model.unavailable.op("&")(~mask))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
+
+
+@router.delete("/availability/{kind}/{entity_id}")
+async def clear_unavailability(kind: str, entity_id: int, db: DatabaseCore = Depends(get_db_core)):
+    """Barcha cheklovlarni olib tashlaydi (ob'ekt butun hafta mavjud)."""
+    resolve_kind(kind)
+    try:
+        return await save_mask(db, kind, entity_id, 0)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise server_error(e)
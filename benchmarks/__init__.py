@@ -0,0 +1 @@
+"""Unumdorlik o'lchovlari (benchmark) to'plami. Har bir modul `python -m benchmarks.<nom>` orqali ishga tushadi."""
@@ -0,0 +1,144 @@
+"""
+Sintetik, takrorlanadigan (seed bo'yicha) ma'lumotlar to'plami: kurslar, guruhlar, o'qituvchilar, xonalar,
+fanlar va to'qnashuvsiz dars jadvali. Jadval bazadagi cheklovlarga (guruh, o'qituvchi va xona bir katakda
+bittadan) mos keladi, shuning uchun to'g'ridan-to'g'ri `add_all` bilan yoziladi.
+
+Ishga tushirish (bo'sh, sinov uchun ajratilgan bazada; DATABASE_URL sozlangan bo'lishi kerak):
+    python -m benchmarks.dataset --scale large --seed 0
+    python -m benchmarks.dataset --teachers 2000 --schedules 20000 --dry-run
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from random import Random
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Tuple
+from DatabaseService import DatabaseService1, Course, Group, Teacher, Room, Subject, Schedule
+from SolverService import CELLS, cell_of
+
+SUBJECT_NAMES = ["Matematika", "Fizika", "Kimyo", "Biologiya", "Informatika", "Tarix", "Falsafa", "Iqtisodiyot",
+                 "Ingliz tili", "Rus tili", "Ona tili", "Adabiyot", "Geografiya", "Huquq", "Statistika",
+                 "Dasturlash", "Elektronika", "Mexanika", "Psixologiya", "Pedagogika"]
+LESSON_TYPES = ["ma'ruza", "amaliyot", "laboratoriya"]
+FIRST_NAMES = ["Aziz", "Bobur", "Dilnoza", "Gulnora", "Jasur", "Kamola", "Laylo", "Murod", "Nodira", "Otabek",
+               "Rustam", "Sardor", "Shahnoza", "Umid", "Zarina"]
+LAST_NAMES = ["Aliyev", "Karimov", "Rashidov", "Tursunov", "Yusupov", "Qodirov", "Ergashev", "Nazarov",
+              "Saidov", "Xolmatov"]
+
+
+class Scale(NamedTuple):
+    courses: int
+    groups: int
+    teachers: int
+    rooms: int
+    subjects_per_course: int
+    schedules: int
+
+
+SCALES = {
+    "small": Scale(courses=4, groups=80, teachers=200, rooms=150, subjects_per_course=8, schedules=1500),
+    "medium": Scale(courses=10, groups=1000, teachers=1500, rooms=1200, subjects_per_course=12, schedules=20000),
+    "large": Scale(courses=40, groups=10000, teachers=10000, rooms=10000, subjects_per_course=20, schedules=200000),
+}
+
+# (kurs, guruh, fan, o'qituvchi, xona, kun, dars vaqti) - hammasi 0 dan boshlanadigan indekslar (kun/vaqt 1 dan)
+PlannedLesson = Tuple[int, int, int, int, int, int, int]
+
+
+class Dataset(NamedTuple):
+    courses: List[Dict]
+    groups: List[Dict]
+    teachers: List[Dict]
+    rooms: List[Dict]
+    subjects: List[Dict]
+    schedules: List[PlannedLesson]
+
+
+def generate(scale: Scale, seed: int = 0) -> Dataset:
+    """
+    Ma'lumotlarni xotirada yaratadi. Jadval har bir katak uchun bo'sh o'qituvchi/xonalar aralashtirilgan
+    ro'yxatidan olinadi, shuning uchun to'qnashuv bo'lmaydi; sig'im yetmasa, darslar soni kamroq bo'ladi.
+    """
+    if scale.groups * CELLS < scale.schedules:
+        raise ValueError(f"{scale.groups} groups can hold at most {scale.groups * CELLS} schedules")
+    rng = Random(seed)
+    courses = [{"name": f"{index % 4 + 1}-kurs", "description": f"bench-{index + 1}"} for index in range(scale.courses)]
+    groups = [{"name": f"G-{index + 1:05d}", "course": index % scale.courses} for index in range(scale.groups)]
+    teachers = [{"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} #{index + 1}",
+                 "sciencename": rng.choice(SUBJECT_NAMES), "classtime": str(rng.choice([12, 16, 18, 20]))}
+                for index in range(scale.teachers)]
+    rooms = [{"name": f"{index // 100 + 1}-bino {index % 100 + 1:03d}", "roomstype": rng.choice(LESSON_TYPES)}
+             for index in range(scale.rooms)]
+    subjects = []
+    course_subjects: List[List[int]] = []
+    for course in range(scale.courses):
+        names = rng.sample(SUBJECT_NAMES, min(scale.subjects_per_course, len(SUBJECT_NAMES)))
+        course_subjects.append(list(range(len(subjects), len(subjects) + len(names))))
+        subjects.extend({"name": name, "subject_type": rng.choice(LESSON_TYPES), "course": course,
+                         "course_name": courses[course]["name"]} for name in names)
+
+    free_teachers = [rng.sample(range(scale.teachers), scale.teachers) for _ in range(CELLS)]
+    free_rooms = [rng.sample(range(scale.rooms), scale.rooms) for _ in range(CELLS)]
+    per_group, extra = divmod(scale.schedules, scale.groups)
+    schedules: List[PlannedLesson] = []
+    for group, item in enumerate(groups):
+        course = item["course"]
+        for cell in rng.sample(range(CELLS), per_group + (1 if group < extra else 0)):
+            if not free_teachers[cell] or not free_rooms[cell]:
+                continue
+            day, time_slot = cell_of(cell)
+            schedules.append((course, group, rng.choice(course_subjects[course]),
+                              free_teachers[cell].pop(), free_rooms[cell].pop(), day, time_slot))
+    return Dataset(courses, groups, teachers, rooms, subjects, schedules)
+
+
+async def populate(dataset: Dataset, batch_size: int = 5000) -> Dict[str, int]:
+    """Ma'lumotlarni bazaga `add_all` bilan partiyalab yozadi; jadval soni bo'yicha hisobot qaytaradi."""
+    db = DatabaseService1()
+
+    async def insert(model, rows: List[Dict]) -> List[int]:
+        ids: List[int] = []
+        for start in range(0, len(rows), batch_size):
+            ids.extend(await db.add_all([model(**row) for row in rows[start:start + batch_size]]))
+        return ids
+
+    course_ids = await insert(Course, dataset.courses)
+    group_ids = await insert(Group, [{"name": row["name"], "course_id": course_ids[row["course"]]}
+                                     for row in dataset.groups])
+    teacher_ids = await insert(Teacher, dataset.teachers)
+    room_ids = await insert(Room, dataset.rooms)
+    subject_ids = await insert(Subject, [{"name": row["name"], "subject_type": row["subject_type"],
+                                          "course_id": str(course_ids[row["course"]]),
+                                          "course_name": row["course_name"]} for row in dataset.subjects])
+    schedule_ids = await insert(Schedule, [
+        {"course_id": course_ids[course], "group_id": group_ids[group], "subject_id": subject_ids[subject],
+         "teacher_id": teacher_ids[teacher], "room_id": room_ids[room], "day": day, "time_slot": time_slot}
+        for course, group, subject, teacher, room, day, time_slot in dataset.schedules])
+    await db.dispose()
+    return {"courses": len(course_ids), "groups": len(group_ids), "teachers": len(teacher_ids),
+            "rooms": len(room_ids), "subjects": len(subject_ids), "schedules": len(schedule_ids)}
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Synthetic timetable dataset generator")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for field in Scale._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f"override {field}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="generate only, do not write to the database")
+    args = parser.parse_args()
+
+    overrides = {field: getattr(args, field) for field in Scale._fields if getattr(args, field) is not None}
+    scale = SCALES[args.scale]._replace(**overrides)
+    started = perf_counter()
+    dataset = generate(scale, args.seed)
+    print(f"generated {len(dataset.schedules)} schedules for {scale} in {perf_counter() - started:.2f}s")
+    if args.dry_run:
+        return
+    started = perf_counter()
+    counts = run(populate(dataset, args.batch_size))
+    print(f"inserted {counts} in {perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Ishlab turgan ilovaga qarshi asinxron yuklama: barcha `/api/*` yo'llariga aralash o'qish va yozish so'rovlari.
+Har bir yo'l (endpoint shabloni) uchun p50/p95/p99 kechikish, so'rovlar soni, xatolar va umumiy o'tkazuvchanlik
+hisoblanadi. Natija JSON faylga yozilishi va oldingi baza (baseline) bilan solishtirilishi mumkin.
+
+Yozish so'rovlari faqat haydovchi o'zi yaratgan yozuvlarga (va "bench-scratch" kursiga) tegadi.
+Ishga tushirish (avval `python -m benchmarks.dataset` bilan ma'lumot yuklang):
+    python -m benchmarks.load --base-url http://localhost:8001 --concurrency 32 --duration 30 --output load.json
+    python -m benchmarks.load --duration 30 --baseline benchmarks/baseline.json --tolerance 0.2
+"""
+from argparse import ArgumentParser
+from asyncio import gather, run
+from json import dump, load
+from random import Random
+from statistics import quantiles
+from sys import exit
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from aiohttp import ClientSession, ClientTimeout
+from SolverService import DAYS, SLOTS
+
+
+class Scenario(NamedTuple):
+    method: str
+    route: str
+    write: bool
+    weight: float
+    run: Callable[[ClientSession, "Context"], Awaitable[Optional[int]]]
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+SCENARIOS: List[Scenario] = []
+
+
+def scenario(method: str, route: str, weight: float, write: bool = False) -> Callable:
+    """Yo'l uchun so'rov funksiyasini ro'yxatga oladi. Funksiya HTTP statusni yoki (o'tkazib yuborilsa) None qaytaradi."""
+
+    def decorator(func):
+        SCENARIOS.append(Scenario(method, route, write, weight, func))
+        return func
+
+    return decorator
+
+
+class Context:
+    """Mavjud identifikatorlar va haydovchi yaratgan yozuvlar."""
+
+    def __init__(self, rng: Random):
+        self.rng = rng
+        self.ids: Dict[str, List[int]] = {"courses": [], "groups": [], "teachers": [], "rooms": [], "subjects": []}
+        self.created: Dict[str, List[int]] = {"courses": [], "groups": [], "teachers": [], "rooms": [],
+                                              "subjects": [], "schedules": []}
+        self.scratch: Dict[str, int] = {}
+        self.etags: Dict[int, str] = {}
+        self.cursor: Optional[str] = None  # /api/changes kursori (oynani sinxronlovchi mijoz)
+        self.next_page: Optional[str] = None  # /api/changes ning tugallanmagan sinxronlash sahifasi
+
+    def pick(self, kind: str) -> int:
+        return self.rng.choice(self.ids[kind])
+
+    def cell(self) -> Dict[str, int]:
+        return {"day": self.rng.randint(1, DAYS), "time_slot": self.rng.randint(1, SLOTS)}
+
+
+async def call(http: ClientSession, method: str, url: str, **kwargs: Any) -> int:
+    """So'rov yuboradi va javob tanasini oxirigacha o'qiydi (o'lchov shu vaqtni ham o'z ichiga oladi)."""
+    async with http.request(method, url, **kwargs) as response:
+        await response.read()
+        return response.status
+
+
+async def call_json(http: ClientSession, method: str, url: str, **kwargs: Any) -> Any:
+    async with http.request(method, url, **kwargs) as response:
+        body = await response.json(content_type=None)
+        return response.status, body
+
+
+# --- o'qish ---
+
+@scenario("GET", "/api/courses/", 4)
+async def read_courses(http, ctx):
+    return await call(http, "GET", "/api/courses/")
+
+
+@scenario("GET", "/api/courses/for/groups", 3)
+async def read_courses_for_groups(http, ctx):
+    return await call(http, "GET", "/api/courses/for/groups")
+
+
+@scenario("GET", "/api/groups/", 4)
+async def read_groups(http, ctx):
+    params = {"course_id": ctx.pick("courses")} if ctx.rng.random() < 0.5 else {}
+    return await call(http, "GET", "/api/groups/", params=params)
+
+
+@scenario("GET", "/api/subjects/", 3)
+async def read_subjects(http, ctx):
+    return await call(http, "GET", "/api/subjects/")
+
+
+@scenario("GET", "/api/teachers/", 4)
+async def read_teachers(http, ctx):
+    return await call(http, "GET", "/api/teachers/", params={"after_id": ctx.pick("teachers")})
+
+
+@scenario("GET", "/api/rooms/", 3)
+async def read_rooms(http, ctx):
+    return await call(http, "GET", "/api/rooms/")
+
+
+@scenario("GET", "/api/rooms/{room_id}", 2)
+async def read_room(http, ctx):
+    return await call(http, "GET", f"/api/rooms/{ctx.pick('rooms')}")
+
+
+@scenario("GET", "/api/schedule/{course_id}", 4)
+async def read_course_groups(http, ctx):
+    return await call(http, "GET", f"/api/schedule/{ctx.pick('courses')}")
+
+
+@scenario("GET", "/api/available-teachers/", 6)
+async def read_available_teachers(http, ctx):
+    return await call(http, "GET", "/api/available-teachers/", params=ctx.cell())
+
+
+@scenario("GET", "/api/available-rooms/", 6)
+async def read_available_rooms(http, ctx):
+    return await call(http, "GET", "/api/available-rooms/", params=ctx.cell())
+
+
+@scenario("GET", "/api/schedule/availability/{course_id}", 4)
+async def read_availability(http, ctx):
+    return await call(http, "GET", f"/api/schedule/availability/{ctx.pick('courses')}")
+
+
+@scenario("GET", "/api/schedule/subjects/{course_id}", 4)
+async def read_course_subjects(http, ctx):
+    return await call(http, "GET", f"/api/schedule/subjects/{ctx.pick('courses')}")
+
+
+@scenario("GET", "/api/schedule/table/{course_id}", 10)
+async def read_schedule_table(http, ctx):
+    course_id = ctx.pick("courses")
+    headers = {"If-None-Match": ctx.etags[course_id]} if course_id in ctx.etags and ctx.rng.random() < 0.5 else {}
+    async with http.get(f"/api/schedule/table/{course_id}", headers=headers) as response:
+        await response.read()
+        if "ETag" in response.headers:
+            ctx.etags[course_id] = response.headers["ETag"]
+        return response.status
+
+
+@scenario("GET", "/api/schedule/grid/{course_id}", 10)
+async def read_schedule_grid(http, ctx):
+    headers = {"Accept": "application/msgpack"} if ctx.rng.random() < 0.5 else {}
+    return await call(http, "GET", f"/api/schedule/grid/{ctx.pick('courses')}", headers=headers)
+
+
+@scenario("GET", "/api/schedule/export", 0.2)
+async def export_schedule(http, ctx):
+    params = {"course_id": ctx.pick("courses"), "format": ctx.rng.choice(["ndjson", "csv"])}
+    return await call(http, "GET", "/api/schedule/export", params=params)
+
+
+@scenario("GET", "/api/schedule/feed", 0.2)
+async def open_feed(http, ctx):
+    """Oqimga ulanish vaqti: birinchi (`retry:`) satr kelguncha."""
+    async with http.get("/api/schedule/feed", params={"course_id": ctx.pick("courses")}) as response:
+        await response.content.readline()
+        return response.status
+
+
+@scenario("GET", "/api/availability/{kind}", 1)
+async def list_unavailability(http, ctx):
+    return await call(http, "GET", f"/api/availability/{ctx.rng.choice(['teachers', 'rooms'])}")
+
+
+@scenario("GET", "/api/availability/{kind}/{entity_id}", 2)
+async def read_unavailability(http, ctx):
+    return await call(http, "GET", f"/api/availability/teachers/{ctx.pick('teachers')}")
+
+
+@scenario("GET", "/api/schedule/occupancy/verify", 0.05)
+async def verify_occupancy(http, ctx):
+    return await call(http, "GET", "/api/schedule/occupancy/verify")
+
+
+@scenario("GET", "/api/changes", 1)
+async def sync_changes(http, ctx):
+    """
+    Oyna mijozi: birinchi so'rov to'liq nusxa, keyingilari oldingi kursordan beri o'zgarishlar. Javobda `next`
+    bo'lsa, keyingi chaqiruv shu sahifadan davom etadi.
+    """
+    params = {"after": ctx.next_page} if ctx.next_page else {"since": ctx.cursor} if ctx.cursor else {}
+    async with http.get("/api/changes", params=params) as response:
+        if response.status == 200:
+            body = await response.json()
+            ctx.next_page = body["next"]
+            ctx.cursor = body["cursor"] or ctx.cursor
+        else:
+            await response.read()
+            ctx.next_page = None
+        return response.status
+
+
+@scenario("GET", "/api/cache/stats", 0.5)
+async def read_cache_stats(http, ctx):
+    return await call(http, "GET", "/api/cache/stats")
+
+
+# --- yozish ---
+
+async def create(http, ctx, kind: str, url: str, body: Dict[str, Any]) -> int:
+    status, payload = await call_json(http, "POST", url, json=body)
+    if status == 200 and isinstance(payload, dict) and payload.get("id"):
+        ctx.created[kind].append(payload["id"])
+    return status
+
+
+async def delete_created(http, ctx, kind: str, url: str) -> Optional[int]:
+    if not ctx.created[kind]:
+        return None
+    record_id = ctx.created[kind].pop(ctx.rng.randrange(len(ctx.created[kind])))
+    return await call(http, "DELETE", url.format(id=record_id))
+
+
+@scenario("POST", "/api/courses/", 1, write=True)
+async def create_course(http, ctx):
+    return await create(http, ctx, "courses", "/api/courses/", {"name": "bench", "description": "load"})
+
+
+@scenario("PUT", "/api/courses/{course_id}", 1, write=True)
+async def update_course(http, ctx):
+    if not ctx.created["courses"]:
+        return None
+    course_id = ctx.rng.choice(ctx.created["courses"])
+    return await call(http, "PUT", f"/api/courses/{course_id}", json={"name": "bench", "description": "updated"})
+
+
+@scenario("DELETE", "/api/courses/{course_id}", 0.5, write=True)
+async def delete_course(http, ctx):
+    return await delete_created(http, ctx, "courses", "/api/courses/{id}")
+
+
+@scenario("POST", "/api/groups/", 1, write=True)
+async def create_group(http, ctx):
+    return await create(http, ctx, "groups", "/api/groups/", {"name": "bench", "course_id": ctx.scratch["course_id"]})
+
+
+@scenario("DELETE", "/api/groups/{group_id}", 0.8, write=True)
+async def delete_group(http, ctx):
+    # Jadvalda darsi bor guruh o'chmaydi (xato javob) - bu ham o'lchanadi
+    return await delete_created(http, ctx, "groups", "/api/groups/{id}")
+
+
+@scenario("POST", "/api/teachers/", 1, write=True)
+async def create_teacher(http, ctx):
+    return await create(http, ctx, "teachers", "/api/teachers/",
+                        {"name": "bench", "sciencename": "Matematika", "classtime": "16"})
+
+
+async def change_unavailability(http, ctx, method: str, action: str = "") -> Optional[int]:
+    # Faqat haydovchi yaratgan o'qituvchilar (ularda jadval yozuvlari yo'q)
+    if not ctx.created["teachers"]:
+        return None
+    url = f"/api/availability/teachers/{ctx.rng.choice(ctx.created['teachers'])}{action}"
+    body = {"days": [ctx.rng.randint(1, DAYS)]} if method != "DELETE" else None
+    return await call(http, method, url, json=body)
+
+
+@scenario("PUT", "/api/availability/{kind}/{entity_id}", 0.3, write=True)
+async def replace_unavailability(http, ctx):
+    return await change_unavailability(http, ctx, "PUT")
+
+
+@scenario("POST", "/api/availability/{kind}/{entity_id}/block", 0.3, write=True)
+async def block_cells(http, ctx):
+    return await change_unavailability(http, ctx, "POST", "/block")
+
+
+@scenario("POST", "/api/availability/{kind}/{entity_id}/unblock", 0.3, write=True)
+async def unblock_cells(http, ctx):
+    return await change_unavailability(http, ctx, "POST", "/unblock")
+
+
+@scenario("DELETE", "/api/availability/{kind}/{entity_id}", 0.2, write=True)
+async def clear_unavailability(http, ctx):
+    return await change_unavailability(http, ctx, "DELETE")
+
+
+@scenario("DELETE", "/api/teachers/{id}", 0.8, write=True)
+async def delete_teacher(http, ctx):
+    return await delete_created(http, ctx, "teachers", "/api/teachers/{id}")
+
+
+@scenario("POST", "/api/rooms/", 1, write=True)
+async def create_room(http, ctx):
+    return await create(http, ctx, "rooms", "/api/rooms/", {"name": "bench", "roomstype": "amaliyot"})
+
+
+@scenario("DELETE", "/api/rooms/{id}", 0.8, write=True)
+async def delete_room(http, ctx):
+    return await delete_created(http, ctx, "rooms", "/api/rooms/{id}")
+
+
+@scenario("POST", "/api/subjects/", 1, write=True)
+async def create_subject(http, ctx):
+    return await create(http, ctx, "subjects", "/api/subjects/",
+                        {"name": "bench", "subject_type": "amaliyot", "course_id": str(ctx.scratch["course_id"])})
+
+
+@scenario("DELETE", "/api/subjects/{id}", 0.8, write=True)
+async def delete_subject(http, ctx):
+    return await delete_created(http, ctx, "subjects", "/api/subjects/{id}")
+
+
+@scenario("POST", "/api/schedule/", 3, write=True)
+async def create_schedule(http, ctx):
+    body = [{"course_id": ctx.scratch["course_id"], "group_id": ctx.scratch["group_id"],
+             "subject_id": ctx.scratch["subject_id"], "teacher_id": ctx.pick("teachers"),
+             "room_id": ctx.pick("rooms"), **ctx.cell()}]
+    status, payload = await call_json(http, "POST", "/api/schedule/", json=body)
+    if status == 200 and isinstance(payload, list):
+        ctx.created["schedules"].extend(payload)
+    return status
+
+
+@scenario("PUT", "/api/schedule/{schedule_id}", 2, write=True)
+async def update_schedule(http, ctx):
+    if not ctx.created["schedules"]:
+        return None
+    schedule_id = ctx.rng.choice(ctx.created["schedules"])
+    return await call(http, "PUT", f"/api/schedule/{schedule_id}", json={"room_id": ctx.pick("rooms")})
+
+
+@scenario("DELETE", "/api/schedule/{schedule_id}", 2, write=True)
+async def delete_schedule(http, ctx):
+    return await delete_created(http, ctx, "schedules", "/api/schedule/{id}")
+
+
+@scenario("DELETE", "/api/schedule/course/{course_id}", 0.2, write=True)
+async def delete_course_schedule(http, ctx):
+    ctx.created["schedules"].clear()
+    return await call(http, "DELETE", f"/api/schedule/course/{ctx.scratch['course_id']}",
+                      params={"day": ctx.rng.randint(1, DAYS)})
+
+
+@scenario("POST", "/api/schedule/generate/{course_id}", 0.1, write=True)
+async def generate_schedule(http, ctx):
+    ctx.created["schedules"].clear()
+    return await call(http, "POST", f"/api/schedule/generate/{ctx.scratch['course_id']}",
+                      params={"apply": "true", "time_limit": 0.5, "seed": ctx.rng.randrange(1000)})
+
+
+@scenario("POST", "/api/schedule/repair", 1)
+async def propose_repair(http, ctx):
+    # Faqat taklif (apply=false): o'qituvchi tasodifiy kunda band bo'lganda nechta dars ko'chadi
+    change = {"teacher_id": ctx.pick("teachers"), "days": [ctx.rng.randint(1, DAYS)]}
+    return await call(http, "POST", "/api/schedule/repair", json=change)
+
+
+# --- haydovchi ---
+
+async def collect_ids(http: ClientSession, url: str, limit: int = 5) -> List[int]:
+    """Ro'yxat endpointidan dastlabki `limit` sahifadagi identifikatorlar."""
+    ids, params = [], {"limit": 1000}
+    for _ in range(limit):
+        async with http.get(url, params=params) as response:
+            ids.extend(row["id"] for row in await response.json() if "id" in row)
+            cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 1000, "cursor": cursor}
+    return ids
+
+
+async def prepare(http: ClientSession, ctx: Context) -> None:
+    """Mavjud identifikatorlarni yig'adi va yozish uchun "bench-scratch" kursini tayyorlaydi."""
+    for kind in ("teachers", "rooms", "subjects"):
+        ctx.ids[kind] = await collect_ids(http, f"/api/{kind}/")
+    async with http.get("/api/courses/for/groups") as response:
+        ctx.ids["courses"] = [row["id"] for row in await response.json()]
+    if not all(ctx.ids.get(kind) for kind in ("courses", "teachers", "rooms")):
+        raise SystemExit("Database is empty: run `python -m benchmarks.dataset` first")
+
+    # Qisman yaratilgan bo'lsa ham `cleanup` o'chira olishi uchun har biri darhol yoziladi
+    _, course = await call_json(http, "POST", "/api/courses/", json={"name": "bench-scratch", "description": "load"})
+    ctx.scratch["course_id"] = course["id"]
+    _, group = await call_json(http, "POST", "/api/groups/", json={"name": "bench-scratch", "course_id": course["id"]})
+    ctx.scratch["group_id"] = group["id"]
+    _, subject = await call_json(http, "POST", "/api/subjects/", json={
+        "name": "bench-scratch", "subject_type": "amaliyot", "course_id": str(course["id"]), "course_name": "bench"})
+    ctx.scratch["subject_id"] = subject["id"]
+
+
+async def cleanup(http: ClientSession, ctx: Context) -> None:
+    """"bench-scratch" kursini, uning jadvali, guruhlari va fanlarini (haydovchi yaratganlarini ham) o'chiradi."""
+    course_id = ctx.scratch.get("course_id")
+    if course_id is None:
+        return
+    await call(http, "DELETE", f"/api/schedule/course/{course_id}")
+    for subject_id in [ctx.scratch.get("subject_id"), *ctx.created["subjects"]]:
+        if subject_id is not None:
+            await call(http, "DELETE", f"/api/subjects/{subject_id}")
+    for group_id in [ctx.scratch.get("group_id"), *ctx.created["groups"]]:
+        if group_id is not None:
+            await call(http, "DELETE", f"/api/groups/{group_id}")
+    await call(http, "DELETE", f"/api/courses/{course_id}")
+
+
+async def check_coverage(http: ClientSession) -> List[str]:
+    """OpenAPI sxemasidagi, lekin ssenariysi yo'q `/api` yo'llari."""
+    async with http.get("/openapi.json") as response:
+        schema = await response.json()
+    covered = {item.key for item in SCENARIOS}
+    return sorted(f"{method.upper()} {path}" for path, operations in schema["paths"].items()
+                  if path.startswith("/api/") for method in operations
+                  if f"{method.upper()} {path}" not in covered)
+
+
+async def worker(http: ClientSession, ctx: Context, scenarios: List[Scenario], weights: List[float],
+                 deadline: float, samples: Dict[str, List[float]], statuses: Dict[str, Dict[str, int]]) -> None:
+    while perf_counter() < deadline:
+        item = ctx.rng.choices(scenarios, weights)[0]
+        started = perf_counter()
+        try:
+            status = await item.run(http, ctx)
+        except Exception as e:
+            status = type(e).__name__
+        if status is None:
+            continue
+        samples.setdefault(item.key, []).append(perf_counter() - started)
+        counts = statuses.setdefault(item.key, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if len(values) < 2:
+        value = values[0] * 1000 if values else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+def summarize(samples: Dict[str, List[float]], statuses: Dict[str, Dict[str, int]], elapsed: float) -> Dict:
+    routes = {}
+    for key, values in sorted(samples.items()):
+        errors = sum(count for status, count in statuses[key].items() if not status.isdigit() or int(status) >= 500)
+        routes[key] = {"count": len(values), "rps": len(values) / elapsed, "errors": errors,
+                       "statuses": statuses[key], **percentiles(values)}
+    everything = [value for values in samples.values() for value in values]
+    total = {"count": len(everything), "rps": len(everything) / elapsed,
+             "errors": sum(route["errors"] for route in routes.values()), **percentiles(everything)}
+    return {"total": total, "routes": routes}
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float, min_delta_ms: float = 1.0) -> List[str]:
+    """p95 kechikish `tolerance` ulushidan (va kamida `min_delta_ms` dan) ko'p o'sgan yo'llar."""
+    regressions = []
+    pairs = [("total", report["total"], baseline["total"])]
+    pairs += [(key, route, baseline["routes"][key]) for key, route in report["routes"].items()
+              if key in baseline["routes"]]
+    for key, current, previous in pairs:
+        limit = previous["p95"] * (1 + tolerance)
+        if current["p95"] > limit and current["p95"] - previous["p95"] > min_delta_ms:
+            regressions.append(f"{key}: p95 {previous['p95']:.1f} -> {current['p95']:.1f} ms")
+    if report["total"]["rps"] < baseline["total"]["rps"] * (1 - tolerance):
+        regressions.append(f"throughput: {baseline['total']['rps']:.0f} -> {report['total']['rps']:.0f} req/s")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"{'route':<48} {'count':>7} {'rps':>8} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for key, row in [*report["routes"].items(), ("TOTAL", report["total"])]:
+        print(f"{key:<48} {row['count']:>7} {row['rps']:>8.1f} {row['errors']:>5} "
+              f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}")
+
+
+async def main(args) -> Dict:
+    rng = Random(args.seed)
+    ctx = Context(rng)
+    scenarios = [item for item in SCENARIOS if args.write_ratio > 0 or not item.write]
+    # Yozish/o'qish ulushi `--write-ratio` ga keltiriladi, ichki nisbatlar og'irliklar bo'yicha
+    read_total = sum(item.weight for item in scenarios if not item.write)
+    write_total = sum(item.weight for item in scenarios if item.write) or 1
+    weights = [item.weight / write_total * args.write_ratio if item.write
+               else item.weight / read_total * (1 - args.write_ratio) for item in scenarios]
+
+    timeout = ClientTimeout(total=args.timeout)
+    async with ClientSession(base_url=args.base_url, timeout=timeout) as http:
+        uncovered = await check_coverage(http)
+        if uncovered:
+            print("routes without a scenario:", ", ".join(uncovered))
+        samples: Dict[str, List[float]] = {}
+        statuses: Dict[str, Dict[str, int]] = {}
+        try:
+            await prepare(http, ctx)
+            started = perf_counter()
+            deadline = started + args.duration
+            await gather(*(worker(http, ctx, scenarios, weights, deadline, samples, statuses)
+                           for _ in range(args.concurrency)))
+            elapsed = perf_counter() - started
+        finally:
+            await cleanup(http, ctx)
+
+    report = summarize(samples, statuses, elapsed)
+    report["meta"] = {"timestamp": time(), "base_url": args.base_url, "concurrency": args.concurrency,
+                      "duration": args.duration, "write_ratio": args.write_ratio, "seed": args.seed,
+                      "uncovered": uncovered}
+    return report
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Async HTTP load driver for /api routes")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput regression")
+    args = parser.parse_args()
+
+    result = run(main(args))
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            dump(result, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            problems = compare(result, load(file), args.tolerance)
+        for problem in problems:
+            print("REGRESSION", problem)
+        exit(1 if problems else 0)
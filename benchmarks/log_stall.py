@@ -0,0 +1,93 @@
+"""
+Log yozish event loopni qancha to'xtatib qo'yishini o'lchaydi. Ko'p vazifa bir vaqtda `DatabaseService1`
+dagi kabi xabarlar yozadi, alohida vazifa esa har `--interval` ms da uyg'onib kechikishni qayd qiladi.
+Rejimlar: sinxron RotatingFileHandler, QueueHandler/QueueListener (fayl I/O fon oqimida) va navbat + sampling.
+
+Ishga tushirish:
+    python -m benchmarks.log_stall --tasks 200 --messages 200
+"""
+from argparse import ArgumentParser
+from asyncio import Event, gather, get_running_loop, run, sleep
+from logging import INFO, Formatter, Logger, getLogger
+from logging.handlers import QueueListener, RotatingFileHandler
+from os.path import join
+from queue import SimpleQueue
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import List, Optional, Tuple
+from LoggerService import LazyQueueHandler, SamplingFilter, QUERY
+
+MODES = ("sync", "queued", "queued+sampled")
+
+
+def build_logger(mode: str, directory: str) -> Tuple[Logger, Optional[QueueListener]]:
+    handler = RotatingFileHandler(join(directory, f"{mode}.log"), maxBytes=50_000_000, backupCount=1, encoding="utf-8")
+    handler.setFormatter(Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logger = getLogger(f"benchmark.{mode}")
+    logger.setLevel(INFO)
+    logger.propagate = False
+    listener = None
+    if mode == "sync":
+        logger.addHandler(handler)
+    else:
+        listener = QueueListener(SimpleQueue(), handler, respect_handler_level=True)
+        logger.addHandler(LazyQueueHandler(listener.queue))
+        listener.start()
+    if mode.endswith("+sampled"):
+        logger.addFilter(SamplingFilter({"query": 0.01}))
+    return logger, listener
+
+
+async def probe(interval: float, lags: List[float], done: Event) -> None:
+    """Har `interval` soniyada uyg'onadi va rejalashtirilgandan qancha kech uyg'onganini yozadi."""
+    loop = get_running_loop()
+    while not done.is_set():
+        expected = loop.time() + interval
+        await sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def worker(logger: Logger, messages: int) -> None:
+    for i in range(messages):
+        logger.info("Executing query: %s", "_select_columns", extra=QUERY)
+        logger.info("Retrieved %d records from %s", i, "Schedule", extra=QUERY)
+        await sleep(0)
+
+
+async def measure(mode: str, tasks: int, messages: int, interval: float, directory: str) -> dict:
+    logger, listener = build_logger(mode, directory)
+    lags: List[float] = []
+    done = Event()
+    probe_task = get_running_loop().create_task(probe(interval, lags, done))
+    started = perf_counter()
+    await gather(*(worker(logger, messages) for _ in range(tasks)))
+    elapsed = perf_counter() - started
+    done.set()
+    await probe_task
+    drain_started = perf_counter()
+    if listener is not None:
+        listener.stop()  # navbatda qolgan yozuvlar shu yerda faylga tushadi
+    drain = perf_counter() - drain_started
+    lags = lags or [0.0]
+    p50, p99 = (quantiles(lags, n=100, method="inclusive")[index] for index in (49, 98)) if len(lags) > 1 else (lags[0], lags[0])
+    return {"mode": mode, "elapsed": elapsed, "rate": tasks * messages * 2 / elapsed, "p50": p50 * 1000,
+            "p99": p99 * 1000, "max": max(lags) * 1000, "drain": drain}
+
+
+async def main(tasks: int, messages: int, interval_ms: float) -> None:
+    print(f"{'mode':<16} {'msg/s':>10} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11} {'drain s':>8}")
+    with TemporaryDirectory() as directory:
+        for mode in MODES:
+            result = await measure(mode, tasks, messages, interval_ms / 1000, directory)
+            print(f"{result['mode']:<16} {result['rate']:>10.0f} {result['p50']:>11.2f} {result['p99']:>11.2f} "
+                  f"{result['max']:>11.2f} {result['drain']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Event loop stall caused by logging")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=1.0, help="probe interval, ms")
+    args = parser.parse_args()
+    run(main(args.tasks, args.messages, args.interval))
@@ -0,0 +1,80 @@
+"""
+ORM ob'ektlarini yuklash va ustunlar proyeksiyasi (`select_columns`) tezligini solishtiradi.
+Natija - qator/soniya. Kesh o'chirilgan holda o'lchanadi.
+
+Ishga tushirish (DATABASE_URL sozlangan bo'lishi kerak):
+    python -m benchmarks.projection --repeat 20 --course-id 1
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+from asyncio import run
+from DatabaseService import DatabaseService1, Course, Group, Teacher, Schedule
+from api.schedules import TABLE_COLUMNS
+
+
+class UncachedService(DatabaseService1):
+    CACHED_MODELS = frozenset()
+
+
+async def teachers_before(db, course_id):
+    return [{"id": t.id, "name": t.name, "sciencename": t.sciencename, "classtime": t.classtime}
+            for t in await db.get(Teacher)]
+
+
+async def teachers_after(db, course_id):
+    return await db.select_columns(Teacher, ["id", "name", "sciencename", "classtime"])
+
+
+async def groups_before(db, course_id):
+    courses = {course.id: f"{course.name} {course.description}" for course in await db.get(Course)}
+    return [{"name": group.name, "course_id": courses.get(group.course_id, "Noma'lum")} for group in await db.get(Group)]
+
+
+async def groups_after(db, course_id):
+    return await db.select_columns(Group, ["name", "course.name", "course.description"])
+
+
+async def table_before(db, course_id):
+    relationships = ["group", "course", "subject", "teacher", "room"]
+    schedules = await db.get_table(Schedule, {"course_id": course_id}, relationships=relationships)
+    return [(s.id, s.group.name, s.course.name, s.subject.name, s.teacher.name, s.room.name) for s in schedules]
+
+
+async def table_after(db, course_id):
+    return await db.select_columns(Schedule, TABLE_COLUMNS, {"course_id": course_id})
+
+
+CASES = [
+    ("teachers", teachers_before, teachers_after),
+    ("groups", groups_before, groups_after),
+    ("schedule table", table_before, table_after),
+]
+
+
+async def measure(db, func, course_id, repeat):
+    await func(db, course_id)  # isitish
+    rows = 0
+    started = perf_counter()
+    for _ in range(repeat):
+        rows += len(await func(db, course_id))
+    elapsed = perf_counter() - started
+    return rows / repeat, rows / elapsed if elapsed else 0.0
+
+
+async def main(repeat: int, course_id: int) -> None:
+    db = UncachedService()
+    print(f"{'case':<16} {'rows':>8} {'before rows/s':>14} {'after rows/s':>14} {'speedup':>8}")
+    for name, before, after in CASES:
+        rows, before_rate = await measure(db, before, course_id, repeat)
+        _, after_rate = await measure(db, after, course_id, repeat)
+        speedup = after_rate / before_rate if before_rate else 0.0
+        print(f"{name:<16} {rows:>8.0f} {before_rate:>14.0f} {after_rate:>14.0f} {speedup:>7.2f}x")
+    await db.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="ORM vs column projection benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--course-id", type=int, default=1)
+    args = parser.parse_args()
+    run(main(args.repeat, args.course_id))
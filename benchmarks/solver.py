@@ -0,0 +1,57 @@
+"""
+Dars jadvali yechuvchisi uchun benchmark: yechish vaqti va instansiya hajmi.
+
+Ishga tushirish:
+    python -m benchmarks.solver --groups 25 50 100 200 400
+"""
+from argparse import ArgumentParser
+from random import Random
+from typing import List, Tuple
+from SolverService import CELLS, Lesson, TimetableSolver
+
+
+def make_instance(groups: int, subjects: int = 8, lessons_per_subject: int = 2, load: float = 0.75,
+                  seed: int = 0) -> Tuple[List[Lesson], int, int]:
+    """
+    Sintetik kurs: har bir guruhda `subjects` ta fan, har fanga alohida o'qituvchilar hovuzi
+    va ikki turdagi xonalar. `load` - o'qituvchi/xonalarning haftalik bandlik ulushi.
+    """
+    rng = Random(seed)
+    lessons_total = groups * subjects * lessons_per_subject
+    per_subject = max(1, round(groups * lessons_per_subject / (CELLS * load)))
+    teacher_pools = [list(range(s * per_subject + 1, (s + 1) * per_subject + 1)) for s in range(subjects)]
+    room_count = max(2, round(lessons_total / (CELLS * load)))
+    lecture_rooms = list(range(1, room_count // 2 + 1))
+    practice_rooms = list(range(room_count // 2 + 1, room_count + 1))
+
+    lessons = []
+    for group_id in range(1, groups + 1):
+        for subject in range(subjects):
+            rooms = lecture_rooms if subject % 2 == 0 else practice_rooms
+            for _ in range(lessons_per_subject):
+                lessons.append(Lesson(group_id, subject + 1, teacher_pools[subject], rooms))
+    rng.shuffle(lessons)
+    return lessons, per_subject * subjects, room_count
+
+
+def main() -> None:
+    parser = ArgumentParser(description="TimetableSolver benchmark")
+    parser.add_argument("--groups", type=int, nargs="+", default=[25, 50, 100, 200, 400])
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--lessons-per-subject", type=int, default=2)
+    parser.add_argument("--load", type=float, default=0.75)
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'groups':>7} {'lessons':>8} {'teachers':>9} {'rooms':>6} {'placed':>8} {'iters':>7} {'seconds':>8}")
+    for groups in args.groups:
+        lessons, teachers, rooms = make_instance(groups, args.subjects, args.lessons_per_subject, args.load,
+                                                 args.seed)
+        result = TimetableSolver(lessons, time_limit=args.time_limit, seed=args.seed).solve()
+        print(f"{groups:>7} {len(lessons):>8} {teachers:>9} {rooms:>6} {len(result.placements):>8} "
+              f"{result.iterations:>7} {result.elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+So'rov shakllari keshi (`StatementCache`) micro-benchmarki.
+
+1. Bazasiz: `select(model).where(...)` ni har chaqiruvda qurib, kesh kalitini hisoblab kompilyatsiya keshidan
+   olish (avvalgi yo'l) va keshlangan so'rovni qayta ishlatish - bitta chaqiruv vaqti (mikrosoniya).
+   `IN` ro'yxati uzunligi o'zgarganda hosil bo'ladigan turli SQL matnlari soni ham ko'rsatiladi: har biri
+   asyncpg da alohida prepared statement.
+2. `--database` bilan: `get_for_schedule` ni so'rov keshi o'chirilgan va yoqilgan holda - so'rov/soniya.
+
+Ishga tushirish:
+    python -m benchmarks.statements --repeat 20000
+    python -m benchmarks.statements --database --repeat 500   # DATABASE_URL sozlangan bo'lishi kerak
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.util import LRUCache
+from sqlmodel import select
+from DatabaseService import DatabaseService1, Schedule, Teacher
+from DatabaseService.statements import StatementCache
+
+DIALECT = postgresql.asyncpg.dialect()
+
+# Bandlik endpointlari so'rovlari shakllari: katak bo'yicha jadval va bo'sh o'qituvchilar
+CASES: List[Tuple[str, Any, Callable[[int], Dict[str, Any]]]] = [
+    ("schedule cell", Schedule, lambda i: {"day": i % 6 + 1, "time_slot": i % 4 + 1}),
+    ("other courses", Schedule, lambda i: {"course_id": {"not_in": list(range(1, i % 20 + 2))}}),
+    ("free teachers", Teacher, lambda i: {"unavailable": {"bits_clear": 1 << (i % 24)},
+                                          "id": {"in": list(range(1, i % 30 + 2))}}),
+]
+
+
+def rebuild(model: Any, filters: Dict[str, Any], compiled: LRUCache) -> Any:
+    """Avvalgi yo'l: konstruksiya qaytadan quriladi, SQLAlchemy kesh kaliti bo'yicha kompilyatsiyani qidiradi."""
+    query = select(model).where(and_(*DatabaseService1.build_conditions(model, filters)))
+    key = query._generate_cache_key().key
+    if key not in compiled:
+        compiled[key] = query.compile(dialect=DIALECT)
+    return compiled[key]
+
+
+def reuse(model: Any, filters: Dict[str, Any], compiled: LRUCache, cache: StatementCache) -> Any:
+    query, _ = cache.select(model, filters)
+    key = query._generate_cache_key().key  # bir xil ob'ekt - kalit memoizatsiya qilingan
+    if key not in compiled:
+        compiled[key] = query.compile(dialect=DIALECT)
+    return compiled[key]
+
+
+def sql_texts(statements: List[Any]) -> int:
+    """Bajarilishdagi (ro'yxatlar ochilgandan keyingi) turli SQL matnlari soni."""
+    return len({str(statement.compile(dialect=DIALECT, compile_kwargs={"render_postcompile": True}))
+                for statement in statements})
+
+
+def offline(repeat: int) -> None:
+    print(f"{'case':<16} {'before us':>10} {'after us':>10} {'speedup':>8} {'SQL texts':>10}")
+    for name, model, make in CASES:
+        inputs = [make(i) for i in range(repeat)]
+        compiled, cache = LRUCache(500), StatementCache()
+        started = perf_counter()
+        for filters in inputs:
+            rebuild(model, filters, compiled)
+        before = (perf_counter() - started) / repeat * 1e6
+        compiled = LRUCache(500)
+        started = perf_counter()
+        for filters in inputs:
+            reuse(model, filters, compiled, cache)
+        after = (perf_counter() - started) / repeat * 1e6
+        sample = inputs[:50]
+        texts_before = sql_texts([select(model).where(and_(*DatabaseService1.build_conditions(model, filters)))
+                                  for filters in sample])
+        texts_after = sql_texts([cache.select(model, filters)[0] for filters in sample])
+        print(f"{name:<16} {before:>10.1f} {after:>10.1f} {before / after:>7.2f}x {texts_before:>4} -> {texts_after:<4}")
+
+
+class UncachedStatements(DatabaseService1):
+    CACHED_MODELS = frozenset()
+    STATEMENTS = StatementCache(max_size=0)
+
+
+class CachedStatements(DatabaseService1):
+    CACHED_MODELS = frozenset()
+    STATEMENTS = StatementCache()
+
+
+async def online(repeat: int) -> None:
+    print(f"{'case':<16} {'before q/s':>11} {'after q/s':>11} {'speedup':>8}")
+    for name, model, make in CASES:
+        rates = []
+        for service in (UncachedStatements(), CachedStatements()):
+            await service.get_for_schedule(model, make(0))  # isitish
+            started = perf_counter()
+            for i in range(repeat):
+                await service.get_for_schedule(model, make(i))
+            rates.append(repeat / (perf_counter() - started))
+        print(f"{name:<16} {rates[0]:>11.0f} {rates[1]:>11.0f} {rates[1] / rates[0]:>7.2f}x")
+    print("statement cache:", CachedStatements.STATEMENTS.stats())
+    await DatabaseService1.dispose()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Statement cache micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--database", action="store_true", help="bazaga haqiqiy so'rovlar bilan o'lchash")
+    args = parser.parse_args()
+    if args.database:
+        run(online(args.repeat))
+    else:
+        offline(args.repeat)
@@ -0,0 +1,77 @@
+"""
+Workerlar soni bo'yicha o'tkazuvchanlik: har bir N uchun `run.py --workers N` ishga tushiriladi,
+`benchmarks.load` yuklamasi beriladi va umumiy req/s hamda p50/p95/p99 solishtiriladi.
+Havza o'lchami har bir N uchun ulanishlar byudjetidan hisoblanadi (`DatabaseService.pool_budget`).
+
+Ishga tushirish (avval `python -m benchmarks.dataset` bilan ma'lumot yuklang):
+    python -m benchmarks.workers --workers 1 2 4 8 --duration 20 --concurrency 64 --output workers.json
+"""
+from argparse import ArgumentParser, Namespace
+from asyncio import run, sleep
+from json import dump
+from os import environ
+from signal import SIGTERM
+from subprocess import Popen
+from sys import executable
+from time import monotonic
+from typing import Dict, List
+from aiohttp import ClientSession, ClientTimeout
+from DatabaseService import pool_budget
+from . import load
+
+
+async def wait_healthy(base_url: str, timeout: float) -> None:
+    deadline = monotonic() + timeout
+    async with ClientSession(base_url=base_url, timeout=ClientTimeout(total=2)) as http:
+        while monotonic() < deadline:
+            try:
+                async with http.get("/health") as response:
+                    if response.status == 200:
+                        return
+            except Exception:
+                pass
+            await sleep(0.5)
+    raise SystemExit(f"Server at {base_url} did not become healthy in {timeout:.0f}s")
+
+
+def measure(workers: int, args) -> Dict:
+    """`workers` ta worker bilan serverni ishga tushiradi, yuklama beradi va to'xtatadi."""
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = Popen([executable, "run.py", "--workers", str(workers), "--port", str(args.port), "--host", "127.0.0.1",
+                    "--log-level", "warning"], env={**environ, "WEB_CONCURRENCY": str(workers)})
+    try:
+        run(wait_healthy(base_url, args.startup_timeout))
+        report = run(load.main(Namespace(base_url=base_url, concurrency=args.concurrency, duration=args.duration,
+                                         write_ratio=args.write_ratio, timeout=60.0, seed=args.seed)))
+    finally:
+        server.send_signal(SIGTERM)
+        server.wait()
+    pool_size, max_overflow = pool_budget(workers)
+    return {"workers": workers, "pool_size": pool_size, "max_overflow": max_overflow, **report["total"]}
+
+
+def print_table(rows: List[Dict]) -> None:
+    print(f"{'workers':>7} {'pool':>9} {'rps':>9} {'speedup':>8} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    base = rows[0]["rps"] or 1
+    for row in rows:
+        print(f"{row['workers']:>7} {row['pool_size']:>4}+{row['max_overflow']:<4} {row['rps']:>9.1f} "
+              f"{row['rps'] / base:>7.2f}x {row['errors']:>5} {row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Throughput across worker counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per worker count")
+    parser.add_argument("--write-ratio", type=float, default=0.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results here")
+    args = parser.parse_args()
+
+    results = [measure(workers, args) for workers in args.workers]
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            dump(results, file, indent=2)
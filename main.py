@@ -1,14 +1,75 @@
+from asyncio import create_task
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from DatabaseService import DatabaseCore, occupancy_index, init_db_core, close_db_core, POOL_WARMUP_CONNECTIONS, \
+    Course, Group, Room, Schedule, Subject, Teacher, query_cache
+from LoggerService import LoggerService
+from MetricsService import MetricsMiddleware
+from FeedService import change_bus
+from ServerService import on_drain
 from api import router
+from api.changes import prune_deleted_rows
+from api.feed import apply_remote_change, publish_invalidation
+from api.rooms_api import ROOM_COLUMNS
+from api.schedules import TABLE_COLUMNS
 
-app = FastAPI()
+
+def hot_statements(db: DatabaseCore) -> list:
+    """Eng ko'p bajariladigan so'rovlar: har bir isitilgan ulanishda oldindan tayyorlab qo'yiladi."""
+    return [
+        db.columns_query(Schedule, TABLE_COLUMNS, {"course_id": 0}),
+        db.columns_query(Group, ["id", "name"], {"course_id": 0}),
+        db.page_query(Group, ["name", "course.name", "course.description"]),
+        db.page_query(Course, ["name", "description"]),
+        db.page_query(Teacher, ["id", "name", "sciencename", "classtime"]),
+        db.page_query(Room, ROOM_COLUMNS),
+        db.page_query(Subject, ["id", "name", "subject_type", "course_name"]),
+    ]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Yagona xizmat ob'ektini yaratadi, havzani isitadi va to'xtashda ulanishlarni yopadi."""
+    db = init_db_core(LoggerService())
+    try:
+        await db.warm_up(POOL_WARMUP_CONNECTIONS, hot_statements(db))
+    except Exception as e:
+        LoggerService.log_exception(e, "Connection pool warm-up failed")
+    # Bandlik indeksi; xatolikda endpointlar bazaga murojaat qiladi
+    try:
+        await occupancy_index.build(db)
+    except Exception as e:
+        LoggerService.log_exception(e, "Occupancy index build failed")
+    # O'zgarishlar shinasi; Postgres ulanmasa hodisalar shu worker ichida tarqatiladi
+    change_bus.on_remote(apply_remote_change)
+    # Jarayon ichidagi kesh: boshqa workerlar ma'lumotnoma jadvallari o'zgarganini shina orqali bilishadi
+    if not query_cache.shared:
+        query_cache.on_invalidate(publish_invalidation)
+    # To'xtayotgan worker SSE oqimlarini yopadi: navbatma-navbat qayta ishga tushirish kutib qolmaydi
+    on_drain(change_bus.drain)
+    try:
+        await change_bus.start()
+    except Exception as e:
+        LoggerService.log_exception(e, "Change feed start failed")
+        change_bus.spawn(change_bus.reconnect())
+    # O'chirilgan yozuvlar izi CHANGES_RETENTION_DAYS dan o'smaydi
+    pruning = create_task(prune_deleted_rows(db))
+    yield
+    pruning.cancel()
+    await change_bus.stop()
+    await close_db_core()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(router=router)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+
 @app.get("/")
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -0,0 +1,83 @@
+"""schedule booking constraints and indexes
+
+Revision ID: b7e2c41f9a30
+Revises: 3fa7d9071536
+Create Date: 2026-10-18 10:12:41.218305
+
+Mavjud jadvalda ikki marta band qilingan yozuvlar bo'lsa, indeks/cheklov yaratilmaydi: migratsiya ularning
+ro'yxati (cheklov, katak va schedules.id lar) bilan to'xtaydi. Ularni tuzatib (yozuvni boshqa katakka ko'chirib
+yoki ortiqchasini o'chirib, masalan `DELETE FROM schedules WHERE id IN (...)`), migratsiyani qayta ishga tushiring.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41f9a30'
+down_revision: Union[str, None] = '3fa7d9071536'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Har bir cheklovni buzadigan mavjud qatorlar: (kalit, day, time_slot, schedules.id lar)
+CLASH_QUERIES = {
+    'uq_schedules_group_slot': (
+        'SELECT group_id, day, time_slot, array_agg(id ORDER BY id) FROM schedules '
+        'GROUP BY group_id, day, time_slot HAVING count(*) > 1 ORDER BY 1, 2, 3'
+    ),
+    'ex_schedules_teacher_slot': (
+        'SELECT teacher_id, day, time_slot, array_agg(id ORDER BY id) FROM schedules '
+        'GROUP BY teacher_id, day, time_slot HAVING count(DISTINCT room_id) > 1 ORDER BY 1, 2, 3'
+    ),
+    'ex_schedules_room_slot': (
+        'SELECT room_id, day, time_slot, array_agg(id ORDER BY id) FROM schedules '
+        'GROUP BY room_id, day, time_slot HAVING count(DISTINCT teacher_id) > 1 ORDER BY 1, 2, 3'
+    ),
+}
+# Xabarda ko'rsatiladigan to'qnashuvlar soni (har bir cheklov uchun)
+CLASH_REPORT_LIMIT = 50
+
+
+def check_clashes() -> None:
+    """Cheklovlarni buzadigan mavjud yozuvlar bo'lsa, ularning ro'yxati bilan to'xtaydi."""
+    if context.is_offline_mode():
+        return  # --sql: baza yo'q, tekshiruv yozilgan skriptda emas
+    bind = op.get_bind()
+    problems = []
+    for name, query in CLASH_QUERIES.items():
+        rows = bind.exec_driver_sql(query).fetchall()
+        for key, day, time_slot, ids in rows[:CLASH_REPORT_LIMIT]:
+            problems.append(f'{name}: {key} day={day} time_slot={time_slot} schedules.id={list(ids)}')
+        if len(rows) > CLASH_REPORT_LIMIT:
+            problems.append(f'{name}: ... and {len(rows) - CLASH_REPORT_LIMIT} more')
+    if problems:
+        raise RuntimeError('schedules contains double bookings; fix these rows and rerun the migration:\n'
+                           + '\n'.join(problems))
+
+
+def upgrade() -> None:
+    check_clashes()
+    # Guruh bir katakda faqat bitta darsda bo'lishi mumkin
+    op.create_index('uq_schedules_group_slot', 'schedules', ['group_id', 'day', 'time_slot'], unique=True)
+    # get_schedule_table dagi course_id filtri uchun
+    op.create_index('ix_schedules_course_id', 'schedules', ['course_id'])
+
+    # O'qituvchi/xona bir katakda bir nechta guruhga birgalikda (ma'ruza) dars o'tishi mumkin,
+    # lekin o'qituvchi ikki xonada yoki xonada ikki o'qituvchi bo'lishi mumkin emas.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        'ALTER TABLE schedules ADD CONSTRAINT ex_schedules_teacher_slot '
+        'EXCLUDE USING gist (teacher_id WITH =, day WITH =, time_slot WITH =, room_id WITH <>)'
+    )
+    op.execute(
+        'ALTER TABLE schedules ADD CONSTRAINT ex_schedules_room_slot '
+        'EXCLUDE USING gist (room_id WITH =, day WITH =, time_slot WITH =, teacher_id WITH <>)'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ex_schedules_room_slot', 'schedules')
+    op.drop_constraint('ex_schedules_teacher_slot', 'schedules')
+    op.drop_index('ix_schedules_course_id', table_name='schedules')
+    op.drop_index('uq_schedules_group_slot', table_name='schedules')
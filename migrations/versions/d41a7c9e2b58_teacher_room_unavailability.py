@@ -0,0 +1,34 @@
+"""teacher and room unavailability masks
+
+Revision ID: d41a7c9e2b58
+Revises: b7e2c41f9a30
+Create Date: 2026-10-18 14:03:27.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c9e2b58'
+down_revision: Union[str, None] = 'b7e2c41f9a30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 6 x 4 haftalik setka: bit `(day - 1) * 4 + (time_slot - 1)` - shu katakda mavjud emas (0 - doim mavjud)
+    op.add_column('teachers', sa.Column('unavailable', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rooms', sa.Column('unavailable', sa.Integer(), server_default='0', nullable=False))
+    # Niqob 24 bitdan (FULL_MASK) oshmaydi
+    op.create_check_constraint('ck_teachers_unavailable', 'teachers', 'unavailable BETWEEN 0 AND 16777215')
+    op.create_check_constraint('ck_rooms_unavailable', 'rooms', 'unavailable BETWEEN 0 AND 16777215')
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_rooms_unavailable', 'rooms', type_='check')
+    op.drop_constraint('ck_teachers_unavailable', 'teachers', type_='check')
+    op.drop_column('rooms', 'unavailable')
+    op.drop_column('teachers', 'unavailable')
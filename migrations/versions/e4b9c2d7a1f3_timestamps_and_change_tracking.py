@@ -0,0 +1,95 @@
+"""timestamptz created_at/updated_at and deleted rows for change tracking
+
+Revision ID: e4b9c2d7a1f3
+Revises: d41a7c9e2b58
+Create Date: 2026-10-18 16:41:08.307215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c2d7a1f3'
+down_revision: Union[str, None] = 'd41a7c9e2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('courses', 'groups', 'teachers', 'teacher_infos', 'subjects', 'lesson_types', 'rooms', 'schedules')
+
+# Eski ustunlar Asia/Tashkent vaqtida "%d:%m:%y" va "%H:%M:%S" satrlari edi
+LEGACY_TIMEZONE = 'Asia/Tashkent'
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # now() STABLE: mavjud qatorlar jadvalni qayta yozmasdan bitta qiymat oladi, keyin eski satrlardan to'ldiriladi
+        op.add_column(table, sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(),
+                                       nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(),
+                                       nullable=False))
+        op.execute(
+            f"UPDATE {table} SET created_at = to_timestamp(created_date || ' ' || created_time, "
+            f"'DD:MM:YY HH24:MI:SS')::timestamp AT TIME ZONE '{LEGACY_TIMEZONE}' "
+            f"WHERE created_date ~ '^\\d{{2}}:\\d{{2}}:\\d{{2}}$' AND created_time ~ '^\\d{{2}}:\\d{{2}}:\\d{{2}}$'"
+        )
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        op.drop_column(table, 'created_date')
+        op.drop_column(table, 'created_time')
+        op.create_index(f'ix_{table}_created_at', table, ['created_at'])
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+
+    # O'chirilgan yozuvlar izi (/api/changes)
+    op.create_table(
+        'deleted_rows',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_deleted_rows_table_deleted_at', 'deleted_rows', ['table_name', 'deleted_at'])
+    op.create_index('ix_deleted_rows_deleted_at', 'deleted_rows', ['deleted_at'])
+
+    # updated_at ni ilova emas, baza qo'yadi: psql yoki skriptlardagi o'zgarishlar ham lentaga tushadi
+    op.execute(
+        "CREATE FUNCTION set_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN NEW.updated_at := now(); RETURN NEW; END $$"
+    )
+    # Statement darajasida: ko'p qatorli DELETE bitta INSERT ... SELECT bilan yoziladi
+    op.execute(
+        "CREATE FUNCTION record_deletions() RETURNS trigger LANGUAGE plpgsql AS $$ "
+        "BEGIN INSERT INTO deleted_rows (table_name, row_id) SELECT TG_TABLE_NAME, id FROM old_rows; "
+        "RETURN NULL; END $$"
+    )
+    for table in TABLES:
+        op.execute(f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+                   f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()")
+        op.execute(f"CREATE TRIGGER {table}_record_deletions AFTER DELETE ON {table} "
+                   f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION record_deletions()")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_record_deletions ON {table}")
+        op.execute(f"DROP TRIGGER {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION record_deletions()")
+    op.execute("DROP FUNCTION set_updated_at()")
+    op.drop_index('ix_deleted_rows_deleted_at', table_name='deleted_rows')
+    op.drop_index('ix_deleted_rows_table_deleted_at', table_name='deleted_rows')
+    op.drop_table('deleted_rows')
+
+    for table in TABLES:
+        op.add_column(table, sa.Column('created_date', sa.String(), nullable=True))
+        op.add_column(table, sa.Column('created_time', sa.String(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET created_date = to_char(created_at AT TIME ZONE '{LEGACY_TIMEZONE}', 'DD:MM:YY'), "
+            f"created_time = to_char(created_at AT TIME ZONE '{LEGACY_TIMEZONE}', 'HH24:MI:SS')"
+        )
+        op.alter_column(table, 'created_date', nullable=False)
+        op.alter_column(table, 'created_time', nullable=False)
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        op.drop_index(f'ix_{table}_created_at', table_name=table)
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'created_at')
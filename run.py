@@ -1,27 +1,81 @@
-from subprocess import Popen, PIPE
-from threading import Thread
+"""
+Ilovani ishga tushirish.
 
+    python run.py                       # production: WEB_CONCURRENCY (yoki CPU soni) ta worker
+    python run.py --workers 4 --pid /tmp/dars.pid
+    python run.py reload --pid /tmp/dars.pid   # navbatma-navbat qayta ishga tushirish (SIGHUP)
+    python run.py stop --pid /tmp/dars.pid     # ochiq so'rovlar tugagach to'xtatish (SIGTERM)
+    python run.py --dev                 # bitta jarayon, kod o'zgarsa qayta yuklanadi
+    python run.py --ngrok               # qo'shimcha ravishda ngrok tunnelini ochadi (ngrok.yml)
+"""
+from argparse import ArgumentParser
+from logging import INFO, basicConfig, getLogger
+from os import getpid, kill, remove
+from signal import SIGHUP, SIGTERM
+from subprocess import PIPE, Popen
+from typing import Optional
+from ServerService import Supervisor, WEB_APP, WEB_CONCURRENCY, WEB_GRACEFUL_TIMEOUT, WEB_HOST, WEB_PID_FILE, \
+    WEB_PORT, WEB_READY_TIMEOUT, default_workers
 
-def ngrok_config_path():
-    ngrok_command = f"ngrok start --config=ngrok.yml app"
-    ngrok_process = Popen(ngrok_command.split(), stdout=PIPE)
+logger = getLogger("supervisor")
 
-    ngrok_url = None
-    for line in ngrok_process.stdout:
+
+def start_ngrok() -> Popen:
+    """ngrok tunnelini ochadi va tashqi manzilni logga yozadi."""
+    process = Popen("ngrok start --config=ngrok.yml app".split(), stdout=PIPE)
+    for line in process.stdout:
         line = line.decode("utf-8").strip()
         if line.startswith("Forwarding"):
-            ngrok_url = line.split()[1]
+            logger.info("ngrok: %s", line.split()[1])
             break
-    ngrok_process.terminate()
+    return process
+
+
+def signal_master(pid_file: str, signum: int) -> None:
+    with open(pid_file, encoding="utf-8") as file:
+        kill(int(file.read().strip()), signum)
+
+
+def serve(args) -> None:
+    if args.dev:
+        from uvicorn import run
 
+        run(args.app, host=args.host, port=args.port, reload=True)
+        return
+    supervisor = Supervisor(args.app, args.host, args.port, args.workers, graceful_timeout=args.graceful_timeout,
+                            ready_timeout=args.ready_timeout, options={"log_level": args.log_level})
+    if args.pid:
+        with open(args.pid, "w", encoding="utf-8") as file:
+            file.write(str(getpid()))
+    tunnel: Optional[Popen] = start_ngrok() if args.ngrok else None
+    try:
+        supervisor.run()
+    finally:
+        if tunnel is not None:
+            tunnel.terminate()
+        if args.pid:
+            remove(args.pid)
 
-def start_uvicon():
-    uvicorn_command = "python -m uvicorn main:app --host 0.0.0.0 --port 8002"
-    uvicorn_process = Popen(uvicorn_command.split(), stdout=PIPE)
-    uvicorn_process.communicate()
 
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Dars jadvali server launcher")
+    parser.add_argument("command", nargs="?", choices=["serve", "reload", "stop"], default="serve")
+    parser.add_argument("--app", default=WEB_APP)
+    parser.add_argument("--host", default=WEB_HOST)
+    parser.add_argument("--port", type=int, default=WEB_PORT)
+    parser.add_argument("--workers", type=int, default=int(WEB_CONCURRENCY or 0) or default_workers())
+    parser.add_argument("--graceful-timeout", type=float, default=WEB_GRACEFUL_TIMEOUT)
+    parser.add_argument("--ready-timeout", type=float, default=WEB_READY_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--pid", default=WEB_PID_FILE, help="master PID file (reload/stop uchun)")
+    parser.add_argument("--dev", action="store_true", help="bitta jarayon, --reload bilan")
+    parser.add_argument("--ngrok", action="store_true")
+    args = parser.parse_args()
 
-fast = Thread(target=start_uvicon)
-ngrok = Thread(target=ngrok_config_path)
-fast.start()
-ngrok.start()
+    basicConfig(level=INFO, format="%(asctime)s [supervisor %(process)d] %(levelname)s %(message)s")
+    if args.command == "serve":
+        serve(args)
+    else:
+        if not args.pid:
+            parser.error("--pid (or WEB_PID_FILE) is required for reload/stop")
+        signal_master(args.pid, SIGHUP if args.command == "reload" else SIGTERM)
@@ -19,5 +19,11 @@ setup(
         "sqlmodel==0.0.16",
         "tenacity==8.2.3",
         "jinja2==3.1.2",
+        "orjson==3.8.3",
+        "msgpack==1.0.5",
     ],
+    extras_require={
+        # CACHE_BACKEND=redis uchun: `pip install .[redis]`
+        "redis": ["aiocache[redis]==0.12.3"],
+    },
 )
@@ -12,16 +12,11 @@ const CoursesManager = {
 
     async loadCourses() {
         try {
-            const response = await fetch('/api/courses/');
-            if (response.ok) {
-                const courses = await response.json();
-                console.log('Courses loaded:', courses);
-                courses.forEach(course => {
-                    this.addCourseToTable(course);
-                });
-            } else {
-                throw new Error('Courses could not be loaded.');
-            }
+            const courses = await fetchAllPages('/api/courses/');
+            console.log('Courses loaded:', courses);
+            courses.forEach(course => {
+                this.addCourseToTable(course);
+            });
         } catch (error) {
             console.error('Error loading courses:', error);
             alert('Kurslarni yuklashda xatolik yuz berdi.');
@@ -38,13 +38,8 @@ const GroupsManager = {
 
     async loadGroups() {
         try {
-            const response = await fetch('/api/groups/');
-            if (response.ok) {
-                const groups = await response.json();
-                this.renderGroups(groups);
-            } else {
-                throw new Error('Guruhlarni yuklashda xatolik.');
-            }
+            const groups = await fetchAllPages('/api/groups/');
+            this.renderGroups(groups);
         } catch (error) {
             console.error('Guruhlarni yuklashda xatolik:', error);
             alert('Guruhlarni yuklashda xatolik yuz berdi.');
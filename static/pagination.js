@@ -0,0 +1,19 @@
+// Ro'yxat endpointlari sahifalab javob beradi: keyingi sahifa kursori X-Next-Cursor sarlavhasida keladi.
+// fetchAllPages barcha sahifalarni ketma-ket o'qib, bitta massiv qaytaradi.
+async function fetchAllPages(url) {
+    const items = [];
+    let cursor = null;
+    do {
+        const pageUrl = new URL(url, window.location.origin);
+        if (cursor) {
+            pageUrl.searchParams.set('cursor', cursor);
+        }
+        const response = await fetch(pageUrl);
+        if (!response.ok) {
+            throw new Error(`${url} yuklanmadi: ${response.status}`);
+        }
+        items.push(...await response.json());
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+}
@@ -18,8 +18,7 @@ const RoomsManager = {
     },
 
     loadRooms() {
-        fetch('/api/rooms/')
-            .then(response => response.json())
+        fetchAllPages('/api/rooms/')
             .then(rooms => {
                 this.roomsTable.tBodies[0].innerHTML = ''; // Jadvalni tozalash
                 rooms.forEach(room => {
@@ -69,12 +69,28 @@ const ScheduleManager = {
         }
     },
 
+    // Kurs bo'yicha bandlik matritsasidan katakda bo'sh ob'ektlar (har bir katak uchun so'rov yuborilmaydi)
+    freeItems(kind, dayNumber, timeSlot) {
+        const matrix = this.availability;
+        if (!matrix) {
+            return null;
+        }
+        const mask = atob(matrix.free[kind][(dayNumber - 1) * matrix.slots + (timeSlot - 1)]);
+        const items = matrix[`${kind}s`];
+        return items.id
+            .map((id, index) => ({id, name: items.name[index]}))
+            .filter(item => (item.id >> 3) < mask.length && (mask.charCodeAt(item.id >> 3) >> (item.id & 7)) & 1);
+    },
+
     async loadAvailableTeachers(dayNumber, timeSlot) {
         try {
-            const response = await fetch(`/api/available-teachers/?day=${dayNumber}&time_slot=${timeSlot}`);
-            const teachers = await response.json();
+            let teachers = this.freeItems('teacher', dayNumber, timeSlot);
+            if (!teachers) {
+                const response = await fetch(`/api/available-teachers/?day=${dayNumber}&time_slot=${timeSlot}`);
+                teachers = await response.json();
+            }
 
-            if (Array.isArray(teachers)) {
+            if (Array.isArray(teachers) && teachers.length > 0) {
                 this.populateDropdown(this.teacherSelect, teachers, 'O\'qituvchi tanlang...');
             } else {
                 this.teacherSelect.innerHTML = '<option value="">Bo\'sh o\'qituvchilar yo\'q</option>';
@@ -87,10 +103,13 @@ const ScheduleManager = {
 
     async loadAvailableRooms(dayNumber, timeSlot) {
         try {
-            const response = await fetch(`/api/available-rooms/?day=${dayNumber}&time_slot=${timeSlot}`);
-            const rooms = await response.json();
+            let rooms = this.freeItems('room', dayNumber, timeSlot);
+            if (!rooms) {
+                const response = await fetch(`/api/available-rooms/?day=${dayNumber}&time_slot=${timeSlot}`);
+                rooms = await response.json();
+            }
 
-            if (Array.isArray(rooms)) {
+            if (Array.isArray(rooms) && rooms.length > 0) {
                 this.populateDropdown(this.roomSelect, rooms, 'Xona tanlang...');
             } else {
                 this.roomSelect.innerHTML = '<option value="">Bo\'sh xonalar yo\'q</option>';
@@ -128,17 +147,30 @@ const ScheduleManager = {
 
     async handleCourseChange(event) {
         const courseId = event.target.value;
+        if (courseId) {
+            await this.loadCourse(courseId);
+            this.connectFeed(courseId);
+        }
+    },
+
+    async loadAvailability(courseId) {
+        const response = await fetch(`/api/schedule/availability/${courseId}`);
+        this.availability = response.ok ? await response.json() : null;
+        this.availabilityStale = false;
+    },
+
+    async loadCourse(courseId) {
         if (courseId) {
             try {
-                const [groupsResponse, scheduleResponse] = await Promise.all([
-                    fetch(`/api/schedule/${courseId}`),
-                    fetch(`/api/schedule/table/${courseId}`)
+                const [gridResponse] = await Promise.all([
+                    fetch(`/api/schedule/grid/${courseId}`),
+                    this.loadAvailability(courseId)
                 ]);
-                const groups = await groupsResponse.json();
-                const scheduleData = await scheduleResponse.json();
+                const grid = await gridResponse.json();
+                const groups = grid.groups.id.map((id, index) => ({id, name: grid.groups.name[index]}));
 
                 if (groups.length > 0) {
-                    this.renderSchedule(scheduleData, groups);
+                    this.renderSchedule(grid, groups);
                 } else {
                     this.showToast("Guruhlar topilmadi!", "error");
                     this.scheduleTableBody.innerHTML = "";
@@ -150,6 +182,89 @@ const ScheduleManager = {
         }
     },
 
+    // O'zgarishlar oqimi: boshqa foydalanuvchilar yozuvlari faqat tegishli katakni yangilaydi
+    connectFeed(courseId) {
+        if (this.feed) {
+            this.feed.close();
+        }
+        if (!window.EventSource) {
+            return;
+        }
+        // Barcha kurslar hodisalari: boshqa kursdagi yozuv ham o'qituvchi/xona bandligini o'zgartiradi
+        this.feed = new EventSource('/api/schedule/feed');
+        const apply = event => this.applyChange(courseId, event.type, JSON.parse(event.data));
+        ['created', 'updated', 'deleted'].forEach(type => this.feed.addEventListener(type, apply));
+        this.feed.addEventListener('reset', event => {
+            const change = JSON.parse(event.data);
+            this.availabilityStale = true;
+            if (change.course_id === null || change.course_id === parseInt(courseId, 10)) {
+                this.loadCourse(courseId);
+            }
+        });
+    },
+
+    feedConnected() {
+        return Boolean(this.feed) && this.feed.readyState === EventSource.OPEN;
+    },
+
+    applyChange(courseId, type, change) {
+        this.availabilityStale = true;
+        if (change.course_id !== parseInt(courseId, 10)) {
+            return;
+        }
+        const row = change.schedule;
+        const key = `${row.day}-${row.time_slot}-${row.group_id}`;
+        if (!this.cells[key]) {
+            // Yangi guruh - setka tuzilishi o'zgargan
+            this.loadCourse(courseId);
+            return;
+        }
+        this.patchCell(key, type === 'deleted' ? undefined : {
+            id: row.id,
+            group: {id: row.group_id},
+            subject: {id: row.subject_id, name: `${row.subject_name} ${row.subject_subject_type}`},
+            teacher: {id: row.teacher_id, name: row.teacher_name},
+            room: {id: row.room_id, name: row.room_name},
+            day: row.day,
+            time_slot: row.time_slot
+        }, row.id);
+    },
+
+    patchCell(key, cellData, scheduleId) {
+        const cell = this.cells[key];
+        if (cellData === undefined && (!cell.data || cell.data.id !== scheduleId)) {
+            return;  // allaqachon o'chirilgan yoki katakda boshqa yozuv
+        }
+        cell.data = cellData;
+        cell.element.innerHTML = cellData ? this.createCellContent(cellData) : this.emptyCellContent();
+    },
+
+    emptyCellContent() {
+        return `
+            <div class="schedule-cell p-3 rounded-lg bg-white bg-opacity-20 hover:bg-opacity-40 transition-colors cursor-pointer">
+                <div class="text-sm italic text-indigo-700">Bo'sh</div>
+            </div>
+        `;
+    },
+
+    // Ustunli setkadagi katakni modal va katak ko'rinishi kutadigan obyektga o'giradi
+    gridCell(grid, day, timeSlot, groupIndex) {
+        const position = ((day - 1) * grid.slots + (timeSlot - 1)) * grid.groups.id.length + groupIndex;
+        if (grid.cells.schedule_id[position] === 0) {
+            return undefined;
+        }
+        const entry = (kind, index) => ({id: grid[kind].id[index], name: grid[kind].name[index]});
+        return {
+            id: grid.cells.schedule_id[position],
+            group: entry('groups', groupIndex),
+            subject: entry('subjects', grid.cells.subject[position]),
+            teacher: entry('teachers', grid.cells.teacher[position]),
+            room: entry('rooms', grid.cells.room[position]),
+            day,
+            time_slot: timeSlot
+        };
+    },
+
     renderSchedule(scheduleData, groups) {
         const daysOfWeek = ['Dushanba', 'Seshanba', 'Chorshanba', 'Payshanba', 'Juma', 'Shanba'];
         this.createTableHeader(groups);
@@ -173,6 +288,7 @@ const ScheduleManager = {
 
     fillTableBody(scheduleData, groups, daysOfWeek) {
         this.scheduleTableBody.innerHTML = '';
+        this.cells = {};
         const dayColors = [
             'from-blue-300 to-indigo-400',
             'from-green-300 to-teal-400',
@@ -200,26 +316,16 @@ const ScheduleManager = {
                 timeSlotCell.className = 'py-4 px-4 border-r border-white border-opacity-30 font-medium';
                 row.appendChild(timeSlotCell);
 
-                groups.forEach(group => {
+                groups.forEach((group, groupIndex) => {
                     const cell = document.createElement('td');
-                    const cellData = scheduleData.find(item =>
-                        item.day === dayIndex + 1 &&
-                        item.time_slot === timeSlot &&
-                        item.group.id === group.id
-                    );
-
-                    if (cellData) {
-                        cell.innerHTML = this.createCellContent(cellData);
-                    } else {
-                        cell.innerHTML = `
-                            <div class="schedule-cell p-3 rounded-lg bg-white bg-opacity-20 hover:bg-opacity-40 transition-colors cursor-pointer">
-                                <div class="text-sm italic text-indigo-700">Bo'sh</div>
-                            </div>
-                        `;
-                    }
+                    const cellData = this.gridCell(scheduleData, dayIndex + 1, timeSlot, groupIndex);
+                    const key = `${dayIndex + 1}-${timeSlot}-${group.id}`;
+                    this.cells[key] = {element: cell, data: cellData};
+                    cell.innerHTML = cellData ? this.createCellContent(cellData) : this.emptyCellContent();
 
                     cell.className = 'border-r border-white border-opacity-30 last:border-r-0 p-2';
-                    cell.addEventListener('click', () => this.openModal(cell, day, timeSlot, group.id, cellData));
+                    // Katak ma'lumoti o'zgarishlar oqimi bilan yangilanadi - bosilgan paytdagisi olinadi
+                    cell.addEventListener('click', () => this.openModal(cell, day, timeSlot, group.id, this.cells[key].data));
                     row.appendChild(cell);
                 });
 
@@ -247,6 +353,7 @@ const ScheduleManager = {
     async openModal(cell, day, timeSlot, groupId, cellData) {
         this.setLoading(true);
         this.selectedCell.value = `${day}-${timeSlot}-${groupId}`;
+        this.currentSchedule = cellData || null;
 
         // Initialize select2 for all dropdowns
         $(this.roomSelect).select2({
@@ -298,6 +405,9 @@ const ScheduleManager = {
         const courseId = this.courseSelect.value;
 
         try {
+            if (this.availabilityStale) {
+                await this.loadAvailability(courseId);
+            }
             // Load all necessary data
             await Promise.all([
                 this.loadAvailableTeachers(dayNumber, timeSlot),
@@ -443,10 +553,18 @@ const ScheduleManager = {
                 body: JSON.stringify(scheduleDataArray),
             });
 
+            if (response.status === 409) {
+                const conflict = await response.json();
+                throw new Error(conflict.detail);
+            }
+
             if (response.ok) {
                 this.showToast('Dars jadvali muvaffaqiyatli saqlandi');
                 this.closeModal();
-                await this.handleCourseChange({ target: { value: courseId } });
+                // Oqim ulangan bo'lsa, katak hodisa orqali yangilanadi
+                if (!this.feedConnected()) {
+                    await this.loadCourse(courseId);
+                }
             } else {
                 throw new Error('Dars jadvalini saqlashda xatolik yuz berdi');
             }
@@ -457,12 +575,6 @@ const ScheduleManager = {
     },
 
     async updateData() {
-        const [day, timeSlot, groupId] = this.selectedCell.value.split('-');
-        const daysOfWeekNumber = {
-            'Dushanba': 1, 'Seshanba': 2, 'Chorshanba': 3,
-            'Payshanba': 4, 'Juma': 5, 'Shanba': 6
-        };
-        const dayNumber = daysOfWeekNumber[day];
         const courseId = this.courseSelect.value;
 
         const updatedData = {
@@ -472,13 +584,8 @@ const ScheduleManager = {
         };
 
         try {
-            const scheduleResponse = await fetch(`/api/schedule/table/${courseId}`);
-            const scheduleData = await scheduleResponse.json();
-            const existingSchedule = scheduleData.find(item =>
-                item.day === parseInt(dayNumber, 10) &&
-                item.time_slot === parseInt(timeSlot, 10) &&
-                item.group.id === parseInt(groupId, 10)
-            );
+            // Katak ochilganda olingan yozuv - jadvalni qayta yuklash shart emas
+            const existingSchedule = this.currentSchedule;
 
             if (!existingSchedule) {
                 throw new Error('Mavjud bolmagan dars jadvali');
@@ -490,10 +597,22 @@ const ScheduleManager = {
                 body: JSON.stringify(updatedData),
             });
 
+            if (response.status === 404) {
+                throw new Error('Mavjud bolmagan dars jadvali');
+            }
+
+            if (response.status === 409) {
+                const conflict = await response.json();
+                throw new Error(conflict.detail);
+            }
+
             if (response.ok) {
                 this.showToast('Dars jadvali muvaffaqiyatli yangilandi');
                 this.closeModal();
-                await this.handleCourseChange({ target: { value: courseId } });
+                // Oqim ulangan bo'lsa, katak hodisa orqali yangilanadi
+                if (!this.feedConnected()) {
+                    await this.loadCourse(courseId);
+                }
             } else {
                 throw new Error('Dars jadvalini yangilashda xatolik yuz berdi');
             }
@@ -504,22 +623,10 @@ const ScheduleManager = {
     },
 
     async deleteData() {
-        const [day, timeSlot, groupId] = this.selectedCell.value.split('-');
-        const daysOfWeekNumber = {
-            'Dushanba': 1, 'Seshanba': 2, 'Chorshanba': 3,
-            'Payshanba': 4, 'Juma': 5, 'Shanba': 6
-        };
-        const dayNumber = daysOfWeekNumber[day];
         const courseId = this.courseSelect.value;
 
         try {
-            const scheduleResponse = await fetch(`/api/schedule/table/${courseId}`);
-            const scheduleData = await scheduleResponse.json();
-            const existingSchedule = scheduleData.find(item =>
-                item.day === parseInt(dayNumber, 10) &&
-                item.time_slot === parseInt(timeSlot, 10) &&
-                item.group.id === parseInt(groupId, 10)
-            );
+            const existingSchedule = this.currentSchedule;
 
             if (!existingSchedule) {
                 throw new Error('Mavjud bolmagan dars jadvali');
@@ -532,7 +639,10 @@ const ScheduleManager = {
             if (response.ok) {
                 this.showToast('Dars jadvali muvaffaqiyatli o\'chirildi');
                 this.closeModal();
-                await this.handleCourseChange({ target: { value: courseId } });
+                // Oqim ulangan bo'lsa, katak hodisa orqali yangilanadi
+                if (!this.feedConnected()) {
+                    await this.loadCourse(courseId);
+                }
             } else {
                 throw new Error('Dars jadvalini o\'chirishda xatolik yuz berdi');
             }
@@ -40,13 +40,8 @@ const SubjectsManager = {
 
     async loadSubjects() {
         try {
-            const response = await fetch('/api/subjects/');
-            if (response.ok) {
-                const subjects = await response.json();
-                this.renderSubjects(subjects);
-            } else {
-                throw new Error('Fanlarni yuklashda xatolik.');
-            }
+            const subjects = await fetchAllPages('/api/subjects/');
+            this.renderSubjects(subjects);
         } catch (error) {
             console.error('Fanlarni yuklashda xatolik:', error);
             alert('Fanlarni yuklashda xatolik yuz berdi.');
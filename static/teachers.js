@@ -18,8 +18,7 @@ const TeachersManager = {
     },
 
     loadTeachers() {
-        fetch('/api/teachers/')
-            .then(response => response.json())
+        fetchAllPages('/api/teachers/')
             .then(teachers => {
                 this.teachersTable.tBodies[0].innerHTML = '';
                 teachers.forEach(teacher => {
@@ -0,0 +1,118 @@
+"""
+Bazaga murojaat qiladigan testlar `TEST_DATABASE_URL` (asyncpg URL, masalan
+`postgresql+asyncpg://postgres@localhost:5432/dars_test`) berilganda ishlaydi, aks holda o'tkazib yuboriladi.
+Test bazasidagi jadvallar o'chirilib, modellardan qaytadan yaratiladi - ishchi bazani bermang.
+"""
+from asyncio import run
+from os import environ
+from typing import Any, Awaitable, Callable, Dict
+import pytest
+
+TEST_DATABASE_URL = environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # DatabaseService.config import paytida o'qiydi: ilova modullaridan oldin qo'yiladi
+    environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+# Migratsiya (e4b9c2d7a1f3) triggerlari: updated_at va o'chirilgan yozuvlar izini baza qo'yadi
+TRACKING_DDL = [
+    "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger LANGUAGE plpgsql AS $$ "
+    "BEGIN NEW.updated_at := now(); RETURN NEW; END $$",
+    "CREATE OR REPLACE FUNCTION record_deletions() RETURNS trigger LANGUAGE plpgsql AS $$ "
+    "BEGIN INSERT INTO deleted_rows (table_name, row_id) SELECT TG_TABLE_NAME, id FROM old_rows; "
+    "RETURN NULL; END $$",
+]
+TRACKED_TABLES = ("courses", "groups", "teachers", "teacher_infos", "subjects", "lesson_types", "rooms", "schedules")
+
+
+async def create_schema() -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    from sqlmodel import SQLModel
+    import DatabaseService  # noqa: F401 - modellar metadata ga yoziladi
+
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+            await connection.run_sync(SQLModel.metadata.drop_all)
+            await connection.run_sync(SQLModel.metadata.create_all)
+            for statement in TRACKING_DDL:
+                await connection.execute(text(statement))
+            for table in TRACKED_TABLES:
+                await connection.execute(text(
+                    f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+                    f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"))
+                await connection.execute(text(
+                    f"CREATE TRIGGER {table}_record_deletions AFTER DELETE ON {table} "
+                    f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION record_deletions()"))
+    finally:
+        await engine.dispose()
+
+
+async def reset_state(db) -> None:
+    """Jadvallarni bo'shatadi; jarayon ichidagi kesh, indeks va versiyalar ham eskiradi."""
+    from sqlalchemy import text
+    from sqlmodel import SQLModel
+    from DatabaseService import occupancy_index, query_cache
+
+    async with db.session_scope() as session:
+        tables = ", ".join(table.name for table in SQLModel.metadata.sorted_tables)
+        await session.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+        await session.commit()
+    for table in SQLModel.metadata.sorted_tables:
+        for mapper in SQLModel._sa_registry.mappers:
+            if mapper.local_table is table:
+                await query_cache.invalidate(mapper.class_.__name__)
+    occupancy_index.load([])
+
+
+@pytest.fixture(scope="session")
+def database() -> str:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL berilmagan")
+    run(create_schema())
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def app_run(database) -> Callable[[Callable[..., Awaitable[Any]]], Any]:
+    """
+    `scenario(client, db)` ni bitta hodisalar siklida bajaradi: toza jadvallar, ilovaga httpx mijozi
+    (lifespan ishlamaydi) va oxirida havza yopiladi - asyncpg ulanishlari sikllar o'rtasida o'tmaydi.
+    """
+    from httpx import ASGITransport, AsyncClient
+    from DatabaseService import close_db_core, init_db_core
+    from main import app
+
+    def runner(scenario: Callable[..., Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            db = init_db_core()
+            try:
+                await reset_state(db)
+                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                    return await scenario(client, db)
+            finally:
+                await close_db_core()
+
+        return run(main())
+
+    return runner
+
+
+async def seed_course(db) -> Dict[str, int]:
+    """Bitta kurs: guruh, fan, o'qituvchi va xona; identifikatorlar lug'ati."""
+    from DatabaseService import Course, Group, Room, Subject, Teacher
+
+    course_id, = await db.add_all([Course(name="Kurs")])
+    group_id, = await db.add_all([Group(name="101", course_id=course_id)])
+    subject_id, = await db.add_all([Subject(name="Matematika", subject_type="ma'ruza", course_id=str(course_id))])
+    teacher_id, = await db.add_all([Teacher(name="O'qituvchi", sciencename="Matematika", classtime="1-2")])
+    room_id, = await db.add_all([Room(name="A-1", roomstype="auditoriya")])
+    return {"course_id": course_id, "group_id": group_id, "subject_id": subject_id, "teacher_id": teacher_id,
+            "room_id": room_id}
+
+
+@pytest.fixture
+def seed() -> Callable[..., Awaitable[Dict[str, int]]]:
+    return seed_course
@@ -0,0 +1,20 @@
+from base64 import b64decode
+from SolverService import CELLS, cell_bit, cell_index
+from api.availability import build_availability
+
+
+def decode(value: str) -> int:
+    return int.from_bytes(b64decode(value), "little")
+
+
+def test_bits_follow_positions_in_id_array():
+    # Katta identifikatorlar bitmap hajmini oshirmasligi kerak
+    teachers = [{"id": 100000, "name": "A"}, {"id": 7, "name": "B", "unavailable": cell_bit(1, 2)}]
+    busy = {(1, 1): {"teacher": 1 << 100000}}
+    result = build_availability(1, busy, {"teacher": teachers})
+    free = [decode(value) for value in result["free"]["teacher"]]
+    assert result["teachers"]["id"] == [100000, 7]
+    assert free[cell_index(1, 1)] == 0b10
+    assert free[cell_index(1, 2)] == 0b01
+    assert all(mask == 0b11 for index, mask in enumerate(free) if index not in (cell_index(1, 1), cell_index(1, 2)))
+    assert len(free) == CELLS and max(len(b64decode(value)) for value in result["free"]["teacher"]) == 1
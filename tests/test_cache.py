@@ -0,0 +1,46 @@
+from asyncio import run
+import pytest
+from DatabaseService import CacheBackend, LRUCacheBackend, QueryCache, Room
+
+
+def test_backend_must_implement_interface():
+    class Partial(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_invalidation_hides_entries_loaded_before_it():
+    async def scenario():
+        cache = QueryCache(LRUCacheBackend(max_size=8))
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            return len(loads)
+
+        assert await cache.get_or_load("Room", "all", loader) == 1
+        assert await cache.get_or_load("Room", "all", loader) == 1
+        await cache.invalidate("Room")
+        assert await cache.get_or_load("Room", "all", loader) == 2
+        assert cache.stats()["hits"] == 1 and cache.stats()["invalidations"] == 1
+
+    run(scenario())
+
+
+def test_cached_get_returns_detached_copies(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        first = await db.get(Room, {"id": ids["room_id"]})
+        first[0].name = "o'zgartirilgan"
+        second = await db.get(Room, {"id": ids["room_id"]})
+        assert second[0] is not first[0] and second[0].name != "o'zgartirilgan"
+
+        # Id ro'yxati bo'yicha so'rovlar keshni to'ldirmaydi
+        misses = db.CACHE.stats()["misses"]
+        assert [room.id for room in await db.get(Room, {"id": {"in": [ids["room_id"]]}})] == [ids["room_id"]]
+        assert db.CACHE.stats()["misses"] == misses
+
+    app_run(scenario)
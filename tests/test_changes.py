@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from DatabaseService import DeletedRow, Room
+from api.changes import retention_start
+
+
+async def sync(client, params):
+    """Barcha sahifalarni `next` bo'yicha o'qiydi: (sahifalar, yig'ilgan upserted id, deleted id, kursor)."""
+    pages, upserted, deleted = [], [], []
+    body = None
+    while body is None or body["next"]:
+        response = await client.get("/api/changes", params=params if body is None else
+                                    {"entities": params["entities"], "after": body["next"], "limit": params["limit"]})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append(body)
+        upserted += [row["id"] for row in body["changes"]["rooms"]["upserted"]]
+        deleted += body["changes"]["rooms"]["deleted"]
+    return pages, upserted, deleted, body["cursor"]
+
+
+def test_changes_are_paged_with_continuation(app_run):
+    async def scenario(client, db):
+        ids = await db.add_all([Room(name=f"A-{i}", roomstype="auditoriya") for i in range(5)])
+        pages, upserted, _, cursor = await sync(client, {"entities": "rooms", "limit": 2})
+        assert [len(page["changes"]["rooms"]["upserted"]) for page in pages] == [2, 2, 1]
+        assert upserted == ids
+        assert all(page["cursor"] is None for page in pages[:-1]) and cursor is not None
+
+        assert await db.delete_many(Room, {"id": {"in": ids[:3]}})
+        pages, upserted, deleted, _ = await sync(client, {"entities": "rooms", "limit": 2, "since": cursor})
+        assert upserted == [] and deleted == ids[:3]
+        assert len(pages) == 2
+
+    app_run(scenario)
+
+
+def test_changes_reject_mismatched_or_invalid_cursor(app_run):
+    async def scenario(client, db):
+        await db.add_all([Room(name=f"A-{i}", roomstype="auditoriya") for i in range(3)])
+        first = (await client.get("/api/changes", params={"entities": "rooms", "limit": 1})).json()
+        other = await client.get("/api/changes", params={"entities": "rooms,courses", "after": first["next"]})
+        assert other.status_code == 400
+        assert (await client.get("/api/changes", params={"after": "bm90LWEtY3Vyc29y"})).status_code == 400
+
+    app_run(scenario)
+
+
+def test_since_older_than_retention_is_gone(app_run):
+    async def scenario(client, db):
+        since = (retention_start() - timedelta(hours=1)).isoformat()
+        response = await client.get("/api/changes", params={"since": since})
+        assert response.status_code == 410
+
+    app_run(scenario)
+
+
+def test_prune_deleted_rows(app_run):
+    async def scenario(client, db):
+        ids = await db.add_all([Room(name=f"A-{i}", roomstype="auditoriya") for i in range(2)])
+        await db.delete_many(Room, {"id": {"in": ids}})
+        assert await db.prune_deleted_rows(datetime.now(timezone.utc) - timedelta(days=1)) == 0
+        assert await db.prune_deleted_rows(datetime.now(timezone.utc) + timedelta(seconds=1)) == 2
+        assert await db.get(DeletedRow) == []
+
+    app_run(scenario)
@@ -0,0 +1,60 @@
+from asyncio import run, sleep
+import pytest
+from DatabaseService import query_cache, timetable_versions
+from FeedService import ChangeEvent, build_bus
+from api.feed import apply_remote_change
+
+
+def test_remote_invalidation_refreshes_cache_without_rebroadcast():
+    if query_cache.shared:
+        pytest.skip("umumiy kesh (Redis) bilan bekor qilish yuborilmaydi")
+
+    async def scenario():
+        published = []
+
+        async def listener(namespace):
+            published.append(namespace)
+
+        query_cache.on_invalidate(listener)
+        try:
+            generation = await query_cache.generation("Room")
+            etag = await timetable_versions.etag(1)
+            await apply_remote_change(ChangeEvent.invalidate(["Room"]))
+            assert await query_cache.generation("Room") == generation + 1
+            assert await timetable_versions.etag(1) != etag
+            assert published == []  # boshqa workerdan kelgani qayta yuborilmaydi
+
+            await query_cache.invalidate("Room")
+            assert published == ["Room"]
+        finally:
+            query_cache.listeners.remove(listener)
+
+    run(scenario())
+
+
+def test_invalidations_reach_other_workers_but_not_subscribers(database):
+    async def scenario():
+        sender, receiver = build_bus("postgres", database), build_bus("postgres", database)
+        received = []
+
+        async def handler(event):
+            received.append(event)
+
+        receiver.on_remote(handler)
+        await sender.start()
+        await receiver.start()
+        try:
+            with receiver.subscribe() as subscription:
+                await sender.publish([ChangeEvent.invalidate(["Teacher", "Room"])])
+                for _ in range(50):
+                    if received:
+                        break
+                    await sleep(0.05)
+                assert [(event.kind, event.schedule) for event in received] == \
+                    [("invalidate", {"models": ["Teacher", "Room"]})]
+                assert subscription.queue.empty() and receiver.seq == 0
+        finally:
+            await sender.stop()
+            await receiver.stop()
+
+    run(scenario())
@@ -0,0 +1,50 @@
+from DatabaseService import OccupancyIndex, Schedule, occupancy_index
+
+
+def booking(schedule_id, **values):
+    return Schedule(**{"id": schedule_id, "course_id": 1, "group_id": 1, "subject_id": 1, "teacher_id": 3,
+                       "room_id": 5, "day": 1, "time_slot": 1, **values})
+
+
+def test_joint_lesson_keeps_teacher_busy_until_last_booking_removed():
+    index = OccupancyIndex()
+    index.load([booking(1), booking(2, group_id=2)])  # bitta o'qituvchi ikki guruhga birgalikda
+    assert index.busy("teacher", 1, 1) == 1 << 3
+    assert index.busy("group", 1, 1) == 1 << 1 | 1 << 2
+
+    index.remove(1)
+    assert index.busy("teacher", 1, 1) == 1 << 3
+    index.remove(2)
+    assert index.busy("teacher", 1, 1) == 0 and index.busy("room", 1, 1) == 0
+
+
+def test_add_moves_an_existing_booking():
+    index = OccupancyIndex()
+    index.load([booking(1)])
+    index.add(booking(1, day=2, time_slot=3))
+    assert index.busy("room", 1, 1) == 0
+    assert index.busy("room", 2, 3) == 1 << 5
+
+
+def test_discard_course_only_touches_that_course():
+    index = OccupancyIndex()
+    index.load([booking(1), booking(2, course_id=2, group_id=2, teacher_id=4, room_id=6)])
+    index.discard_course(1)
+    assert index.busy("teacher", 1, 1) == 1 << 4
+
+
+def test_verify_is_read_only_and_rebuild_repairs(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        created = await client.post("/api/schedule/", json=[{"day": 1, "time_slot": 1, **ids}])
+        assert created.status_code == 200, created.text
+        occupancy_index.remove(created.json()[0])
+
+        for _ in range(2):
+            report = (await client.get("/api/schedule/occupancy/verify", params={"repair": True})).json()
+            assert not report["consistent"] and not report["repaired"]
+        rebuilt = (await client.post("/api/schedule/occupancy/rebuild")).json()
+        assert rebuilt["missing"] == created.json() and rebuilt["repaired"]
+        assert (await client.get("/api/schedule/occupancy/verify")).json()["consistent"]
+
+    app_run(scenario)
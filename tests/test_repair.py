@@ -0,0 +1,79 @@
+from sqlalchemy import update
+from DatabaseService import Schedule
+from SolverService import FULL_MASK, Booking, TimetableRepair, cell_index
+import api.schedules as schedules_api
+
+
+def booking(id: int, subject_id: int, teacher_id: int, room_id: int, cell: int, group_id: int = 1) -> Booking:
+    return Booking(id, 1, group_id, subject_id, teacher_id, room_id, cell)
+
+
+def test_one_hop_move_leaves_blocked_cell():
+    start = cell_index(1, 1)
+    repair = TimetableRepair([booking(1, 1, 1, 1, start)], {1: ([1], [1])}, teacher_blocked={1: 1 << start})
+    result = repair.solve()
+    assert result.is_complete
+    assert [move.booking.id for move in result.moves] == [1]
+    # Eng kam o'zgarish: o'sha kunning boshqa katagi, o'qituvchi va xona o'zgarmaydi
+    move = result.moves[0].to_dict()
+    assert move["to"]["day"] == 1 and move["to"]["time_slot"] != 1
+    assert (move["to"]["teacher_id"], move["to"]["room_id"]) == (1, 1)
+
+
+def test_eviction_chain_is_bounded_by_max_depth():
+    # 1-yozuv faqat 5-katakka o'tishi mumkin (u yerda 2-yozuv), 2-yozuv esa faqat 5 va 6-kataklarga
+    # (6-katakda 3-yozuv). Zanjir ikki marta siqib chiqarishni talab qiladi
+    first, second, third = cell_index(1, 1), 5, 6
+    bookings = [booking(1, 1, 1, 1, first), booking(2, 2, 2, 2, second), booking(3, 3, 3, 3, third)]
+    candidates = {1: ([1], [1]), 2: ([2], [2]), 3: ([3], [3])}
+    blocked = {1: FULL_MASK & ~(1 << second)}
+    busy = {2: FULL_MASK & ~(1 << second) & ~(1 << third)}
+
+    shallow = TimetableRepair(bookings, candidates, teacher_blocked=blocked, teacher_busy=busy, max_depth=1,
+                              time_limit=1.0).solve()
+    assert not shallow.is_complete and [item.id for item in shallow.unresolved] == [1]
+    assert shallow.moves == []
+
+    result = TimetableRepair(bookings, candidates, teacher_blocked=blocked, teacher_busy=busy, max_depth=2,
+                             time_limit=1.0).solve()
+    assert result.is_complete
+    cells = {move.booking.id: move.cell for move in result.moves}
+    assert cells[1] == second and cells[2] == third and cells[3] not in (second, third)
+    assert len(set(cells.values())) == 3  # guruhda ikki marta band qilish yo'q
+
+
+def test_unsolvable_booking_is_reported_without_moves():
+    start = cell_index(2, 3)
+    other = booking(2, 2, 2, 2, cell_index(1, 1))
+    result = TimetableRepair([booking(1, 1, 1, 1, start), other], {1: ([1], [1])},
+                             teacher_blocked={1: FULL_MASK}, time_limit=0.5).solve()
+    assert not result.is_complete
+    assert [item.id for item in result.unresolved] == [1]
+    assert result.moves == []
+
+
+def test_apply_conflicts_when_schedule_changed_after_proposal(app_run, seed, monkeypatch):
+    edited, load_repair_problem = [], schedules_api.load_repair_problem
+
+    async def load_then_edit(db, teacher_blocked, room_blocked):
+        problem = await load_repair_problem(db, teacher_blocked, room_blocked)
+        # Taklif tuzilayotganda boshqa mijoz yozuvni ko'chiradi
+        async with db.engine.begin() as connection:
+            await connection.execute(update(Schedule).where(Schedule.id == edited[0]).values(time_slot=2))
+        return problem
+
+    async def scenario(client, db):
+        ids = await seed(db)
+        created = await client.post("/api/schedule/", json=[{"day": 1, "time_slot": 1, **ids}])
+        assert created.status_code == 200, created.text
+        edited.extend(created.json())
+        monkeypatch.setattr(schedules_api, "load_repair_problem", load_then_edit)
+
+        response = await client.post("/api/schedule/repair", params={"apply": True},
+                                     json={"teacher_id": ids["teacher_id"], "days": [1]})
+        assert response.status_code == 409, response.text
+        # Ko'chirish bekor qilingan: yozuv boshqa mijoz qo'ygan joyda qoladi
+        rows = await db.select_columns(Schedule, ["day", "time_slot"], {"id": edited[0]})
+        assert rows == [{"day": 1, "time_slot": 2}]
+
+    app_run(scenario)
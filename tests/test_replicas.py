@@ -0,0 +1,37 @@
+from asyncio import run
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from DatabaseService import ReplicaSet
+
+
+def engine_factory(url):
+    return create_async_engine(url, poolclass=NullPool, connect_args={"timeout": 1})
+
+
+def test_unreachable_replica_is_skipped(database):
+    down = make_url(database).set(host="127.0.0.1", port=1).render_as_string(hide_password=False)
+
+    async def scenario():
+        replicas = ReplicaSet([down, database], engine_factory, retry_after=60)
+        try:
+            chosen = [await replicas.choose() for _ in range(3)]
+            assert [replica.url for replica in chosen] == [database] * 3
+            status = {item["name"]: item for item in replicas.status()}
+            assert status[replicas.replicas[0].name]["down"] is True
+            assert status[replicas.replicas[1].name]["lag"] == 0
+        finally:
+            await replicas.dispose()
+
+    run(scenario())
+
+
+def test_lagging_replica_falls_back_to_primary(database):
+    async def scenario():
+        replicas = ReplicaSet([database], engine_factory, max_lag=-1)  # har qanday kechikish "juda katta"
+        try:
+            assert await replicas.choose() is None
+        finally:
+            await replicas.dispose()
+
+    run(scenario())
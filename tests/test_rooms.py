@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from DatabaseService import Room
+
+
+def test_room_list_returns_every_column(app_run):
+    async def scenario(client, db):
+        await db.add_all([Room(name="A-1", roomstype="auditoriya", unavailable=0b101)])
+        response = await client.get("/api/rooms/")
+        assert response.status_code == 200, response.text
+        room, = response.json()
+        assert room["unavailable"] == 0b101
+        assert room["created_at"] is not None and room["updated_at"] is not None
+
+    app_run(scenario)
+
+
+def test_unavailable_mask_is_bounded(app_run):
+    async def scenario(client, db):
+        # Oddiy yaratishda mijoz niqobi e'tiborga olinmaydi
+        created = await client.post("/api/rooms/", json={"name": "A-2", "roomstype": "auditoriya",
+                                                         "unavailable": 1 << 40})
+        assert created.status_code == 200, created.text
+        assert created.json()["unavailable"] == 0
+
+        with pytest.raises(IntegrityError):
+            await db.add_all([Room(name="A-3", roomstype="auditoriya", unavailable=1 << 24)])
+
+    app_run(scenario)
@@ -0,0 +1,118 @@
+import pytest
+from DatabaseService import Course, Schedule, occupancy_index, timetable_versions
+from SolverService import TimetableRepair, TimetableSolver
+from api.schedules import create_schedule
+
+
+def test_index_and_etag_change_only_after_commit(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        course_id, teacher_bit = ids["course_id"], 1 << ids["teacher_id"]
+        before = await timetable_versions.etag(course_id)
+
+        with pytest.raises(RuntimeError):
+            async with db.unit_of_work():
+                await create_schedule([Schedule(day=1, time_slot=1, **ids)], db)
+                # Commitdan oldin parallel o'quvchi eski ma'lumot bilan yangi ETag olmasligi kerak
+                assert await timetable_versions.etag(course_id) == before
+                assert occupancy_index.busy("teacher", 1, 1) == 0
+                raise RuntimeError("rollback")
+        assert await timetable_versions.etag(course_id) == before
+        assert occupancy_index.busy("teacher", 1, 1) == 0
+
+        async with db.unit_of_work():
+            await create_schedule([Schedule(day=1, time_slot=1, **ids)], db)
+        assert await timetable_versions.etag(course_id) != before
+        assert occupancy_index.busy("teacher", 1, 1) == teacher_bit
+
+    app_run(scenario)
+
+
+def test_conditional_get_sees_committed_write(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        first = await client.get(f"/api/schedule/table/{ids['course_id']}")
+        assert first.status_code == 200 and first.json() == []
+        etag = first.headers["etag"]
+        assert (await client.get(f"/api/schedule/table/{ids['course_id']}",
+                                 headers={"If-None-Match": etag})).status_code == 304
+
+        created = await client.post("/api/schedule/", json=[{"day": 2, "time_slot": 3, **ids}])
+        assert created.status_code == 200, created.text
+        second = await client.get(f"/api/schedule/table/{ids['course_id']}", headers={"If-None-Match": etag})
+        assert second.status_code == 200
+        assert [row["id"] for row in second.json()] == created.json()
+
+    app_run(scenario)
+
+
+def test_generate_rejects_unbounded_parameters(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        url = f"/api/schedule/generate/{ids['course_id']}"
+        for params in ({"lessons_per_subject": 0}, {"lessons_per_subject": 1000}, {"time_limit": 0},
+                       {"time_limit": 3600}):
+            assert (await client.post(url, params=params)).status_code == 422, params
+        assert (await client.post(url, params={"lessons_per_subject": 1, "time_limit": 0.5})).status_code == 200
+
+    app_run(scenario)
+
+
+def test_repair_rejects_unbounded_parameters(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        body = {"teacher_id": ids["teacher_id"]}
+        for params in ({"max_depth": -1}, {"max_depth": 50}, {"time_limit": 0}, {"time_limit": 600}):
+            assert (await client.post("/api/schedule/repair", params=params, json=body)).status_code == 422, params
+        assert (await client.post("/api/schedule/repair", params={"max_depth": 1}, json=body)).status_code == 200
+
+    app_run(scenario)
+
+
+def test_solvers_run_without_checked_out_connection(app_run, seed, monkeypatch):
+    services, checked_out = [], []
+
+    def recording(solve):
+        def wrapper(self):
+            # Yechim davomida so'rov havzadan ulanish ushlab turmasligi kerak (tranzaksiya ochilmagan)
+            checked_out.append(services[0].pool_status()["checked_out"])
+            return solve(self)
+        return wrapper
+
+    monkeypatch.setattr(TimetableSolver, "solve", recording(TimetableSolver.solve))
+    monkeypatch.setattr(TimetableRepair, "solve", recording(TimetableRepair.solve))
+
+    async def scenario(client, db):
+        services.append(db)
+        ids = await seed(db)
+        generated = await client.post(f"/api/schedule/generate/{ids['course_id']}",
+                                      params={"apply": True, "time_limit": 0.5})
+        assert generated.status_code == 200, generated.text
+        assert generated.json()["added_ids"]
+        repaired = await client.post("/api/schedule/repair", params={"apply": True},
+                                     json={"teacher_id": ids["teacher_id"]})
+        assert repaired.status_code == 200, repaired.text
+
+    app_run(scenario)
+    assert checked_out == [0, 0]
+
+
+def test_update_returns_previous_course_and_bumps_its_etag(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        other_course, = await db.add_all([Course(name="Boshqa kurs")])
+        schedule_id, = (await client.post("/api/schedule/", json=[{"day": 1, "time_slot": 1, **ids}])).json()
+        async with db.unit_of_work():
+            moved = await db.update_fields(Schedule, schedule_id, {"course_id": other_course},
+                                           previous=["course_id"])
+        assert (moved.previous_course_id, moved.course_id) == (ids["course_id"], other_course)
+        async with db.unit_of_work():
+            await db.update_fields(Schedule, schedule_id, {"course_id": ids["course_id"]})
+
+        before = await timetable_versions.etag(ids["course_id"])
+        updated = await client.put(f"/api/schedule/{schedule_id}", json={"room_id": ids["room_id"]})
+        assert updated.status_code == 200, updated.text
+        assert "previous_course_id" not in updated.json()["schedule"]
+        assert await timetable_versions.etag(ids["course_id"]) != before
+
+    app_run(scenario)
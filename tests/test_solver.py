@@ -0,0 +1,24 @@
+from collections import Counter
+from SolverService import FULL_MASK, Lesson, TimetableSolver, cell_index
+
+
+def test_solution_has_no_double_bookings():
+    # 6 guruh x 4 fan = 24 dars; 3 o'qituvchi va 3 xona uchun yetarli katak bor
+    lessons = [Lesson(group_id, subject_id, teachers=[subject_id % 3 + 1], rooms=[1, 2, 3])
+               for group_id in range(1, 7) for subject_id in range(1, 5)]
+    result = TimetableSolver(lessons, time_limit=2.0, seed=1).solve()
+    assert result.is_complete
+    for key in ("group_id", "teacher_id", "room_id"):
+        cells = Counter((placement.to_dict()[key], placement.cell) for placement in result.placements)
+        assert max(cells.values()) == 1, key
+
+
+def test_external_busy_cells_are_respected():
+    # O'qituvchi faqat bitta katakda bo'sh
+    free = cell_index(3, 2)
+    lessons = [Lesson(1, 1, teachers=[7], rooms=[1])]
+    result = TimetableSolver(lessons, teacher_busy={7: FULL_MASK & ~(1 << free)}, time_limit=0.5).solve()
+    assert [placement.cell for placement in result.placements] == [free]
+
+    blocked = TimetableSolver(lessons, teacher_busy={7: FULL_MASK}, time_limit=0.2).solve()
+    assert not blocked.is_complete and blocked.unplaced == lessons
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from DatabaseService import Schedule, StatementCache
+from DatabaseService.statements import filter_shape
+
+
+def sql(statement):
+    return str(statement.compile(dialect=postgresql.asyncpg.dialect(),
+                                 compile_kwargs={"render_postcompile": True}))
+
+
+def test_shape_ignores_values_and_key_order():
+    shape, params = filter_shape({"day": 1, "course_id": {"in": [1, 2, 3]}})
+    assert shape == (("course_id", "in"), ("day", "eq"))
+    assert params == {"p0": [1, 2, 3], "p1": 1}
+    assert filter_shape({"course_id": {"in": [9]}, "day": 5})[0] == shape
+
+    with pytest.raises(ValueError):
+        filter_shape({"day": {"like": "1%"}})
+
+
+def test_list_length_does_not_change_sql_text():
+    cache = StatementCache(max_size=4)
+    first, _ = cache.select(Schedule, {"id": {"in": [1]}})
+    second, params = cache.select(Schedule, {"id": {"in": list(range(50))}})
+    assert first is second and sql(first) == sql(second)
+    assert params == {"p0": list(range(50))}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_shape_is_evicted():
+    cache = StatementCache(max_size=2)
+    cache.select(Schedule, {"day": 1})
+    cache.select(Schedule, {"time_slot": 1})
+    cache.select(Schedule, {"day": 2})  # eng so'nggi ishlatilgan
+    cache.select(Schedule, {"room_id": 1})
+    assert cache.stats()["evictions"] == 1
+    cache.select(Schedule, {"day": 3})
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
+
+def test_client_cannot_set_server_timestamps(app_run):
+    async def scenario(client, db):
+        started = datetime.now(timezone.utc) - timedelta(minutes=1)
+        response = await client.post("/api/rooms/", json={
+            "name": "A-1", "roomstype": "auditoriya",
+            "created_at": "2000-01-01T00:00:00Z", "updated_at": "2000-01-01T00:00:00Z"})
+        assert response.status_code == 200, response.text
+        room = (await client.get(f"/api/rooms/{response.json()['id']}")).json()
+        for name in ("created_at", "updated_at"):
+            assert datetime.fromisoformat(room[name]) > started
+
+    app_run(scenario)
+
+
+def test_batch_insert_ignores_body_timestamps(app_run, seed):
+    async def scenario(client, db):
+        ids = await seed(db)
+        started = datetime.now(timezone.utc) - timedelta(minutes=1)
+        response = await client.post("/api/schedule/", json=[{"day": 1, "time_slot": 1, **ids,
+                                                              "created_at": "2000-01-01T00:00:00Z"}])
+        assert response.status_code == 200, response.text
+        changes = (await client.get("/api/changes", params={"entities": "schedules"})).json()
+        row, = changes["changes"]["schedules"]["upserted"]
+        assert datetime.fromisoformat(row["created_at"]) > started
+
+    app_run(scenario)
+
+
+def test_unexpected_errors_do_not_leak_sql(app_run):
+    async def scenario(client, db):
+        # Majburiy ustun yo'q: baza NOT NULL xatosini qaytaradi
+        response = await client.post("/api/rooms/", json={"name": "A-1"})
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+
+    app_run(scenario)